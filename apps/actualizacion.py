@@ -11,6 +11,15 @@ import numpy as np
 from datetime import datetime, date, timedelta
 from decimal import Decimal, ROUND_HALF_UP
 import math
+import sys
+from pathlib import Path
+
+# Agregar path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.indices import cargar_series, buscar_cruces, fechas_ripte, ultimos_datos
+from utils.historial import leer_csv, selector_version
+from utils.actualizacion import actualizar_periodos, imputar_pagos, matriz_comparativa, COLUMNAS_PERIODOS
+from utils.formato import formato_moneda, columna_moneda
 
 # Configuración de la página
 st.set_page_config(
@@ -69,22 +78,17 @@ def safe_parse_date(s):
 
 # Cargar datasets
 @st.cache_data
-def cargar_datasets():
-    """Carga los datasets de RIPTE, Tasa e IPC"""
-    df_ripte = pd.read_csv("data/dataset_ripte.csv")
-    df_ripte['fecha'] = pd.to_datetime(df_ripte['año'].astype(str) + '-' + 
-                                       df_ripte['mes'].str[:3].map({
-                                           'Ene': '01', 'Feb': '02', 'Mar': '03', 'Abr': '04',
-                                           'May': '05', 'Jun': '06', 'Jul': '07', 'Ago': '08',
-                                           'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dic': '12'
-                                       }) + '-01')
-    
-    df_tasa = pd.read_csv("data/dataset_tasa.csv")
+def cargar_datasets(version=None):
+    """Carga los datasets de RIPTE, Tasa e IPC (actuales, o de una versión del historial)"""
+    df_ripte = leer_csv('ripte', version)
+    df_ripte['fecha'] = fechas_ripte(df_ripte)
+    
+    df_tasa = leer_csv('tasa', version)
     df_tasa['Desde'] = pd.to_datetime(df_tasa['Desde'])
     df_tasa['Hasta'] = pd.to_datetime(df_tasa['Hasta'])
     df_tasa['Valor'] = df_tasa['Valor'].astype(str).str.replace(',', '.').astype(float)
     
-    df_ipc = pd.read_csv("data/dataset_ipc.csv")
+    df_ipc = leer_csv('ipc', version)
     df_ipc['periodo'] = pd.to_datetime(df_ipc['periodo'])
     
     return df_ripte, df_tasa, df_ipc
@@ -240,22 +244,18 @@ def actualizar_ipc(monto_base, fecha_inicial, fecha_final, df_ipc, tasa_pura):
         st.error(f"Error en cálculo de IPC: {str(e)}")
         return monto_base, 0.0, 0.0
 
-# Función para formatear montos
-def formato_moneda(valor):
-    """Formatea un valor como moneda argentina"""
-    return f"$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+# Título principal
+st.markdown("# 📈 CALCULADORA DE ACTUALIZACIÓN")
+st.markdown("---")
 
-# Cargar datos
+# Cargar datos (actuales, o los de una versión anterior para reproducir un cálculo)
+version_datos = selector_version("version_datos_actualizacion")
 try:
-    df_ripte, df_tasa, df_ipc = cargar_datasets()
+    df_ripte, df_tasa, df_ipc = cargar_datasets(version_datos)
 except Exception as e:
     st.error(f"Error al cargar datasets: {str(e)}")
     st.stop()
 
-# Título principal
-st.markdown("# 📈 CALCULADORA DE ACTUALIZACIÓN")
-st.markdown("---")
-
 # Diseño en dos columnas principales
 col_izq, col_der = st.columns([1, 1])
 
@@ -316,18 +316,37 @@ with col_der:
         if fecha_inicial >= fecha_final:
             st.error("⚠️ La fecha inicial debe ser anterior a la fecha final.")
         else:
-            # Calcular actualizaciones
-            ripte_total, ripte_coef, ripte_interes = actualizar_ripte(
-                monto, fecha_inicial, fecha_final, df_ripte, tasa_pura_ripte
-            )
-            
-            tasa_total, tasa_pct = actualizar_tasa(
-                monto, fecha_inicial, fecha_final, df_tasa
-            )
-            
-            ipc_total, ipc_inflacion, ipc_interes = actualizar_ipc(
-                monto, fecha_inicial, fecha_final, df_ipc, tasa_pura_ipc
-            )
+            series = cargar_series(version_datos)
+            if fecha_final == date.today() and series.datos_hasta(fecha_final):
+                # Fecha final = hoy y ningún dato posterior: coeficientes precalculados al último dato
+                coefs = series.coeficientes_al_ultimo_dato(fecha_inicial)
+                
+                ripte_coef = coefs['coef_ripte']
+                ripte_interes = monto * ripte_coef * (tasa_pura_ripte / 100)
+                ripte_total = monto * ripte_coef + ripte_interes
+                
+                tasa_pct = coefs['tasa_pct']
+                tasa_total = monto * (1.0 + tasa_pct / 100.0)
+                
+                if coefs['meses_ipc'] > 0:
+                    ipc_inflacion = (coefs['factor_ipc'] - 1) * 100
+                    ipc_interes = monto * coefs['factor_ipc'] * (tasa_pura_ipc / 100)
+                    ipc_total = monto * coefs['factor_ipc'] + ipc_interes
+                else:
+                    ipc_total, ipc_inflacion, ipc_interes = monto, 0.0, 0.0
+            else:
+                # Calcular actualizaciones
+                ripte_total, ripte_coef, ripte_interes = actualizar_ripte(
+                    monto, fecha_inicial, fecha_final, df_ripte, tasa_pura_ripte
+                )
+                
+                tasa_total, tasa_pct = actualizar_tasa(
+                    monto, fecha_inicial, fecha_final, df_tasa
+                )
+                
+                ipc_total, ipc_inflacion, ipc_interes = actualizar_ipc(
+                    monto, fecha_inicial, fecha_final, df_ipc, tasa_pura_ipc
+                )
             
             # Guardar resultados en session_state
             st.session_state.resultados = {
@@ -398,44 +417,220 @@ if 'resultados' in st.session_state:
             st.write(f"Interés: {formato_moneda(r['ipc_interes'])}")
             st.write(f"**Total: {formato_moneda(r['ipc_total'])}**")
     
-    # Últimos datos disponibles
+    with st.expander(f"🔀 CRUCES RIPTE + {r['tasa_pura_ripte']}% vs TASA ACTIVA"):
+        st.caption(f"Se evalúan todas las fechas finales posibles desde el {r['fecha_inicial'].strftime('%d/%m/%Y')} hasta hoy")
+        
+        series = cargar_series(version_datos)
+        fechas_cruce = pd.date_range(pd.Timestamp(r['fecha_inicial']) + pd.Timedelta(days=1), pd.Timestamp(date.today()), freq='D')
+        inicio_cruce = np.full(len(fechas_cruce), np.datetime64(r['fecha_inicial'], 'D'))
+        totales_ripte = r['monto'] * series.coeficiente_ripte(inicio_cruce, fechas_cruce) * (1 + r['tasa_pura_ripte'] / 100)
+        totales_tasa = r['monto'] * (1 + series.tasa_acumulada(inicio_cruce, fechas_cruce) / 100)
+        cruces = buscar_cruces(fechas_cruce, totales_ripte, totales_tasa)
+        
+        if len(fechas_cruce):
+            favorable_inicial = f"RIPTE + {r['tasa_pura_ripte']}%" if totales_ripte[0] >= totales_tasa[0] else "Tasa Activa"
+            st.write(f"Método más favorable al inicio: **{favorable_inicial}**")
+        
+        if cruces.empty:
+            st.info("No hay cruces: el mismo método resulta más favorable en todo el período")
+        else:
+            tabla_cruces = pd.DataFrame({
+                'Último día anterior': cruces['fecha_anterior'].dt.strftime('%d/%m/%Y'),
+                f"RIPTE + {r['tasa_pura_ripte']}% (antes)": columna_moneda(cruces['a_anterior']),
+                'Tasa Activa (antes)': columna_moneda(cruces['b_anterior']),
+                'Fecha de cruce': cruces['fecha_cruce'].dt.strftime('%d/%m/%Y'),
+                f"RIPTE + {r['tasa_pura_ripte']}% (cruce)": columna_moneda(cruces['a_cruce']),
+                'Tasa Activa (cruce)': columna_moneda(cruces['b_cruce']),
+                'Pasa a ser más favorable': cruces['favorable'].map({'A': f"RIPTE + {r['tasa_pura_ripte']}%", 'B': 'Tasa Activa'})
+            })
+            st.dataframe(tabla_cruces, use_container_width=True, hide_index=True)
+    
+    # Últimos datos disponibles (resumen en memoria, se relee solo si cambian los datasets)
+    ultimos = ultimos_datos()
     ultimo_ripte_txt = ""
     ultimo_ipc_txt = ""
     ultima_tasa_txt = ""
     
-    if not df_ripte.empty:
-        ultimo_ripte = df_ripte.iloc[-1]
-        fecha_ripte = ultimo_ripte['fecha']
-        valor_ripte = ultimo_ripte['indice_ripte']
-        if pd.notnull(fecha_ripte):
-            mes_ripte = fecha_ripte.month if isinstance(fecha_ripte, pd.Timestamp) else fecha_ripte.month
-            año_ripte = fecha_ripte.year if isinstance(fecha_ripte, pd.Timestamp) else fecha_ripte.year
-            ultimo_ripte_txt = f"RIPTE {mes_ripte}/{año_ripte}: {valor_ripte:,.0f}"
-    
-    if not df_ipc.empty:
-        ultimo_ipc = df_ipc.iloc[-1]
-        fecha_ipc = ultimo_ipc['periodo']
-        variacion_ipc = ultimo_ipc['variacion_mensual']
-        if pd.notnull(fecha_ipc):
-            if isinstance(fecha_ipc, pd.Timestamp):
-                mes_ipc = fecha_ipc.month
-                año_ipc = fecha_ipc.year
-            else:
-                fecha_ipc = pd.to_datetime(fecha_ipc)
-                mes_ipc = fecha_ipc.month
-                año_ipc = fecha_ipc.year
-            ultimo_ipc_txt = f"IPC {mes_ipc}/{año_ipc}: {variacion_ipc:.2f}%"
-    
-    if not df_tasa.empty:
-        ultima_tasa = df_tasa.iloc[0]
-        valor_tasa = ultima_tasa['Valor']
-        fecha_hasta = ultima_tasa['Hasta']
-        if pd.notnull(fecha_hasta):
-            fecha_txt = fecha_hasta.strftime("%d/%m/%Y") if isinstance(fecha_hasta, pd.Timestamp) else pd.to_datetime(fecha_hasta).strftime("%d/%m/%Y")
-            ultima_tasa_txt = f"TASA {fecha_txt}: {valor_tasa:.2f}%"
+    if ultimos['ripte']:
+        fecha_ripte = ultimos['ripte']['fecha']
+        ultimo_ripte_txt = f"RIPTE {fecha_ripte.month}/{fecha_ripte.year}: {ultimos['ripte']['valor']:,.0f}"
+    
+    if ultimos['ipc']:
+        fecha_ipc = ultimos['ipc']['fecha']
+        ultimo_ipc_txt = f"IPC {fecha_ipc.month}/{fecha_ipc.year}: {ultimos['ipc']['variacion']:.2f}%"
+    
+    if ultimos['tasa'] and pd.notnull(ultimos['tasa']['hasta']):
+        ultima_tasa_txt = f"TASA {ultimos['tasa']['hasta'].strftime('%d/%m/%Y')}: {ultimos['tasa']['valor']:.2f}%"
     
     st.warning(f"**📊 Últimos Datos:** {ultimo_ripte_txt} | {ultimo_ipc_txt} | {ultima_tasa_txt}")
 
+# Matriz comparativa: todas las tasas puras en una sola evaluación
+with st.expander("🧮 MATRIZ COMPARATIVA DE TASAS PURAS"):
+    if fecha_inicial >= fecha_final:
+        st.error("⚠️ La fecha inicial debe ser anterior a la fecha final.")
+    else:
+        matriz = matriz_comparativa(monto, fecha_inicial, fecha_final, cargar_series(version_datos))
+        st.caption(f"{formato_moneda(monto)} del {fecha_inicial.strftime('%d/%m/%Y')} al {fecha_final.strftime('%d/%m/%Y')}")
+        
+        metodos = matriz[['ripte_total', 'ipc_total', 'tasa_total']]
+        st.dataframe(pd.DataFrame({
+            'Tasa Pura': matriz['tasa_pura'].map(lambda x: f"{x:.0f}%"),
+            'RIPTE + Tasa Pura': columna_moneda(matriz['ripte_total']),
+            'IPC + Tasa Pura': columna_moneda(matriz['ipc_total']),
+            'Tasa Activa': columna_moneda(matriz['tasa_total']),
+            'Más favorable': metodos.idxmax(axis=1).map({
+                'ripte_total': 'RIPTE', 'ipc_total': 'IPC', 'tasa_total': 'Tasa Activa'
+            })
+        }), use_container_width=True, hide_index=True)
+
+# Diferencias salariales: varios períodos a una fecha final común
+with st.expander("📑 DIFERENCIAS SALARIALES (VARIOS PERÍODOS)"):
+    st.markdown(f"""
+    Actualiza cada monto desde su propia fecha hasta la **Fecha Final** ({fecha_final.strftime('%d/%m/%Y')}),
+    con RIPTE + {tasa_pura_ripte}%, Tasa Activa e IPC + {tasa_pura_ipc}% según las tasas puras seleccionadas.
+    """)
+    
+    origen_periodos = st.radio(
+        "Carga de períodos",
+        options=["Planilla", "Archivo CSV"],
+        horizontal=True,
+        key="periodos_origen"
+    )
+    
+    if origen_periodos == "Archivo CSV":
+        st.caption(f"El archivo debe tener las columnas **{', '.join(COLUMNAS_PERIODOS)}** (fechas en formato `DD/MM/AAAA` o `AAAA-MM-DD`)")
+        archivo_periodos = st.file_uploader("Archivo CSV", type=["csv"], key="periodos_csv")
+        df_periodos = pd.read_csv(archivo_periodos, sep=None, engine="python") if archivo_periodos is not None else None
+    else:
+        df_periodos = st.data_editor(
+            pd.DataFrame({'fecha': pd.Series(dtype='datetime64[ns]'), 'monto': pd.Series(dtype=float)}),
+            num_rows="dynamic",
+            use_container_width=True,
+            column_config={
+                'fecha': st.column_config.DateColumn("Fecha", format="DD/MM/YYYY"),
+                'monto': st.column_config.NumberColumn("Monto ($)", min_value=0.0, format="%.2f")
+            },
+            key="periodos_editor"
+        ).dropna(how='all')
+    
+    if df_periodos is not None and not df_periodos.empty:
+        try:
+            resultado_periodos = actualizar_periodos(
+                df_periodos, fecha_final, tasa_pura_ripte, tasa_pura_ipc, cargar_series(version_datos)
+            )
+            validas = resultado_periodos['observaciones'] == ''
+            
+            col_p1, col_p2, col_p3, col_p4 = st.columns(4)
+            with col_p1:
+                st.metric("Capital", formato_moneda(resultado_periodos.loc[validas, 'monto'].sum()))
+            with col_p2:
+                st.metric(f"RIPTE + {tasa_pura_ripte}%", formato_moneda(resultado_periodos.loc[validas, 'ripte_total'].sum()))
+            with col_p3:
+                st.metric("Tasa Activa", formato_moneda(resultado_periodos.loc[validas, 'tasa_total'].sum()))
+            with col_p4:
+                st.metric(f"IPC + {tasa_pura_ipc}%", formato_moneda(resultado_periodos.loc[validas, 'ipc_total'].sum()))
+            
+            if not validas.all():
+                st.warning(f"⚠️ {int((~validas).sum())} filas con datos inválidos (ver columna 'observaciones')")
+            
+            st.dataframe(resultado_periodos, use_container_width=True, hide_index=True)
+            
+            st.download_button(
+                label="📥 DESCARGAR DESGLOSE (CSV)",
+                data=resultado_periodos.round(2).to_csv(index=False).encode('utf-8'),
+                file_name=f"diferencias_salariales_{fecha_final.strftime('%Y%m%d')}.csv",
+                mime="text/csv",
+                use_container_width=True,
+                key="download_periodos"
+            )
+        except Exception as e:
+            st.error(f"Error al procesar los períodos: {str(e)}")
+
+# Pagos a cuenta: imputación a intereses y luego a capital
+with st.expander("💵 PAGOS A CUENTA"):
+    st.markdown(f"""
+    Actualiza el **Monto** desde la **Fecha Inicial** ({fecha_inicial.strftime('%d/%m/%Y')}) hasta la
+    **Fecha Final** ({fecha_final.strftime('%d/%m/%Y')}) descontando los pagos parciales.
+    Cada pago se imputa primero a intereses y luego a capital. Con RIPTE, la tasa pura se aplica
+    una sola vez sobre todo el período (como en el resultado principal), repartida entre los tramos
+    según sus días.
+    """)
+    
+    metodo_pagos = st.radio(
+        "Método",
+        options=['tasa', 'ripte'],
+        format_func=lambda m: "Tasa Activa" if m == 'tasa' else f"RIPTE + {tasa_pura_ripte}%",
+        horizontal=True,
+        key="pagos_metodo"
+    )
+    
+    df_pagos = st.data_editor(
+        pd.DataFrame({'fecha': pd.Series(dtype='datetime64[ns]'), 'monto': pd.Series(dtype=float)}),
+        num_rows="dynamic",
+        use_container_width=True,
+        column_config={
+            'fecha': st.column_config.DateColumn("Fecha del pago", format="DD/MM/YYYY"),
+            'monto': st.column_config.NumberColumn("Monto pagado ($)", min_value=0.0, format="%.2f")
+        },
+        key="pagos_editor"
+    ).dropna(how='all')
+    
+    if fecha_inicial >= fecha_final:
+        st.error("⚠️ La fecha inicial debe ser anterior a la fecha final.")
+    else:
+        try:
+            resultado_pagos = imputar_pagos(
+                monto, fecha_inicial, fecha_final, df_pagos, metodo_pagos, tasa_pura_ripte, cargar_series(version_datos),
+                tasa_pura_anual=False
+            )
+            saldo = resultado_pagos.iloc[-1]
+            
+            col_g1, col_g2, col_g3 = st.columns(3)
+            with col_g1:
+                st.metric("Total pagado", formato_moneda(resultado_pagos['pago'].sum()))
+            with col_g2:
+                st.metric("Saldo de capital", formato_moneda(saldo['saldo_capital']))
+            with col_g3:
+                st.metric("Saldo total adeudado", formato_moneda(saldo['saldo_total']))
+            
+            if resultado_pagos['excedente'].sum() > 0:
+                st.warning(f"⚠️ Los pagos exceden la deuda en {formato_moneda(resultado_pagos['excedente'].sum())}")
+            
+            tabla_pagos = resultado_pagos.assign(fecha=resultado_pagos['fecha'].dt.strftime('%d/%m/%Y'))
+            st.dataframe(tabla_pagos.round(2), use_container_width=True, hide_index=True)
+            
+            st.download_button(
+                label="📥 DESCARGAR IMPUTACIÓN (CSV)",
+                data=tabla_pagos.round(2).to_csv(index=False).encode('utf-8'),
+                file_name=f"pagos_a_cuenta_{fecha_final.strftime('%Y%m%d')}.csv",
+                mime="text/csv",
+                use_container_width=True,
+                key="download_pagos"
+            )
+        except Exception as e:
+            st.error(f"Error al imputar los pagos: {str(e)}")
+
+# Tablas de coeficientes al último dato publicado
+with st.expander("📥 TABLAS DE COEFICIENTES AL ÚLTIMO DATO"):
+    st.markdown("""
+    Coeficientes desde cada mes (RIPTE, IPC) o cada día (Tasa Activa) hasta el último dato publicado.
+    Se recalculan automáticamente cuando se actualizan los datasets.
+    """)
+    
+    tablas = cargar_series(version_datos).tablas_coeficientes()
+    col_t1, col_t2, col_t3 = st.columns(3)
+    for col_t, (clave, titulo) in zip((col_t1, col_t2, col_t3), (('ripte', 'RIPTE'), ('tasa', 'Tasa Activa'), ('ipc', 'IPC'))):
+        with col_t:
+            st.download_button(
+                label=f"📥 {titulo} ({len(tablas[clave])} filas)",
+                # El CSV se genera recién al descargar
+                data=lambda tabla=tablas[clave]: tabla.to_csv(index=False, date_format='%d/%m/%Y').encode('utf-8'),
+                file_name=f"coeficientes_{clave}.csv",
+                mime="text/csv",
+                use_container_width=True,
+                key=f"download_coeficientes_{clave}"
+            )
+
 # Información sobre cálculos
 with st.expander("ℹ️ INFORMACIÓN SOBRE MÉTODOS DE ACTUALIZACIÓN"):
     st.markdown("""
@@ -13,6 +13,10 @@ from pathlib import Path
 # Agregar path para imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from utils.auth import AuthSystem
+from utils.data_loader import derivado_dataset
+from utils.almacen import almacen_dataset
+from utils.historial import versiones
+from utils.indices import cargar_series
 
 # Inicializar sistema de autenticación
 auth = AuthSystem()
@@ -128,31 +132,48 @@ with tab2:
     st.markdown("## 📊 Edición de Datasets")
     
     datasets = {
-        "JUS": "data/Dataset_JUS.csv",
-        "IPC": "data/dataset_ipc.csv",
-        "RIPTE": "data/dataset_ripte.csv",
-        "Pisos Salariales": "data/dataset_pisos.csv",
-        "Tasa Activa": "data/dataset_tasa.csv"
+        "JUS": ("jus", "data/Dataset_JUS.csv"),
+        "IPC": ("ipc", "data/dataset_ipc.csv"),
+        "RIPTE": ("ripte", "data/dataset_ripte.csv"),
+        "Pisos Salariales": ("pisos", "data/dataset_pisos.csv"),
+        "Tasa Activa": ("tasa", "data/dataset_tasa.csv")
     }
     
     dataset_sel = st.selectbox("Seleccionar dataset", list(datasets.keys()))
-    archivo = datasets[dataset_sel]
+    clave_dataset, archivo = datasets[dataset_sel]
+    
+    # Cada cambio queda registrado como una versión del historial, con su autor
+    autor = st.session_state.usuario.get('username', '')
     
     try:
-        df = pd.read_csv(archivo, encoding='utf-8')
+        # Índice del archivo por versión: cada página se lee sin cargar el dataset completo
+        almacen = almacen_dataset(clave_dataset)
         
         st.markdown(f"### 📄 Dataset: {dataset_sel}")
-        st.caption(f"Archivo: `{archivo}` | Filas: {len(df)} | Columnas: {len(df.columns)}")
+        st.caption(f"Archivo: `{archivo}` | Filas: {almacen.filas} | Columnas: {len(almacen.columnas)} | Páginas: {almacen.paginas()}")
+        
+        pagina = st.number_input(
+            "Página",
+            min_value=1,
+            max_value=almacen.paginas(),
+            value=1,
+            step=1,
+            key=f"pagina_{clave_dataset}"
+        ) - 1
+        df_pagina = almacen.pagina(pagina)
         
         tab_ver, tab_agregar, tab_editar = st.tabs(["Ver Datos", "Agregar Fila", "Editar/Eliminar"])
         
         with tab_ver:
-            st.dataframe(df, use_container_width=True)
+            st.dataframe(df_pagina, use_container_width=True)
             
-            csv = df.to_csv(index=False).encode('utf-8')
+            # El CSV se genera recién al descargar y una sola vez por versión del archivo
             st.download_button(
                 label="📥 Descargar CSV",
-                data=csv,
+                data=lambda: derivado_dataset(
+                    f"exportacion_{clave_dataset}", (clave_dataset,),
+                    lambda: pd.read_csv(archivo, encoding='utf-8').to_csv(index=False).encode('utf-8')
+                ),
                 file_name=f"{dataset_sel}_export.csv",
                 mime="text/csv"
             )
@@ -162,30 +183,22 @@ with tab2:
             
             # Mensaje especial para Tasa Activa
             if dataset_sel == "Tasa Activa":
-                st.info("ℹ️ **Tasa Activa**: Las nuevas filas se agregan al **inicio** (arriba) de la tabla, ya que este dataset está ordenado de más reciente a más antiguo.")
+                st.info("ℹ️ **Tasa Activa**: Las nuevas filas se agregan al **final** del archivo (última página). Las calculadoras ordenan la serie por fecha, por lo que el orden de las filas no afecta los cálculos.")
             
             with st.form("form_agregar_fila"):
                 st.write("Complete los valores para cada columna:")
                 
                 nuevos_valores = {}
-                cols = st.columns(min(3, len(df.columns)))
+                cols = st.columns(min(3, len(almacen.columnas)))
                 
-                for idx, columna in enumerate(df.columns):
+                for idx, columna in enumerate(almacen.columnas):
                     with cols[idx % 3]:
                         nuevos_valores[columna] = st.text_input(f"{columna}")
                 
                 if st.form_submit_button("Agregar Fila", type="primary"):
                     try:
-                        nueva_fila = pd.DataFrame([nuevos_valores])
-                        
-                        # Para Tasa Activa, agregar al inicio (arriba)
-                        if dataset_sel == "Tasa Activa":
-                            df_actualizado = pd.concat([nueva_fila, df], ignore_index=True)
-                        else:
-                            # Para otros datasets, agregar al final (abajo)
-                            df_actualizado = pd.concat([df, nueva_fila], ignore_index=True)
-                        
-                        df_actualizado.to_csv(archivo, index=False, encoding='utf-8')
+                        # Se agrega una línea al final del archivo, sin leerlo ni reescribirlo
+                        almacen.agregar_filas([nuevos_valores], autor=autor)
                         
                         st.success(f"✅ Fila agregada exitosamente a {dataset_sel}")
                         st.rerun()
@@ -195,11 +208,15 @@ with tab2:
         
         with tab_editar:
             st.markdown("#### ✏️ Editar Datos")
+            st.caption("Se editan las filas de la página seleccionada; las filas nuevas se agregan al final del archivo.")
             
-            df_editado = st.data_editor(
-                df,
+            # La clave incluye la versión del archivo: al guardar, el editor arranca limpio
+            clave_editor = f"editor_{clave_dataset}_{pagina}_{almacen.version}"
+            st.data_editor(
+                df_pagina,
                 use_container_width=True,
-                num_rows="dynamic"
+                num_rows="dynamic",
+                key=clave_editor
             )
             
             col1, col2 = st.columns([1, 4])
@@ -207,9 +224,20 @@ with tab2:
             with col1:
                 if st.button("💾 Guardar Cambios", type="primary", use_container_width=True):
                     try:
-                        df_editado.to_csv(archivo, index=False, encoding='utf-8')
-                        st.success("✅ Cambios guardados exitosamente")
-                        st.rerun()
+                        # Solo se escriben las filas editadas, eliminadas o agregadas
+                        cambios = st.session_state[clave_editor]
+                        filas = df_pagina.index
+                        afectadas = almacen.guardar_cambios(
+                            modificadas={filas[int(pos)]: valores for pos, valores in cambios['edited_rows'].items()},
+                            eliminadas=[filas[int(pos)] for pos in cambios['deleted_rows']],
+                            agregadas=cambios['added_rows'],
+                            autor=autor
+                        )
+                        if afectadas:
+                            st.success(f"✅ Cambios guardados exitosamente ({afectadas} filas)")
+                            st.rerun()
+                        else:
+                            st.info("No hay cambios para guardar")
                     except Exception as e:
                         st.error(f"Error al guardar: {str(e)}")
             
@@ -218,6 +246,52 @@ with tab2:
     
     except Exception as e:
         st.error(f"Error al cargar dataset: {str(e)}")
+    
+    st.markdown("---")
+    st.markdown("### 📚 Historial de Versiones")
+    st.caption("Cada cambio guardado queda registrado con su número de versión. Las calculadoras pueden recalcular con los datasets vigentes en cualquier versión anterior.")
+    
+    registro = versiones()
+    if registro:
+        st.dataframe(
+            pd.DataFrame([{
+                'Versión': v['version'],
+                'Dataset': v['dataset'].upper(),
+                'Fecha': v['fecha'].replace('T', ' '),
+                'Usuario': v['autor'],
+                'Cambio': (
+                    f"{len(v['delta']['modificadas'])} mod. / {len(v['delta']['eliminadas'])} elim. / {len(v['delta']['agregadas'])} agr."
+                    if v['tipo'] == 'delta' else {'base': 'Estado inicial', 'externa': 'Cambio externo'}[v['tipo']]
+                ),
+            } for v in reversed(registro[-100:])]),
+            use_container_width=True,
+            hide_index=True
+        )
+    else:
+        st.info("Todavía no hay cambios registrados en el historial.")
+    
+    st.markdown("---")
+    st.markdown("### 📥 Tablas de Coeficientes al Último Dato")
+    st.caption("Coeficiente RIPTE, tasa activa acumulada e inflación desde cada mes o día hasta el último dato publicado. Se recalculan al modificar los datasets.")
+    
+    try:
+        tablas = cargar_series().tablas_coeficientes()
+        cols_tablas = st.columns(3)
+        for col_tabla, (clave, titulo) in zip(cols_tablas, (('ripte', 'RIPTE'), ('tasa', 'Tasa Activa'), ('ipc', 'IPC'))):
+            with col_tabla:
+                st.download_button(
+                    label=f"📥 {titulo} ({len(tablas[clave])} filas)",
+                    data=lambda clave=clave: derivado_dataset(
+                        f"coeficientes_{clave}", ('ripte', 'tasa', 'ipc'),
+                        lambda: tablas[clave].to_csv(index=False, date_format='%d/%m/%Y').encode('utf-8')
+                    ),
+                    file_name=f"coeficientes_{clave}.csv",
+                    mime="text/csv",
+                    use_container_width=True,
+                    key=f"admin_coeficientes_{clave}"
+                )
+    except Exception as e:
+        st.error(f"Error al generar las tablas de coeficientes: {str(e)}")
 
 st.markdown("---")
 st.caption("**Administración del Sistema** | Tribunal de Trabajo N° 2 de Quilmes")
\ No newline at end of file
@@ -12,13 +12,16 @@ from datetime import datetime, date, timedelta
 from decimal import Decimal, ROUND_HALF_UP
 import math
 import base64
-from io import BytesIO
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import cm
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
+import sys
+from pathlib import Path
+
+# Agregar path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.indices import cargar_series, fechas_ripte, ultimos_datos
+from utils.historial import leer_csv, selector_version
+from utils.liquidacion import liquidar_lote, barrido_fechas, COLUMNAS_LOTE
+from utils.reportes import pdf_despidos, documentos_lote_despidos, zip_documentos
+from utils.formato import formato_moneda
 
 # Configuración de la página
 st.set_page_config(
@@ -96,22 +99,17 @@ def days_in_month(d: date) -> int:
 
 # Cargar datasets
 @st.cache_data
-def cargar_datasets():
-    """Carga los datasets de RIPTE, Tasa e IPC"""
-    df_ripte = pd.read_csv("data/dataset_ripte.csv")
-    df_ripte['fecha'] = pd.to_datetime(df_ripte['año'].astype(str) + '-' + 
-                                       df_ripte['mes'].str[:3].map({
-                                           'Ene': '01', 'Feb': '02', 'Mar': '03', 'Abr': '04',
-                                           'May': '05', 'Jun': '06', 'Jul': '07', 'Ago': '08',
-                                           'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dic': '12'
-                                       }) + '-01')
-    
-    df_tasa = pd.read_csv("data/dataset_tasa.csv")
+def cargar_datasets(version=None):
+    """Carga los datasets de RIPTE, Tasa e IPC (actuales, o de una versión del historial)"""
+    df_ripte = leer_csv('ripte', version)
+    df_ripte['fecha'] = fechas_ripte(df_ripte)
+    
+    df_tasa = leer_csv('tasa', version)
     df_tasa['Desde'] = pd.to_datetime(df_tasa['Desde'])
     df_tasa['Hasta'] = pd.to_datetime(df_tasa['Hasta'])
     df_tasa['Valor'] = df_tasa['Valor'].astype(str).str.replace(',', '.').astype(float)
     
-    df_ipc = pd.read_csv("data/dataset_ipc.csv")
+    df_ipc = leer_csv('ipc', version)
     df_ipc['periodo'] = pd.to_datetime(df_ipc['periodo'])
     
     return df_ripte, df_tasa, df_ipc
@@ -291,176 +289,6 @@ def calcular_ipc_acumulado(fecha_inicial, fecha_final, df_ipc):
         st.error(f"Error en cálculo de IPC: {str(e)}")
         return 0.0
 
-# Función para formatear montos
-def formato_moneda(valor):
-    """Formatea un valor como moneda argentina"""
-    return f"$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-
-# Función para generar PDF
-def generar_pdf(datos_calculo, datos_actualizacion):
-    """Genera un PDF con los resultados"""
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=2*cm, leftMargin=2*cm, 
-                           topMargin=2*cm, bottomMargin=2*cm)
-    
-    elements = []
-    styles = getSampleStyleSheet()
-    
-    # Título
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        textColor=colors.HexColor('#2E86AB'),
-        spaceAfter=30,
-        alignment=TA_CENTER
-    )
-    
-    elements.append(Paragraph("LIQUIDACIÓN DE INDEMNIZACIÓN POR DESPIDO", title_style))
-    
-    # Expediente y carátula si están disponibles
-    if datos_calculo.get('nro_expediente') or datos_calculo.get('caratula'):
-        expediente_style = ParagraphStyle(
-            'Expediente',
-            parent=styles['Normal'],
-            fontSize=11,
-            textColor=colors.HexColor('#666666'),
-            spaceAfter=10,
-            alignment=TA_CENTER
-        )
-        
-        if datos_calculo.get('nro_expediente'):
-            elements.append(Paragraph(f"<b>Expediente Nro:</b> {datos_calculo['nro_expediente']}", expediente_style))
-        
-        if datos_calculo.get('caratula'):
-            elements.append(Paragraph(f"<b>Carátula:</b> {datos_calculo['caratula']}", expediente_style))
-    
-    elements.append(Spacer(1, 0.5*cm))
-    
-    # Datos del trabajador
-    data_trabajador = [
-        ['Fecha de Ingreso:', datos_calculo['fecha_ingreso']],
-        ['Fecha de Despido:', datos_calculo['fecha_despido']],
-        ['Antigüedad:', f"{datos_calculo['años']} años"],
-        ['Salario Mensual Bruto:', formato_moneda(datos_calculo['salario'])],
-        ['Preaviso:', datos_calculo['preaviso']],
-    ]
-    
-    t1 = Table(data_trabajador, colWidths=[6*cm, 8*cm])
-    t1.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#E8F5E8')),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-    ]))
-    
-    elements.append(t1)
-    elements.append(Spacer(1, 0.7*cm))
-    
-    # Conceptos
-    elements.append(Paragraph("DETALLE DE CONCEPTOS", styles['Heading2']))
-    elements.append(Spacer(1, 0.3*cm))
-    
-    data_conceptos = [
-        ['Concepto', 'Importe'],
-        ['Antigüedad Art. 245', formato_moneda(datos_calculo['antiguedad_245'])],
-    ]
-    
-    if datos_calculo.get('sustitutiva_preaviso', 0) > 0:
-        data_conceptos.append(['Sustitutiva de Preaviso', formato_moneda(datos_calculo['sustitutiva_preaviso'])])
-        data_conceptos.append(['SAC Preaviso', formato_moneda(datos_calculo['sac_preaviso'])])
-    
-    data_conceptos.extend([
-        ['Días trabajados del Mes', formato_moneda(datos_calculo['dias_trabajados'])],
-        ['Integración mes de Despido', formato_moneda(datos_calculo['integracion_mes'])],
-        ['SAC Integración mes', formato_moneda(datos_calculo['sac_integracion'])],
-        ['SAC Proporcional', formato_moneda(datos_calculo['sac_proporcional'])],
-        ['Vacaciones no Gozadas', formato_moneda(datos_calculo['vacaciones'])],
-        ['SAC Vacaciones', formato_moneda(datos_calculo['sac_vacaciones'])],
-    ])
-    
-    # Agregar otros conceptos si existe
-    if datos_calculo.get('otros_conceptos', 0) > 0:
-        data_conceptos.append(['Otros Conceptos', formato_moneda(datos_calculo['otros_conceptos'])])
-    
-    t2 = Table(data_conceptos, colWidths=[10*cm, 4*cm])
-    t2.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-    ]))
-    
-    elements.append(t2)
-    elements.append(Spacer(1, 0.5*cm))
-    
-    # Total - usar total_final si existe, sino usar total
-    total_a_mostrar = datos_calculo.get('total_final', datos_calculo['total'])
-    data_total = [
-        ['INDEMNIZACIÓN TOTAL', formato_moneda(total_a_mostrar)]
-    ]
-    
-    t3 = Table(data_total, colWidths=[10*cm, 4*cm])
-    t3.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#F18F01')),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.whitesmoke),
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-    ]))
-    
-    elements.append(t3)
-    elements.append(Spacer(1, 0.7*cm))
-    
-    # Actualizaciones
-    elements.append(Paragraph("ACTUALIZACIONES", styles['Heading2']))
-    elements.append(Spacer(1, 0.3*cm))
-    
-    data_act = [
-        ['Método', 'Monto Actualizado'],
-        ['Actualización RIPTE + 3%', formato_moneda(datos_actualizacion['ripte'])],
-        ['Actualización Tasa Activa', formato_moneda(datos_actualizacion['tasa'])],
-    ]
-    
-    t4 = Table(data_act, colWidths=[10*cm, 4*cm])
-    t4.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#28a745')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-    ]))
-    
-    elements.append(t4)
-    elements.append(Spacer(1, 0.5*cm))
-    
-    # Nota
-    nota_style = ParagraphStyle(
-        'Note',
-        parent=styles['Normal'],
-        fontSize=8,
-        textColor=colors.grey,
-        alignment=TA_CENTER
-    )
-    elements.append(Paragraph("Nota: Los resultados indicados son aproximados.", nota_style))
-    
-    doc.build(elements)
-    buffer.seek(0)
-    return buffer
-
 # Header con estilo inline completo
 st.markdown("""
 <div style="background-color: #2E86AB; padding: 20px; border-radius: 10px; text-align: center; color: white; margin-bottom: 30px;">
@@ -469,8 +297,9 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Cargar datasets
-df_ripte, df_tasa, df_ipc = cargar_datasets()
+# Cargar datasets (actuales, o los de una versión anterior para reproducir una liquidación)
+version_datos = selector_version("version_datos_despidos")
+df_ripte, df_tasa, df_ipc = cargar_datasets(version_datos)
 
 # Formulario de entrada y resultados en dos columnas
 col_inputs, col_results = st.columns([1, 1])
@@ -710,51 +539,22 @@ if 'datos_actualizacion' in st.session_state:
         )
         st.caption("Variación inflacionaria del período")
     
-    # Últimos datos disponibles
+    # Últimos datos disponibles (resumen en memoria, se relee solo si cambian los datasets)
+    ultimos = ultimos_datos()
     ultimo_ripte_txt = ""
     ultimo_ipc_txt = ""
     ultima_tasa_txt = ""
     
-    # RIPTE
-    if not df_ripte.empty:
-        ultimo_ripte = df_ripte.iloc[-1]
-        fecha_ripte = ultimo_ripte['fecha']
-        valor_ripte = ultimo_ripte['indice_ripte']
-        if pd.notnull(fecha_ripte):
-            if isinstance(fecha_ripte, pd.Timestamp):
-                mes_ripte = fecha_ripte.month
-                año_ripte = fecha_ripte.year
-            else:
-                mes_ripte = fecha_ripte.month
-                año_ripte = fecha_ripte.year
-            ultimo_ripte_txt = f"RIPTE {mes_ripte}/{año_ripte}: {valor_ripte:,.0f}"
-    
-    # IPC
-    if not df_ipc.empty:
-        ultimo_ipc = df_ipc.iloc[-1]
-        fecha_ipc = ultimo_ipc['periodo']
-        variacion_ipc = ultimo_ipc['variacion_mensual']
-        if pd.notnull(fecha_ipc):
-            if isinstance(fecha_ipc, pd.Timestamp):
-                mes_ipc = fecha_ipc.month
-                año_ipc = fecha_ipc.year
-            else:
-                fecha_ipc = pd.to_datetime(fecha_ipc)
-                mes_ipc = fecha_ipc.month
-                año_ipc = fecha_ipc.year
-            ultimo_ipc_txt = f"IPC {mes_ipc}/{año_ipc}: {variacion_ipc:.2f}%"
-    
-    # TASA ACTIVA
-    if not df_tasa.empty:
-        ultima_tasa = df_tasa.iloc[0]
-        valor_tasa = ultima_tasa['Valor']
-        fecha_hasta = ultima_tasa['Hasta']
-        if pd.notnull(fecha_hasta):
-            if isinstance(fecha_hasta, pd.Timestamp):
-                fecha_txt = fecha_hasta.strftime("%d/%m/%Y")
-            else:
-                fecha_txt = pd.to_datetime(fecha_hasta).strftime("%d/%m/%Y")
-            ultima_tasa_txt = f"TASA ACTIVA {fecha_txt}: {valor_tasa:.2f}%"
+    if ultimos['ripte']:
+        fecha_ripte = ultimos['ripte']['fecha']
+        ultimo_ripte_txt = f"RIPTE {fecha_ripte.month}/{fecha_ripte.year}: {ultimos['ripte']['valor']:,.0f}"
+    
+    if ultimos['ipc']:
+        fecha_ipc = ultimos['ipc']['fecha']
+        ultimo_ipc_txt = f"IPC {fecha_ipc.month}/{fecha_ipc.year}: {ultimos['ipc']['variacion']:.2f}%"
+    
+    if ultimos['tasa'] and pd.notnull(ultimos['tasa']['hasta']):
+        ultima_tasa_txt = f"TASA ACTIVA {ultimos['tasa']['hasta'].strftime('%d/%m/%Y')}: {ultimos['tasa']['valor']:.2f}%"
     
     # Mostrar cuadro de últimos datos
     st.warning(f"""
@@ -780,21 +580,167 @@ if 'datos_actualizacion' in st.session_state:
         with col_exp2:
             caratula = st.text_input("Carátula", key="caratula_pdf")
         
-        # Generar PDF directamente
         st.session_state.datos_calculo['nro_expediente'] = nro_expediente
         st.session_state.datos_calculo['caratula'] = caratula
         
-        pdf_buffer = generar_pdf(st.session_state.datos_calculo, st.session_state.datos_actualizacion)
+        # El PDF se genera recién al descargar y se reutiliza mientras no cambien los datos
+        datos_pdf = dict(st.session_state.datos_calculo)
+        actualizacion_pdf = dict(st.session_state.datos_actualizacion)
         
         st.download_button(
             label="📥 DESCARGAR PDF",
-            data=pdf_buffer,
+            data=lambda: pdf_despidos(datos_pdf, actualizacion_pdf),
             file_name=f"liquidacion_despido_{st.session_state.datos_calculo['fecha_despido'].replace('/', '')}.pdf",
             mime="application/pdf",
             use_container_width=True,
             key="download_pdf_button"
         )
 
+# Liquidación masiva
+st.markdown("---")
+with st.expander("📦 LIQUIDACIÓN MASIVA (CSV)"):
+    st.markdown(f"""
+    Cargue un archivo CSV con una fila por trabajador y las columnas
+    **{', '.join(COLUMNAS_LOTE)}**.
+    - Fechas en formato `DD/MM/AAAA` o `AAAA-MM-DD`
+    - **preaviso**: `si` si se pagó el preaviso, `no` en caso contrario
+    """)
+    
+    archivo_lote = st.file_uploader("Archivo CSV", type=["csv"], key="lote_despidos_csv")
+    
+    if archivo_lote is not None:
+        try:
+            df_lote = pd.read_csv(archivo_lote, sep=None, engine="python")
+            resultado_lote = liquidar_lote(df_lote, cargar_series(version_datos))
+            
+            validas = resultado_lote['observaciones'] == ''
+            col_l1, col_l2, col_l3 = st.columns(3)
+            with col_l1:
+                st.metric("Trabajadores", f"{int(validas.sum())} de {len(resultado_lote)}")
+            with col_l2:
+                st.metric("Total Indemnizaciones", formato_moneda(resultado_lote.loc[validas, 'total'].sum()))
+            with col_l3:
+                st.metric("Total Tasa Activa", formato_moneda(resultado_lote.loc[validas, 'actualizado_tasa'].sum()))
+            
+            if not validas.all():
+                st.warning(f"⚠️ {int((~validas).sum())} filas con datos inválidos (ver columna 'observaciones')")
+            
+            st.dataframe(resultado_lote, use_container_width=True, hide_index=True)
+            
+            st.download_button(
+                label="📥 DESCARGAR LIQUIDACIONES (CSV)",
+                data=resultado_lote.round(2).to_csv(index=False).encode('utf-8'),
+                file_name="liquidacion_masiva_despidos.csv",
+                mime="text/csv",
+                use_container_width=True,
+                key="download_lote_button"
+            )
+            
+            # Un PDF por trabajador, generados en paralelo recién al descargar
+            documentos_lote = documentos_lote_despidos(resultado_lote)
+            if documentos_lote:
+                st.download_button(
+                    label=f"🗂️ DESCARGAR {len(documentos_lote)} PDF (ZIP)",
+                    data=lambda: zip_documentos(documentos_lote),
+                    file_name="liquidaciones_despidos_pdf.zip",
+                    mime="application/zip",
+                    use_container_width=True,
+                    key="download_lote_pdf_button"
+                )
+        except Exception as e:
+            st.error(f"Error al procesar el archivo: {str(e)}")
+
+# Barrido de fechas
+with st.expander("📅 BARRIDO DE FECHAS"):
+    st.markdown("""
+    Calcula la liquidación con los datos ingresados para **cada fecha** de un rango,
+    variando la fecha de despido o la fecha de liquidación.
+    """)
+    
+    col_b1, col_b2 = st.columns(2)
+    with col_b1:
+        variable_barrido = st.radio(
+            "Fecha a variar",
+            options=['despido', 'liquidacion'],
+            format_func=lambda v: "Fecha de despido" if v == 'despido' else "Fecha de liquidación",
+            horizontal=True,
+            key="barrido_variable"
+        )
+    with col_b2:
+        frecuencia_barrido = st.radio(
+            "Frecuencia",
+            options=['mensual', 'diaria'],
+            format_func=str.capitalize,
+            horizontal=True,
+            key="barrido_frecuencia"
+        )
+    
+    col_b3, col_b4 = st.columns(2)
+    with col_b3:
+        desde_barrido = st.date_input(
+            "Desde",
+            value=fecha_ingreso if variable_barrido == 'despido' else fecha_despido,
+            min_value=date(1990, 1, 1),
+            format="DD/MM/YYYY",
+            key="barrido_desde"
+        )
+    with col_b4:
+        hasta_barrido = st.date_input(
+            "Hasta",
+            value=fecha_liquidacion if variable_barrido == 'despido' else date.today(),
+            min_value=date(1990, 1, 1),
+            format="DD/MM/YYYY",
+            key="barrido_hasta"
+        )
+    
+    if salario <= 0:
+        st.info("Ingrese el salario para calcular el barrido")
+    elif desde_barrido > hasta_barrido:
+        st.error("La fecha 'Desde' debe ser anterior a la fecha 'Hasta'")
+    elif st.button("📅 CALCULAR BARRIDO", use_container_width=True, key="barrido_button"):
+        # Se calcula solo al presionar el botón; el resultado queda en session_state
+        try:
+            resultado_barrido = barrido_fechas(
+                fecha_ingreso, fecha_despido, fecha_liquidacion, salario,
+                se_pago_preaviso, variable_barrido, desde_barrido, hasta_barrido,
+                frecuencia_barrido, cargar_series(version_datos)
+            )
+            st.session_state.barrido = {
+                'variable': variable_barrido,
+                'frecuencia': frecuencia_barrido,
+                'desde': desde_barrido.strftime('%d/%m/%Y'),
+                'hasta': hasta_barrido.strftime('%d/%m/%Y'),
+                'grafico': resultado_barrido.set_index('fecha')[['total', 'actualizado_ripte', 'actualizado_tasa']].rename(columns={
+                    'total': 'Capital histórico',
+                    'actualizado_ripte': 'RIPTE + 3%',
+                    'actualizado_tasa': 'Tasa Activa'
+                }),
+                'tabla': resultado_barrido.assign(fecha=resultado_barrido['fecha'].dt.strftime('%d/%m/%Y')).round(2),
+            }
+        except Exception as e:
+            st.session_state.pop('barrido', None)
+            st.error(f"Error al calcular el barrido: {str(e)}")
+    
+    if 'barrido' in st.session_state:
+        barrido = st.session_state.barrido
+        if barrido['tabla'].empty:
+            st.warning("⚠️ Ninguna fecha del rango es compatible con las fechas de ingreso, despido y liquidación")
+        else:
+            st.caption(f"Fecha de {'despido' if barrido['variable'] == 'despido' else 'liquidación'} "
+                       f"del {barrido['desde']} al {barrido['hasta']} ({barrido['frecuencia']})")
+            st.line_chart(barrido['grafico'])
+            st.dataframe(barrido['tabla'], use_container_width=True, hide_index=True)
+            
+            # El CSV se genera recién al descargar
+            st.download_button(
+                label="📥 DESCARGAR BARRIDO (CSV)",
+                data=lambda tabla=barrido['tabla']: tabla.to_csv(index=False).encode('utf-8'),
+                file_name=f"barrido_{barrido['variable']}_{barrido['frecuencia']}.csv",
+                mime="text/csv",
+                use_container_width=True,
+                key="download_barrido_button"
+            )
+
 # Información sobre cálculos
 with st.expander("ℹ️ INFORMACIÓN SOBRE CÁLCULOS Y FUENTES"):
     st.markdown("""
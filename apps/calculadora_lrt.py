@@ -10,12 +10,25 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, date, timedelta
 import os
+import io
 import math
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from typing import Optional, Tuple
-import base64
+import sys
 from decimal import Decimal, ROUND_HALF_UP
 
+# Agregar path para imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.liquidacion import fechas_periodicas, redondear_fraccion, redondear_vector
+from utils.actualizacion import imputar_pagos
+from utils.data_loader import derivado_dataset
+from utils.historial import contenido_en, selector_version
+from utils.indices import SeriesActualizacion, buscar_cruces, ultimos_datos
+from utils.reportes import pdf_informe
+from utils.plantillas import renderizar
+from utils.letras import numero_a_letras
+from utils.formato import formato_moneda, formato_porcentaje, columna_moneda
+
 # Configuración de la página
 st.set_page_config(
     page_title="Calculadora Indemnizaciones LRT",
@@ -254,80 +267,6 @@ def days_in_month(d: date) -> int:
         nxt = date(d.year, d.month + 1, 1)
     return (nxt - date(d.year, d.month, 1)).days
 
-def numero_a_letras(numero):
-    """Convierte un número a su representación en letras (pesos argentinos)"""
-    unidades = ['', 'UN', 'DOS', 'TRES', 'CUATRO', 'CINCO', 'SEIS', 'SIETE', 'OCHO', 'NUEVE']
-    decenas = ['', '', 'VEINTE', 'TREINTA', 'CUARENTA', 'CINCUENTA', 'SESENTA', 'SETENTA', 'OCHENTA', 'NOVENTA']
-    especiales = ['DIEZ', 'ONCE', 'DOCE', 'TRECE', 'CATORCE', 'QUINCE', 'DIECISÉIS', 'DIECISIETE', 'DIECIOCHO', 'DIECINUEVE']
-    centenas = ['', 'CIENTO', 'DOSCIENTOS', 'TRESCIENTOS', 'CUATROCIENTOS', 'QUINIENTOS', 'SEISCIENTOS', 'SETECIENTOS', 'OCHOCIENTOS', 'NOVECIENTOS']
-    
-    def convertir_grupo(n):
-        if n == 0:
-            return ''
-        elif n == 100:
-            return 'CIEN'
-        elif n < 10:
-            return unidades[n]
-        elif n < 20:
-            return especiales[n - 10]
-        elif n < 100:
-            dec = n // 10
-            uni = n % 10
-            if uni == 0:
-                return decenas[dec]
-            else:
-                return decenas[dec] + (' Y ' if dec > 2 else 'I') + unidades[uni]
-        else:
-            cen = n // 100
-            resto = n % 100
-            if resto == 0:
-                return centenas[cen]
-            else:
-                return centenas[cen] + ' ' + convertir_grupo(resto)
-    
-    if numero == 0:
-        return 'CERO PESOS'
-    
-    entero = int(numero)
-    decimal = int(round((numero - entero) * 100))
-    
-    if entero >= 1000000000:
-        miles_millon = entero // 1000000000
-        resto = entero % 1000000000
-        texto = convertir_grupo(miles_millon) + ' MIL'
-        if resto >= 1000000:
-            millones = resto // 1000000
-            resto = resto % 1000000
-            texto += ' ' + (convertir_grupo(millones) if millones > 1 else 'UN') + ' MILLÓN' + ('ES' if millones > 1 else '')
-        if resto > 0:
-            if resto >= 1000:
-                miles = resto // 1000
-                resto = resto % 1000
-                texto += ' ' + convertir_grupo(miles) + ' MIL'
-            if resto > 0:
-                texto += ' ' + convertir_grupo(resto)
-    elif entero >= 1000000:
-        millones = entero // 1000000
-        resto = entero % 1000000
-        texto = (convertir_grupo(millones) if millones > 1 else 'UN') + ' MILLÓN' + ('ES' if millones > 1 else '')
-        if resto > 0:
-            if resto >= 1000:
-                miles = resto // 1000
-                resto = resto % 1000
-                texto += ' ' + convertir_grupo(miles) + ' MIL'
-            if resto > 0:
-                texto += ' ' + convertir_grupo(resto)
-    elif entero >= 1000:
-        miles = entero // 1000
-        resto = entero % 1000
-        texto = convertir_grupo(miles) + ' MIL'
-        if resto > 0:
-            texto += ' ' + convertir_grupo(resto)
-    else:
-        texto = convertir_grupo(entero)
-    
-    return f'PESOS {texto} CON {decimal:02d}/100'
-
 def get_mes_nombre(mes):
     """Retorna el nombre del mes en español"""
     meses = ['Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
@@ -371,21 +310,29 @@ class Results:
 class DataManager:
     """Gestor de datasets CSV"""
     
-    def __init__(self):
+    def __init__(self, version: Optional[int] = None):
+        # Versión del historial de datasets (None: archivos actuales)
+        self.version = version
         self.ipc_data = None
         self.pisos_data = None
         self.ripte_data = None
         self.tasa_data = None
+        self._series = None
         self.load_all_datasets()
     
-    def _load_csv(self, path):
-        """Carga CSV con múltiples separadores"""
-        if not os.path.exists(path):
+    def _load_csv(self, path, clave=None):
+        """Carga CSV con múltiples separadores (o su versión del historial)"""
+        contenido = contenido_en(clave, self.version) if clave and self.version is not None else None
+        if contenido is not None:
+            path = io.BytesIO(contenido)
+        elif not os.path.exists(path):
             st.error(f"No se encontró el dataset: {path}")
             return pd.DataFrame()
         
         for sep in [",", ";", "\t"]:
             try:
+                if contenido is not None:
+                    path.seek(0)
                 df = pd.read_csv(path, sep=sep)
                 if df.shape[1] >= 1:
                     return df
@@ -393,6 +340,8 @@ class DataManager:
                 continue
         
         try:
+            if contenido is not None:
+                path.seek(0)
             return pd.read_csv(path, sep=",", encoding="latin-1")
         except Exception as e:
             st.error(f"No se pudo leer el dataset {path}.\n{e}")
@@ -401,10 +350,10 @@ class DataManager:
     def load_all_datasets(self):
         """Carga todos los datasets"""
         try:
-            self.ripte_data = self._load_csv(PATH_RIPTE)
-            self.tasa_data = self._load_csv(PATH_TASA)  
-            self.ipc_data = self._load_csv(PATH_IPC)
-            self.pisos_data = self._load_csv(PATH_PISOS)
+            self.ripte_data = self._load_csv(PATH_RIPTE, 'ripte')
+            self.tasa_data = self._load_csv(PATH_TASA, 'tasa')
+            self.ipc_data = self._load_csv(PATH_IPC, 'ipc')
+            self.pisos_data = self._load_csv(PATH_PISOS, 'pisos')
             
             self._norm_ripte()
             self._norm_tasa()
@@ -660,6 +609,17 @@ class DataManager:
         
         return float(total_aporte_pct), float(total_actualizado)
     
+    def get_series(self) -> SeriesActualizacion:
+        """Series acumuladas de RIPTE, tasa e IPC para consultas vectorizadas"""
+        if self._series is None:
+            tasa = self.tasa_data.copy()
+            if not tasa.empty:
+                # Igual que calcular_tasa_activa: sin 'hasta' se toma el fin de mes de 'desde'
+                fin_mes = tasa["desde"].apply(lambda d: date(d.year, d.month, days_in_month(d)) if isinstance(d, date) else None)
+                tasa["hasta"] = tasa["hasta"].where(tasa["hasta"].notna(), fin_mes)
+            self._series = SeriesActualizacion.desde_dataframes(self.ripte_data, tasa, self.ipc_data)
+        return self._series
+    
     def calcular_inflacion(self, fecha_pmi: date, fecha_final: date) -> float:
         """Cálculo de inflación"""
         if self.ipc_data.empty:
@@ -742,6 +702,83 @@ class Calculator:
             inflacion_acum_pct=inflacion_acum_pct
         )
     
+    def calcular_evolucion(self, input_data: InputData, capital_base: float, frecuencia: str = "mensual") -> pd.DataFrame:
+        """Capital actualizado por RIPTE + 3%, tasa activa e IPC en cada fecha entre la PMI y la fecha final"""
+        fechas = fechas_periodicas(input_data.pmi_date, input_data.final_date, frecuencia)
+        if len(fechas) == 0 or fechas[-1] != pd.Timestamp(input_data.final_date):
+            fechas = fechas.append(pd.DatetimeIndex([pd.Timestamp(input_data.final_date)]))
+        
+        series = self.data_manager.get_series()
+        pmi = np.full(len(fechas), np.datetime64(input_data.pmi_date, "D"))
+        
+        ripte_coef = series.coeficiente_ripte(pmi, fechas)
+        ripte_actualizado = redondear_vector(capital_base * ripte_coef)
+        dias = (fechas - pd.Timestamp(input_data.pmi_date)).days.to_numpy()
+        interes_puro_3_pct = redondear_vector(ripte_actualizado * 0.03 * dias / 365)
+        
+        tasa_activa_pct = series.tasa_acumulada_por_tramo(input_data.pmi_date, fechas)
+        inflacion_acum_pct = series.inflacion_acumulada(pmi, fechas)
+        
+        return pd.DataFrame({
+            "fecha": fechas,
+            "ripte_coef": ripte_coef,
+            "total_ripte_3": redondear_vector(ripte_actualizado + interes_puro_3_pct),
+            "tasa_activa_pct": tasa_activa_pct,
+            "total_tasa_activa": redondear_vector(capital_base * (1 + tasa_activa_pct / 100)),
+            "inflacion_acum_pct": inflacion_acum_pct,
+            "total_ipc": redondear_vector(capital_base * (1 + inflacion_acum_pct / 100))
+        })
+    
+    def calcular_grilla(self, ibm: float, pmi_date: date, edades, incapacidades,
+                        incluir_20_pct: bool) -> pd.DataFrame:
+        """Calcula el capital para cada combinación edad × incapacidad en una sola pasada"""
+        edad_col, incapacidad_col = np.meshgrid(
+            np.asarray(edades, dtype=float), np.asarray(incapacidades, dtype=float), indexing="ij"
+        )
+        edad_col = edad_col.ravel()
+        incapacidad_col = incapacidad_col.ravel()
+        
+        # Importes en centavos e incapacidad en centésimos para redondear sin error de punto flotante
+        ibm_centavos = int(Decimal(str(ibm)) * 100)
+        incapacidad_centesimos = np.rint(incapacidad_col * 100).astype(np.int64)
+        edad_entera = edad_col.astype(np.int64)
+        
+        numerador = ibm_centavos * 53 * 65 * incapacidad_centesimos
+        denominador = edad_entera * 10000
+        capital_formula = redondear_fraccion(numerador, denominador)
+        
+        # En los casos que caen exactamente en medio centavo se respeta el redondeo del cálculo individual
+        for i in np.flatnonzero((2 * numerador) % (2 * denominador) == denominador):
+            capital_formula[i] = round(self._calcular_capital_formula(InputData(
+                pmi_date, pmi_date, ibm, int(edad_entera[i]), float(incapacidad_col[i]), incluir_20_pct
+            )) * 100)
+        
+        piso_minimo, _ = self.data_manager.get_piso_minimo(pmi_date)
+        if piso_minimo is None:
+            piso_proporcional = np.zeros_like(capital_formula)
+            piso_aplicado = np.zeros(len(capital_formula), dtype=bool)
+        else:
+            piso_centavos = int(Decimal(str(piso_minimo)) * 100)
+            piso_proporcional = redondear_fraccion(piso_centavos * incapacidad_centesimos, np.full(len(capital_formula), 10000))
+            piso_aplicado = capital_formula < piso_proporcional
+        capital_aplicado = np.where(piso_aplicado, piso_proporcional, capital_formula)
+        
+        if incluir_20_pct:
+            adicional_20_pct = redondear_fraccion(capital_aplicado * 20, np.full(len(capital_aplicado), 100))
+        else:
+            adicional_20_pct = np.zeros_like(capital_aplicado)
+        capital_base = capital_aplicado + adicional_20_pct
+        
+        return pd.DataFrame({
+            'edad': edad_col.astype(int),
+            'incapacidad_pct': incapacidad_col,
+            'capital_formula': capital_formula / 100,
+            'piso_proporcional': piso_proporcional / 100,
+            'piso_aplicado': piso_aplicado,
+            'adicional_20_pct': adicional_20_pct / 100,
+            'capital_base': capital_base / 100
+        })
+    
     def _calcular_capital_formula(self, input_data: InputData) -> float:
         """Calcula capital según fórmula"""
         capital = Decimal(str(input_data.ibm)) * Decimal('53') * (Decimal('65') / Decimal(str(input_data.edad))) * (Decimal(str(input_data.incapacidad_pct)) / Decimal('100'))
@@ -766,15 +803,18 @@ class NumberUtils:
     @staticmethod
     def format_money(amount: float) -> str:
         """Formatea cantidad como dinero argentino"""
-        return f"$ {amount:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+        return formato_moneda(amount)
     
     @staticmethod
     def format_percentage(percentage: float) -> str:
         """Formatea porcentaje"""
-        return f"{percentage:.2f}%".replace('.', ',')
+        return formato_porcentaje(percentage)
 
 # --- Carga forzada de datasets en cada ejecución ---
-data_mgr = DataManager()
+# (actuales, o los de una versión anterior para reproducir una liquidación)
+with st.sidebar:
+    version_datos = selector_version("version_datos_lrt")
+data_mgr = DataManager(version_datos)
 st.session_state.data_manager = data_mgr
 st.session_state.calculator = Calculator(data_mgr)
 
@@ -865,15 +905,56 @@ with st.sidebar:
 if st.session_state.results is not None:
     results = st.session_state.results
     input_data = st.session_state.input_data
-    
+
+    # Valores de los textos de sentencia, liquidación e informe (ver utils/plantillas.py)
+    ripte_favorable = results.total_ripte_3 >= results.total_tasa_activa
+    total_actualizacion = results.total_ripte_3 if ripte_favorable else results.total_tasa_activa
+    tasa_justicia = total_actualizacion * 0.022
+    sobretasa_caja = tasa_justicia * 0.10
+    total_final = total_actualizacion + tasa_justicia + sobretasa_caja
+    fecha_ultimo_ripte = data_mgr.ripte_data.iloc[-1]['fecha']
+    valores_texto = {
+        **asdict(input_data),
+        **asdict(results),
+        'mes_pmi': get_mes_nombre(input_data.pmi_date.month),
+        'anio_pmi': input_data.pmi_date.year,
+        'mes_final': get_mes_nombre(input_data.final_date.month),
+        'anio_final': input_data.final_date.year,
+        'mes_ultimo_ripte': get_mes_nombre(fecha_ultimo_ripte.month),
+        'anio_ultimo_ripte': fecha_ultimo_ripte.year,
+        'pct_ripte': (results.ripte_coef - 1) * 100,
+        'texto_piso': renderizar(
+            'lrt_piso_aplicado' if results.piso_aplicado else 'lrt_piso_superado',
+            {**asdict(input_data), **asdict(results)}
+        ),
+        'texto_20_pct': ('20% Art. 3 Ley 26.773: ' + NumberUtils.format_money(results.adicional_20_pct)
+                         if input_data.incluir_20_pct else '20% Art. 3 Ley 26.773: no se aplica'),
+        'texto_incluye_20': 'Sí' if input_data.incluir_20_pct else 'No',
+        'texto_piso_monto': NumberUtils.format_money(results.piso_proporcional) if results.piso_aplicado else '-',
+        'texto_adicional_20': NumberUtils.format_money(results.adicional_20_pct) if results.adicional_20_pct > 0 else '-',
+        # Liquidación por el método más favorable
+        'metodo_usado': "tasa de variación RIPTE" if ripte_favorable else "Tasa Activa BNA",
+        'metodo_favorable': "RIPTE + 3%" if ripte_favorable else "Tasa Activa BNA",
+        'monto_favorable': total_actualizacion,
+        'total_actualizacion': total_actualizacion,
+        'tasa_justicia': tasa_justicia,
+        'sobretasa_caja': sobretasa_caja,
+        'total_final': total_final,
+        'capital_letras': numero_a_letras(results.capital_base),
+        'monto_letras': numero_a_letras(total_final),
+    }
+
     # Tabs principales (agregamos tab6 para PDF)
-    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = st.tabs([
         "📊 Resultados", 
         "📄 Sentencia", 
         "💰 Liquidación", 
         "📋 Mínimos SRT",
         "ℹ️ Información",
-        "🖨️ Imprimir PDF"
+        "🖨️ Imprimir PDF",
+        "🔢 Grilla Edad × Incapacidad",
+        "📈 Evolución",
+        "💵 Pagos a Cuenta"
     ])
     
     with tab1:
@@ -939,56 +1020,37 @@ if st.session_state.results is not None:
             <strong>Capital calculado:</strong> {NumberUtils.format_money(results.capital_formula)}
         </div>
         """, unsafe_allow_html=True)
-    # 📊 Últimos Datos Disponibles 
-    data_mgr = st.session_state.data_manager
+    # 📊 Últimos Datos Disponibles (resumen en memoria, se relee solo si cambian los datasets)
+    ultimos = ultimos_datos()
 
     ultimo_ripte_txt = "RIPTE: N/D"
     ultimo_ipc_txt = "IPC: N/D"
     ultima_tasa_txt = "TASA ACTIVA: N/D"
     ultimo_piso_txt = "PISO SRT: N/D"
 
-    # --- RIPTE ---
-    if not data_mgr.ripte_data.empty:
-        ultimo_ripte = data_mgr.ripte_data.iloc[-1]
-        fecha_ripte = ultimo_ripte.get("fecha")
-        valor_ripte = ultimo_ripte.get("ripte", 0)
-        if pd.notnull(fecha_ripte):
-            ultimo_ripte_txt = f"RIPTE {fecha_ripte.month}/{fecha_ripte.year}: {valor_ripte:,.0f}"
+    if ultimos['ripte']:
+        fecha_ripte = ultimos['ripte']['fecha']
+        ultimo_ripte_txt = f"RIPTE {fecha_ripte.month}/{fecha_ripte.year}: {ultimos['ripte']['valor']:,.0f}"
 
-    # --- IPC: mostrar mes y año ---
-    if not data_mgr.ipc_data.empty:
-        ultimo_ipc = data_mgr.ipc_data.iloc[-1]
-        mes_ipc = int(ultimo_ipc.get("mes", getattr(ultimo_ipc.get("fecha"), "month", 0)))
-        año_ipc = int(ultimo_ipc.get("año", getattr(ultimo_ipc.get("fecha"), "year", 0)))
-        variacion_ipc = ultimo_ipc.get("ipc", 0)
-        ultimo_ipc_txt = f"IPC {mes_ipc}/{año_ipc}: {NumberUtils.format_percentage(variacion_ipc)}"
+    if ultimos['ipc']:
+        fecha_ipc = ultimos['ipc']['fecha']
+        ultimo_ipc_txt = f"IPC {fecha_ipc.month}/{fecha_ipc.year}: {NumberUtils.format_percentage(ultimos['ipc']['variacion'])}"
 
     # --- TASA ACTIVA: mostrar último día (columna 'hasta') ---
-    if not data_mgr.tasa_data.empty:
-        tasa_vista = data_mgr.tasa_data.copy()
-        ultima_tasa = data_mgr.tasa_data.iloc[-1]
-        valor_tasa = ultima_tasa.get("tasa", 0)
-        fecha_hasta = ultima_tasa.get("hasta", None)
-        fecha_txt = ""
-        if pd.notnull(fecha_hasta):
-            fecha_txt = fecha_hasta.strftime("%d/%m/%Y")
-        ultima_tasa_txt = f"TASA ACTIVA {fecha_txt}: {NumberUtils.format_percentage(valor_tasa)}"
+    if ultimos['tasa']:
+        fecha_hasta = ultimos['tasa']['hasta']
+        fecha_txt = fecha_hasta.strftime("%d/%m/%Y") if pd.notnull(fecha_hasta) else ""
+        ultima_tasa_txt = f"TASA ACTIVA {fecha_txt}: {NumberUtils.format_percentage(ultimos['tasa']['valor'])}"
 
     # --- PISO SRT: mostrar período (desde / hasta) y resolución ---
-    if not data_mgr.pisos_data.empty:
-        ultimo_piso = data_mgr.pisos_data.iloc[-1]
-        norma = ultimo_piso.get("resol", "")
-        monto_piso = ultimo_piso.get("piso", 0)
-        desde = ultimo_piso.get("desde", None)
-        hasta = ultimo_piso.get("hasta", None)
-        periodo = ""
-        if pd.notnull(desde) and pd.notnull(hasta):
+    if ultimos['piso']:
+        desde = ultimos['piso']['desde']
+        hasta = ultimos['piso']['hasta']
+        periodo = f"Desde {desde.strftime('%d/%m/%Y')}"
+        if pd.notnull(hasta):
             periodo = f"{desde.strftime('%d/%m/%Y')} al {hasta.strftime('%d/%m/%Y')}"
-        elif pd.notnull(desde):
-            periodo = f"Desde {desde.strftime('%d/%m/%Y')}"
-        elif pd.notnull(hasta):
-            periodo = f"Hasta {hasta.strftime('%d/%m/%Y')}"
-        ultimo_piso_txt = f"PISO SRT {norma} ({periodo}): {NumberUtils.format_money(monto_piso)}"
+        ultimo_piso_txt = (f"PISO SRT {ultimos['piso']['norma']} ({periodo}): "
+                           f"{NumberUtils.format_money(ultimos['piso']['monto'])}")
 
     # --- Render final con estilo original ---
     st.markdown(f"""
@@ -1014,29 +1076,7 @@ if st.session_state.results is not None:
     with tab2:
         st.subheader("📄 Texto para Sentencia")
         
-        # Generar texto de sentencia según ejemplo
-        mes_pmi = get_mes_nombre(input_data.pmi_date.month)
-        anio_pmi = input_data.pmi_date.year
-        
-        # Determinar texto según si supera o no el piso
-        if results.piso_aplicado:
-            texto_piso = f"""El monto es inferior al piso mínimo determinado por la {results.piso_norma}, que multiplicado por el porcentaje de incapacidad ({input_data.incapacidad_pct}%) alcanza la suma de {NumberUtils.format_money(results.piso_proporcional)}, por lo que se aplica este último."""
-        else:
-            texto_piso = f"""Dicho monto supera el piso mínimo determinado por la {results.piso_norma}, que multiplicado por el porcentaje de incapacidad ({input_data.incapacidad_pct}%) alcanza la suma de {NumberUtils.format_money(results.piso_proporcional)}."""
-        
-        monto_letras = numero_a_letras(results.capital_base)
-        
-        sentencia_text = f"""a) Fórmula:
-Valor de IBM ({NumberUtils.format_money(input_data.ibm)}) x 53 x 65/edad({input_data.edad}) x Incapacidad ({input_data.incapacidad_pct}%)
-Capital calculado: {NumberUtils.format_money(results.capital_formula)}
-{texto_piso}
-
-b) {'20% Art. 3 Ley 26.773: ' + NumberUtils.format_money(results.adicional_20_pct) if input_data.incluir_20_pct else '20% Art. 3 Ley 26.773: no se aplica'}
-
-Total: {NumberUtils.format_money(results.capital_base)}
-SON {monto_letras}
-
-c) Mientras la tasa legal aplicable (Tasa Activa Banco Nación) alcanzó para el período comprometido ({mes_pmi} {anio_pmi} a la fecha) un total del {NumberUtils.format_percentage(results.tasa_activa_pct)}, la inflación del mismo período alcanzó la suma de {NumberUtils.format_percentage(results.inflacion_acum_pct)}."""
+        sentencia_text = renderizar('lrt_sentencia', valores_texto)
         
         st.text_area("Texto de Sentencia", sentencia_text, height=450)
         
@@ -1046,47 +1086,7 @@ c) Mientras la tasa legal aplicable (Tasa Activa Banco Nación) alcanzó para el
     with tab3:
         st.subheader("💰 Liquidación Judicial")
         
-        # Determinar método más favorable
-        if results.total_ripte_3 >= results.total_tasa_activa:
-            total_actualizacion = results.total_ripte_3
-            metodo_usado = "tasa de variación RIPTE"
-        else:
-            total_actualizacion = results.total_tasa_activa
-            metodo_usado = "Tasa Activa BNA"
-        
-        # Obtener fechas de RIPTE
-        mes_final = get_mes_nombre(input_data.final_date.month)
-        anio_final = input_data.final_date.year
-        mes_pmi = get_mes_nombre(input_data.pmi_date.month)
-        anio_pmi = input_data.pmi_date.year
-        
-        # Calcular porcentaje de incremento RIPTE
-        pct_ripte = (results.ripte_coef - 1) * 100
-        
-        # Calcular tasas judiciales (2.2% según ejemplo)
-        tasa_justicia = total_actualizacion * 0.022
-        sobretasa_caja = tasa_justicia * 0.10
-        total_final = total_actualizacion + tasa_justicia + sobretasa_caja
-        
-        # Convertir monto a letras
-        monto_letras = numero_a_letras(total_final)
-        
-        liquidacion_text = f"""Quilmes, en la fecha en que se suscribe con firma digital (Ac. SCBA. 3975/20). 
-**LIQUIDACION** que practica la Actuaria en el presente expediente. ** **
-
---Capital {NumberUtils.format_money(results.capital_base)} 
---Actualización mediante {metodo_usado}, ({get_mes_nombre(data_mgr.ripte_data.iloc[-1]['fecha'].month)}/{data_mgr.ripte_data.iloc[-1]['fecha'].year} {results.ripte_final:,.2f} -último índice publicado- / {mes_pmi} {anio_pmi} {results.ripte_pmi:,.2f} = coef {results.ripte_coef:.2f} = {pct_ripte:.0f}%) {NumberUtils.format_money(results.ripte_actualizado)} 
---Interés puro del 3% anual desde {input_data.pmi_date.strftime('%d/%m/%Y')} hasta {input_data.final_date.strftime('%d/%m/%Y')} {NumberUtils.format_money(results.interes_puro_3_pct)} 
---SUBTOTAL {NumberUtils.format_money(total_actualizacion)} 
-
-*Tasa de Justicia (2,2%) {NumberUtils.format_money(tasa_justicia)} *
-Sobretasa Contribución Caja de Abogados (10% de Tasa) {NumberUtils.format_money(sobretasa_caja)} 
-
-**TOTAL** **{NumberUtils.format_money(total_final)}** 
-
-Importa la presente liquidación la suma de {monto_letras}- 
-
-De la liquidación practicada, traslado a las partes por el plazo de cinco (5) días, bajo apercibimiento de tenerla por consentida (art 59 de la Ley 15.057 - RC 1840/24 SCBA ) Notifíquese.-"""
+        liquidacion_text = renderizar('lrt_liquidacion', valores_texto)
         
         st.text_area("Liquidación", liquidacion_text, height=500)
         
@@ -1097,39 +1097,65 @@ De la liquidación practicada, traslado a las partes por el plazo de cinco (5) d
         with col2:
             if st.button("🖨️ Ir a Imprimir PDF", key="goto_print"):
                 st.info("👉 Use la pestaña 'Imprimir PDF' para generar el documento completo")
+        
+        with st.expander("🔀 Cruces entre RIPTE + 3% y Tasa Activa BNA"):
+            st.caption("Fechas finales en que cambia el método más favorable, evaluando cada día desde la PMI hasta la fecha final")
+            
+            evolucion_diaria = st.session_state.calculator.calcular_evolucion(input_data, results.capital_base, "diaria")
+            cruces = buscar_cruces(evolucion_diaria["fecha"], evolucion_diaria["total_ripte_3"], evolucion_diaria["total_tasa_activa"])
+            
+            if cruces.empty:
+                st.info("No hay cruces: el mismo método resulta más favorable en todo el período")
+            else:
+                st.dataframe(pd.DataFrame({
+                    "Último día anterior": cruces["fecha_anterior"].dt.strftime("%d/%m/%Y"),
+                    "RIPTE + 3% (antes)": columna_moneda(cruces["a_anterior"]),
+                    "Tasa Activa (antes)": columna_moneda(cruces["b_anterior"]),
+                    "Fecha de cruce": cruces["fecha_cruce"].dt.strftime("%d/%m/%Y"),
+                    "RIPTE + 3% (cruce)": columna_moneda(cruces["a_cruce"]),
+                    "Tasa Activa (cruce)": columna_moneda(cruces["b_cruce"]),
+                    "Pasa a ser más favorable": cruces["favorable"].map({"A": "RIPTE + 3%", "B": "Tasa Activa BNA"})
+                }), use_container_width=True, hide_index=True)
+            st.caption("💡 En cada fecha se usa el último índice RIPTE publicado a esa fecha")
     
     with tab4:
         st.subheader("📋 Mínimos de la SRT")
         
-        if not st.session_state.data_manager.pisos_data.empty:
-            df_pisos = st.session_state.data_manager.pisos_data.copy()
+        pisos = st.session_state.data_manager.pisos_data
+        if not pisos.empty:
+            def construir_tabla_pisos() -> str:
+                """Tabla HTML de pisos con montos formateados y enlaces a las normas"""
+                df_pisos = pisos.copy()
             
-            # Formatear fechas
-            df_pisos['desde'] = df_pisos['desde'].apply(lambda x: x.strftime('%d/%m/%Y') if isinstance(x, date) else str(x))
-            df_pisos['hasta'] = df_pisos['hasta'].apply(lambda x: x.strftime('%d/%m/%Y') if isinstance(x, date) and not pd.isna(x) else 'Vigente')
-            df_pisos['piso'] = df_pisos['piso'].apply(lambda x: NumberUtils.format_money(x))
+                # Formatear fechas
+                df_pisos['desde'] = df_pisos['desde'].apply(lambda x: x.strftime('%d/%m/%Y') if isinstance(x, date) else str(x))
+                df_pisos['hasta'] = df_pisos['hasta'].apply(lambda x: x.strftime('%d/%m/%Y') if isinstance(x, date) and not pd.isna(x) else 'Vigente')
+                df_pisos['piso'] = columna_moneda(df_pisos['piso'])
             
-            # Crear columna de enlace clicable
-            def crear_link_html(enlace):
-                enlace_str = str(enlace).strip()
-                if enlace_str and enlace_str != '' and enlace_str.lower() != 'nan' and enlace_str.startswith('http'):
-                    return f'<a href="{enlace_str}" target="_blank">Ver norma</a>'
-                return 'N/A'
+                # Crear columna de enlace clicable
+                def crear_link_html(enlace):
+                    enlace_str = str(enlace).strip()
+                    if enlace_str and enlace_str != '' and enlace_str.lower() != 'nan' and enlace_str.startswith('http'):
+                        return f'<a href="{enlace_str}" target="_blank">Ver norma</a>'
+                    return 'N/A'
             
-            # Crear DataFrame para mostrar
-            df_display = pd.DataFrame({
-                'Norma': df_pisos['resol'],
-                'Vigencia Desde': df_pisos['desde'],
-                'Vigencia Hasta': df_pisos['hasta'],
-                'Monto Mínimo': df_pisos['piso'],
-                'Enlace': df_pisos['enlace'].apply(crear_link_html)
-            })
+                # Crear DataFrame para mostrar
+                df_display = pd.DataFrame({
+                    'Norma': df_pisos['resol'],
+                    'Vigencia Desde': df_pisos['desde'],
+                    'Vigencia Hasta': df_pisos['hasta'],
+                    'Monto Mínimo': df_pisos['piso'],
+                    'Enlace': df_pisos['enlace'].apply(crear_link_html)
+                })
+                return df_display.to_html(escape=False, index=False)
             
-            # Mostrar tabla con HTML para los links
-            st.markdown(
-                df_display.to_html(escape=False, index=False),
-                unsafe_allow_html=True
-            )
+            # La tabla se arma una sola vez por versión de dataset_pisos.csv
+            # (con datos de una versión del historial se arma en el momento)
+            if st.session_state.data_manager.version is not None:
+                tabla_pisos = construir_tabla_pisos()
+            else:
+                tabla_pisos = derivado_dataset('lrt_tabla_pisos', ('pisos',), construir_tabla_pisos)
+            st.markdown(tabla_pisos, unsafe_allow_html=True)
             
             st.markdown("---")
             st.caption("💡 Haga clic en 'Ver norma' para acceder al documento oficial")
@@ -1262,315 +1288,217 @@ De la liquidación practicada, traslado a las partes por el plazo de cinco (5) d
         
         st.markdown("---")
         
-        if st.button("📄 GENERAR VISTA PREVIA PARA IMPRIMIR", use_container_width=True, type="primary", key="generar_pdf"):
-            if not caratula_expediente or not caratula_actor:
-                st.error("⚠️ Por favor complete al menos el Número de Expediente y el Actor/a")
-            else:
-                # Determinar método más favorable
-                if results.total_ripte_3 >= results.total_tasa_activa:
-                    metodo_favorable = "RIPTE + 3%"
-                    monto_favorable = results.total_ripte_3
-                else:
-                    metodo_favorable = "Tasa Activa BNA"
-                    monto_favorable = results.total_tasa_activa
-                
-                # Calcular tasas judiciales para incluir en el PDF
-                tasa_justicia = monto_favorable * 0.022
-                sobretasa_caja = tasa_justicia * 0.10
-                total_final_pdf = monto_favorable + tasa_justicia + sobretasa_caja
-                
-                mes_pmi = get_mes_nombre(input_data.pmi_date.month)
-                anio_pmi = input_data.pmi_date.year
-                mes_final = get_mes_nombre(input_data.final_date.month)
-                anio_final = input_data.final_date.year
-                pct_ripte = (results.ripte_coef - 1) * 100
-                
-                # Generar HTML para imprimir
-                html_content = f"""
-                <!DOCTYPE html>
-                <html>
-                <head>
-                    <meta charset="UTF-8">
-                    <title>Cálculo Indemnización - {caratula_expediente}</title>
-                    <style>
-                        @page {{
-                            size: A4;
-                            margin: 2cm;
-                            }}
-                        @media print {{
-                            body {{
-                                width: 21cm;
-                                min-height: 29.7cm;
-                            }}
-                            .no-print {{
-                                display: none;
-                            }}
-                        }}
-                        body {{
-                            font-family: Arial, sans-serif;
-                            line-height: 1.6;
-                            color: #333;
-                            max-width: 21cm;
-                            margin: 0 auto;
-                            padding: 20px;
-                            background: white;
-                        }}
-                        .header {{
-                            text-align: center;
-                            margin-bottom: 30px;
-                            border-bottom: 3px solid #2E86AB;
-                            padding-bottom: 20px;
-                        }}
-                        .header h1 {{
-                            color: #2E86AB;
-                            margin: 0;
-                            font-size: 18px;
-                        }}
-                        .header h2 {{
-                            color: #666;
-                            margin: 5px 0;
-                            font-size: 14px;
-                            font-weight: normal;
-                        }}
-                        .caratula {{
-                            background: #f8f9fa;
-                            padding: 20px;
-                            margin-bottom: 30px;
-                            border-left: 4px solid #2E86AB;
-                        }}
-                        .caratula-row {{
-                            margin-bottom: 8px;
-                        }}
-                        .caratula-label {{
-                            font-weight: bold;
-                            display: inline-block;
-                            width: 150px;
-                        }}
-                        h3 {{
-                            color: #2E86AB;
-                            border-bottom: 2px solid #2E86AB;
-                            padding-bottom: 8px;
-                            margin-top: 30px;
-                            font-size: 14px;
-                        }}
-                        table {{
-                            width: 100%;
-                            border-collapse: collapse;
-                            margin: 20px 0;
-                        }}
-                        th, td {{
-                            padding: 10px;
-                            text-align: left;
-                            border: 1px solid #ddd;
-                        }}
-                        th {{
-                            background-color: #2E86AB;
-                            color: white;
-                            font-weight: bold;
-                        }}
-                        .highlight {{
-                            background-color: #E8F5E8;
-                            font-weight: bold;
-                        }}
-                        .amount {{
-                            text-align: right;
-                        }}
-                        .formula-box {{
-                            background: #e7f3ff;
-                            border: 1px solid #b3d9ff;
-                            padding: 15px;
-                            margin: 20px 0;
-                            border-radius: 5px;
-                        }}
-                        .footer {{
-                            margin-top: 50px;
-                            text-align: center;
-                            font-size: 11px;
-                            color: #666;
-                            border-top: 1px solid #ddd;
-                            padding-top: 20px;
-                        }}
-                        .section {{
-                            page-break-inside: avoid;
-                        }}
-                    </style>
-                </head>
-                <body>
-                    <div class="header">
-                        <h1>JUDICIAL</h1>
-                        <h2>{caratula_juzgado}</h2>
-                    </div>
-                    
-                    <div class="caratula">
-                        <div class="caratula-row">
-                            <span class="caratula-label">Expediente:</span>
-                            <span>{caratula_expediente}</span>
-                        </div>
-                        <div class="caratula-row">
-                            <span class="caratula-label">Actor/a:</span>
-                            <span>{caratula_actor}</span>
-                        </div>
-                        {f'<div class="caratula-row"><span class="caratula-label">Demandado/a:</span><span>{caratula_demandado}</span></div>' if caratula_demandado else ''}
-                        <div class="caratula-row">
-                            <span class="caratula-label">Fecha:</span>
-                            <span>{caratula_fecha.strftime('%d/%m/%Y')}</span>
-                        </div>
-                    </div>
-                    
-                    <h1 style="text-align: center; color: #2E86AB;">CÁLCULO DE INDEMNIZACIÓN - LEY 24.557</h1>
-                    
-                    <div class="section">
-                        <h3>📋 DATOS DEL CASO</h3>
-                        <table>
-                            <tr>
-                                <th>Concepto</th>
-                                <th style="text-align: right;">Valor</th>
-                            </tr>
-                            <tr>
-                                <td>Fecha del Siniestro (PMI)</td>
-                                <td class="amount">{input_data.pmi_date.strftime('%d/%m/%Y')}</td>
-                            </tr>
-                            <tr>
-                                <td>Fecha de Cálculo</td>
-                                <td class="amount">{input_data.final_date.strftime('%d/%m/%Y')}</td>
-                            </tr>
-                            <tr>
-                                <td>Ingreso Base Mensual (IBM)</td>
-                                <td class="amount">{NumberUtils.format_money(input_data.ibm)}</td>
-                            </tr>
-                            <tr>
-                                <td>Edad del Trabajador</td>
-                                <td class="amount">{input_data.edad} años</td>
-                            </tr>
-                            <tr>
-                                <td>Porcentaje de Incapacidad</td>
-                                <td class="amount">{input_data.incapacidad_pct}%</td>
-                            </tr>
-                            <tr>
-                                <td>20% Art. 3 Ley 26.773</td>
-                                <td class="amount">{'Sí' if input_data.incluir_20_pct else 'No'}</td>
-                            </tr>
-                        </table>
-                    </div>
-                    
-                    <div class="section">
-                        <h3>💰 RESULTADOS DEL CÁLCULO</h3>
-                        <table>
-                            <tr>
-                                <th>Concepto</th>
-                                <th style="text-align: right;">Monto</th>
-                            </tr>
-                            <tr>
-                                <td>Capital Base (Fórmula)</td>
-                                <td class="amount">{NumberUtils.format_money(results.capital_formula)}</td>
-                            </tr>
-                            <tr>
-                                <td>{results.piso_info}</td>
-                                <td class="amount">{NumberUtils.format_money(results.piso_proporcional) if results.piso_aplicado else '-'}</td>
-                            </tr>
-                            <tr>
-                                <td>20% Art. 3 Ley 26.773</td>
-                                <td class="amount">{NumberUtils.format_money(results.adicional_20_pct) if results.adicional_20_pct > 0 else '-'}</td>
-                            </tr>
-                            <tr class="highlight">
-                                <td><strong>CAPITAL BASE TOTAL</strong></td>
-                                <td class="amount"><strong>{NumberUtils.format_money(results.capital_base)}</strong></td>
-                            </tr>
-                            <tr>
-                                <td>Actualización RIPTE + 3%</td>
-                                <td class="amount">{NumberUtils.format_money(results.total_ripte_3)}</td>
-                            </tr>
-                            <tr>
-                                <td>Actualización Tasa Activa BNA</td>
-                                <td class="amount">{NumberUtils.format_money(results.total_tasa_activa)}</td>
-                            </tr>
-                            <tr class="highlight">
-                                <td><strong>Método más favorable: {metodo_favorable}</strong></td>
-                                <td class="amount"><strong>{NumberUtils.format_money(monto_favorable)}</strong></td>
-                            </tr>
-                        </table>
-                    </div>
-                    
-                    <div class="section">
-                        <h3>📊 DETALLE ACTUALIZACIÓN RIPTE</h3>
-                        <div class="formula-box">
-                            <p><strong>RIPTE {mes_pmi}/{anio_pmi}:</strong> {results.ripte_pmi:,.2f}</p>
-                            <p><strong>RIPTE - ultimo indice al mes de {mes_final}/{anio_final}:</strong> {results.ripte_final:,.2f}</p>
-                            <p><strong>Coeficiente:</strong> {results.ripte_coef:.2f} ({pct_ripte:.0f}%)</p>
-                            <p><strong>Capital actualizado RIPTE:</strong> {NumberUtils.format_money(results.ripte_actualizado)}</p>
-                            <p><strong>Interés puro 3% anual:</strong> {NumberUtils.format_money(results.interes_puro_3_pct)}</p>
-                            <p style="font-size: 16px; margin-top: 10px;"><strong>TOTAL RIPTE + 3%: {NumberUtils.format_money(results.total_ripte_3)}</strong></p>
-                        </div>
-                    </div>
-                    
-                    <div class="section">
-                        <h3>📈 DETALLE ACTUALIZACIÓN TASA ACTIVA</h3>
-                        <div class="formula-box">
-                            <p><strong>Tasa Activa BNA acumulada:</strong> {NumberUtils.format_percentage(results.tasa_activa_pct)}</p>
-                            <p style="font-size: 16px; margin-top: 10px;"><strong>TOTAL TASA ACTIVA: {NumberUtils.format_money(results.total_tasa_activa)}</strong></p>
-                        </div>
-                    </div>
-                    
-                    <div class="section">
-                        <h3>📉 INFLACIÓN (REFERENCIA)</h3>
-                        <p><strong>Inflación acumulada del período (IPC):</strong> {NumberUtils.format_percentage(results.inflacion_acum_pct)}</p>
-                    </div>
-                    
-                    <div class="section">
-                        <h3>🧮 FÓRMULA APLICADA</h3>
-                        <div class="formula-box">
-                            <p>IBM ({NumberUtils.format_money(input_data.ibm)}) × 53 × 65/edad({input_data.edad}) × Incapacidad ({input_data.incapacidad_pct}%)</p>
-                            <p><strong>Capital calculado:</strong> {NumberUtils.format_money(results.capital_formula)}</p>
-                            <p style="margin-top: 10px;">{results.piso_info}</p>
-                        </div>
-                    </div>
-                    
-                    <div class="section">
-                        <h3>💼 LIQUIDACIÓN JUDICIAL</h3>
-                        <table>
-                            <tr>
-                                <td>Capital actualizado ({metodo_favorable})</td>
-                                <td class="amount">{NumberUtils.format_money(monto_favorable)}</td>
-                            </tr>
-                            <tr>
-                                <td>Tasa de Justicia (2,2%)</td>
-                                <td class="amount">{NumberUtils.format_money(tasa_justicia)}</td>
-                            </tr>
-                            <tr>
-                                <td>Sobretasa Contribución Caja de Abogados (10%)</td>
-                                <td class="amount">{NumberUtils.format_money(sobretasa_caja)}</td>
-                            </tr>
-                            <tr class="highlight">
-                                <td><strong>TOTAL FINAL</strong></td>
-                                <td class="amount"><strong>{NumberUtils.format_money(total_final_pdf)}</strong></td>
-                            </tr>
-                        </table>
-                        <p style="text-align: center; margin-top: 20px;"><strong>{numero_a_letras(total_final_pdf)}</strong></p>
-                    </div>
-                    
-                    <div class="footer">
-                        <p><em>Documento generado por Calculadora Indemnizaciones LRT</em></p>
-                        <p><em>{caratula_juzgado}</em></p>
-                        <p><em>Fecha de generación: {date.today().strftime('%d/%m/%Y')}</em></p>
-                    </div>
-                </body>
-                </html>
-                """
-                
-                st.success("✅ Vista previa generada exitosamente")
-                st.info("💡 Presione Ctrl+P (o Cmd+P en Mac) en la vista previa para guardar como PDF")
-                
-                # Mostrar el HTML en un componente expandible
-                with st.expander("👁️ Ver vista previa del documento", expanded=True):
-                    st.components.v1.html(html_content, height=800, scrolling=True)
-                
-                # Botón para abrir en nueva ventana
-                html_b64 = base64.b64encode(html_content.encode()).decode()
-                href = f'<a href="data:text/html;base64,{html_b64}" download="Calculo_{caratula_expediente.replace("/", "-")}.html" target="_blank"><button style="background-color:#2E86AB; color:white; padding:10px 20px; border:none; border-radius:5px; cursor:pointer; font-weight:bold;">📄 ABRIR EN NUEVA VENTANA PARA IMPRIMIR</button></a>'
-                st.markdown(href, unsafe_allow_html=True)
+        if not caratula_expediente or not caratula_actor:
+            st.info("⚠️ Complete al menos el Número de Expediente y el Actor/a para generar el PDF")
+        else:
+            # Contenido del informe (el PDF se genera en el servidor al descargar)
+            informe = renderizar('lrt_informe', {
+                **valores_texto,
+                'juzgado': caratula_juzgado,
+                'expediente': caratula_expediente,
+                'actor': caratula_actor,
+                'demandado': caratula_demandado,
+                'fecha_informe': caratula_fecha,
+                'fecha_generacion': date.today(),
+            })
+            
+            st.download_button(
+                label="📄 DESCARGAR PDF PARA IMPRIMIR",
+                data=lambda: pdf_informe(informe),
+                file_name=f"Calculo_{caratula_expediente.replace('/', '-')}.pdf",
+                mime="application/pdf",
+                use_container_width=True,
+                type="primary",
+                key="generar_pdf"
+            )
         
         st.markdown("---")
-        st.info("💡 **Instrucciones:** Después de generar la vista previa, abra en nueva ventana y presione Ctrl+P (o Cmd+P en Mac) para guardar como PDF")
+        st.info("💡 **Instrucciones:** Complete la carátula y descargue el PDF; el documento queda listo para imprimir en A4")
+
+    with tab7:
+        st.subheader("🔢 Grilla de Capital por Edad e Incapacidad")
+        st.caption(f"IBM {NumberUtils.format_money(input_data.ibm)} | PMI {input_data.pmi_date.strftime('%d/%m/%Y')} | "
+                   f"20%: {'Sí' if input_data.incluir_20_pct else 'No'}")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            edad_desde = st.number_input("Edad desde", min_value=18, max_value=100, value=20, step=1, key="grilla_edad_desde")
+            edad_hasta = st.number_input("Edad hasta", min_value=18, max_value=100, value=69, step=1, key="grilla_edad_hasta")
+        with col2:
+            inc_desde = st.number_input("Incapacidad desde (%)", min_value=0.01, max_value=100.0, value=1.0, step=1.0, format="%.2f", key="grilla_inc_desde")
+            inc_hasta = st.number_input("Incapacidad hasta (%)", min_value=0.01, max_value=100.0, value=100.0, step=1.0, format="%.2f", key="grilla_inc_hasta")
+        with col3:
+            inc_paso = st.number_input("Paso de incapacidad (%)", min_value=0.01, max_value=50.0, value=1.0, step=0.5, format="%.2f", key="grilla_inc_paso")
+            valor_grilla = st.selectbox(
+                "Valor a mostrar",
+                options=['capital_base', 'capital_formula', 'piso_proporcional'],
+                format_func=lambda v: {'capital_base': 'Capital base',
+                                       'capital_formula': 'Capital fórmula',
+                                       'piso_proporcional': 'Piso proporcional'}[v],
+                key="grilla_valor"
+            )
+        
+        caso_grilla = (input_data.ibm, input_data.pmi_date, input_data.incluir_20_pct)
+        if edad_desde > edad_hasta or inc_desde > inc_hasta:
+            st.error("Los valores 'desde' deben ser menores o iguales a los valores 'hasta'")
+        elif st.button("🔢 Calcular grilla", use_container_width=True, key="grilla_button"):
+            # Se calcula solo al presionar el botón; el resultado queda en session_state
+            edades = np.arange(edad_desde, edad_hasta + 1)
+            incapacidades = np.round(np.arange(inc_desde, inc_hasta + inc_paso / 2, inc_paso), 2)
+            st.session_state.grilla = {
+                'caso': caso_grilla,
+                'datos': st.session_state.calculator.calcular_grilla(
+                    input_data.ibm, input_data.pmi_date, edades, incapacidades, input_data.incluir_20_pct
+                ),
+                'tablas': {},
+            }
+        
+        if 'grilla' in st.session_state:
+            grilla_guardada = st.session_state.grilla
+            grilla = grilla_guardada['datos']
+            if grilla_guardada['caso'] != caso_grilla:
+                st.warning("⚠️ Los datos del caso cambiaron desde que se calculó la grilla: vuelva a calcularla")
+            
+            st.vega_lite_chart(grilla, {
+                "mark": "rect",
+                "encoding": {
+                    "x": {"field": "incapacidad_pct", "type": "ordinal", "title": "Incapacidad (%)"},
+                    "y": {"field": "edad", "type": "ordinal", "title": "Edad"},
+                    "color": {"field": valor_grilla, "type": "quantitative", "title": "Monto"},
+                    "tooltip": [
+                        {"field": "edad", "type": "quantitative", "title": "Edad"},
+                        {"field": "incapacidad_pct", "type": "quantitative", "title": "Incapacidad (%)"},
+                        {"field": "capital_formula", "type": "quantitative", "format": ",.2f", "title": "Capital fórmula"},
+                        {"field": "piso_proporcional", "type": "quantitative", "format": ",.2f", "title": "Piso proporcional"},
+                        {"field": "capital_base", "type": "quantitative", "format": ",.2f", "title": "Capital base"}
+                    ]
+                }
+            }, use_container_width=True)
+            
+            st.caption(f"Combinaciones con piso mínimo aplicado: {int(grilla['piso_aplicado'].sum())} de {len(grilla)}")
+            
+            # La tabla de cada valor se arma una sola vez por grilla
+            if valor_grilla not in grilla_guardada['tablas']:
+                tabla_grilla = grilla.pivot(index='edad', columns='incapacidad_pct', values=valor_grilla)
+                tabla_grilla.columns = [f"{c:g}%" for c in tabla_grilla.columns]
+                grilla_guardada['tablas'][valor_grilla] = tabla_grilla
+            st.dataframe(grilla_guardada['tablas'][valor_grilla], use_container_width=True)
+            
+            # El CSV se genera recién al descargar
+            st.download_button(
+                label="📥 Descargar grilla (CSV)",
+                data=lambda datos=grilla: datos.to_csv(index=False).encode('utf-8'),
+                file_name="grilla_edad_incapacidad.csv",
+                mime="text/csv",
+                key="download_grilla"
+            )
+
+    with tab8:
+        st.subheader("📈 Evolución del Capital Actualizado")
+        st.caption(f"Capital base {NumberUtils.format_money(results.capital_base)} desde la PMI "
+                   f"({input_data.pmi_date.strftime('%d/%m/%Y')}) hasta {input_data.final_date.strftime('%d/%m/%Y')}")
+        
+        frecuencia_evolucion = st.radio(
+            "Frecuencia",
+            options=["mensual", "diaria"],
+            format_func=str.capitalize,
+            horizontal=True,
+            key="evolucion_frecuencia"
+        )
+        
+        evolucion = st.session_state.calculator.calcular_evolucion(input_data, results.capital_base, frecuencia_evolucion)
+        
+        st.line_chart(
+            evolucion.set_index("fecha")[["total_ripte_3", "total_tasa_activa", "total_ipc"]].rename(columns={
+                "total_ripte_3": "RIPTE + 3%",
+                "total_tasa_activa": "Tasa Activa BNA",
+                "total_ipc": "IPC"
+            })
+        )
+        
+        tabla_evolucion = evolucion.assign(fecha=evolucion["fecha"].dt.strftime("%d/%m/%Y"))
+        st.dataframe(
+            tabla_evolucion,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "fecha": "Fecha",
+                "ripte_coef": st.column_config.NumberColumn("Coef. RIPTE", format="%.6f"),
+                "total_ripte_3": st.column_config.NumberColumn("RIPTE + 3%", format="%.2f"),
+                "tasa_activa_pct": st.column_config.NumberColumn("Tasa Activa (%)", format="%.2f"),
+                "total_tasa_activa": st.column_config.NumberColumn("Tasa Activa BNA", format="%.2f"),
+                "inflacion_acum_pct": st.column_config.NumberColumn("Inflación (%)", format="%.2f"),
+                "total_ipc": st.column_config.NumberColumn("IPC", format="%.2f")
+            }
+        )
+        
+        st.download_button(
+            label="📥 Descargar evolución (CSV)",
+            data=tabla_evolucion.round(6).to_csv(index=False).encode('utf-8'),
+            file_name="evolucion_capital_lrt.csv",
+            mime="text/csv",
+            key="download_evolucion"
+        )
+        st.caption("💡 En cada fecha se usa el último índice RIPTE publicado a esa fecha; en el cálculo principal se usa siempre el último índice disponible")
+
+    with tab9:
+        st.subheader("💵 Pagos a Cuenta")
+        st.caption(f"Capital base {NumberUtils.format_money(results.capital_base)} desde la PMI "
+                   f"({input_data.pmi_date.strftime('%d/%m/%Y')}) hasta {input_data.final_date.strftime('%d/%m/%Y')}. "
+                   "Cada pago se imputa primero a intereses y luego a capital.")
+        
+        metodo_pagos = st.radio(
+            "Método",
+            options=["ripte", "tasa"],
+            index=0 if valores_texto["metodo_favorable"] == "RIPTE + 3%" else 1,
+            format_func=lambda m: "RIPTE + 3%" if m == "ripte" else "Tasa Activa BNA",
+            horizontal=True,
+            key="lrt_pagos_metodo"
+        )
+        
+        df_pagos = st.data_editor(
+            pd.DataFrame({"fecha": pd.Series(dtype="datetime64[ns]"), "monto": pd.Series(dtype=float)}),
+            num_rows="dynamic",
+            use_container_width=True,
+            column_config={
+                "fecha": st.column_config.DateColumn("Fecha del pago", format="DD/MM/YYYY"),
+                "monto": st.column_config.NumberColumn("Monto pagado ($)", min_value=0.0, format="%.2f")
+            },
+            key="lrt_pagos_editor"
+        ).dropna(how="all")
+        
+        try:
+            resultado_pagos = imputar_pagos(
+                results.capital_base, input_data.pmi_date, input_data.final_date, df_pagos, metodo_pagos, 3.0,
+                st.session_state.calculator.data_manager.get_series(), tasa_por_tramo=True
+            )
+            saldo = resultado_pagos.iloc[-1]
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Total pagado", NumberUtils.format_money(resultado_pagos["pago"].sum()))
+            with col2:
+                st.metric("Saldo de capital", NumberUtils.format_money(saldo["saldo_capital"]))
+            with col3:
+                st.metric("Saldo total adeudado", NumberUtils.format_money(saldo["saldo_total"]))
+            
+            if resultado_pagos["excedente"].sum() > 0:
+                st.warning(f"⚠️ Los pagos exceden la deuda en {NumberUtils.format_money(resultado_pagos['excedente'].sum())}")
+            
+            tabla_pagos = resultado_pagos.assign(fecha=resultado_pagos["fecha"].dt.strftime("%d/%m/%Y")).round(2)
+            st.dataframe(tabla_pagos, use_container_width=True, hide_index=True)
+            
+            # El CSV se genera recién al descargar
+            st.download_button(
+                label="📥 Descargar imputación (CSV)",
+                data=lambda tabla=tabla_pagos: tabla.to_csv(index=False).encode("utf-8"),
+                file_name="pagos_a_cuenta_lrt.csv",
+                mime="text/csv",
+                key="download_pagos_lrt"
+            )
+            st.caption("💡 En cada pago se usa el último índice RIPTE publicado a esa fecha")
+        except Exception as e:
+            st.error(f"Error al imputar los pagos: {str(e)}")
 
 else:
     # Mostrar mensaje inicial
@@ -5,10 +5,19 @@ CALCULADORA DE HONORARIOS PROFESIONALES
 Sistema de conversión a JUS y regulación según Ley 24432
 """
 
+import sys
 import streamlit as st
 import pandas as pd
+from pathlib import Path
 from datetime import datetime, date
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.honorarios import (
+    IVA, CAJA, MINIMO_JUS_ABOGADO, MAXIMO_AUXILIARES, resumir_regulacion,
+    optimizar_distribucion, convertir_lote_jus, COLUMNAS_CONVERSION_JUS
+)
+from utils.formato import columna_moneda, formato_moneda as formatear_importe
+
 # Configuración de la página
 st.set_page_config(
     page_title="Calculadora de Honorarios",
@@ -42,7 +51,7 @@ st.markdown("""
 def formato_moneda(valor):
     """Formatea números como moneda argentina"""
     try:
-        return f"$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+        return formatear_importe(valor)
     except:
         return "$ 0,00"
 
@@ -93,6 +102,67 @@ def convertir_a_jus(monto_pesos, fecha_conversion, df_jus):
         st.error(f"Error en conversión a JUS: {str(e)}")
         return None
 
+# Callbacks de la regulación: cada edición actualiza el estado antes de la
+# única ejecución del script, sin st.rerun() en cascada
+def _buscar_profesional(tipo, id_profesional):
+    """Devuelve el dict del abogado ('abog') o auxiliar ('aux') con ese ID"""
+    return next(p for p in st.session_state[f"{tipo}_data"] if p['id'] == id_profesional)
+
+def _inicializar_widgets(tipo, profesional, monto_juicio):
+    """Carga en session_state los valores iniciales de los widgets de una fila"""
+    clave = f"{tipo}_{{}}_{profesional['id']}"
+    if clave.format('pesos') not in st.session_state:
+        st.session_state[clave.format('pesos')] = round(profesional['pesos'], 2)
+    if clave.format('pct') not in st.session_state:
+        st.session_state[clave.format('pct')] = round((profesional['pesos'] / monto_juicio * 100) if monto_juicio > 0 else 0.0, 2)
+    if tipo == 'abog' and clave.format('iva') not in st.session_state:
+        st.session_state[clave.format('iva')] = profesional.get('iva', False)
+
+def _actualizar_profesional(tipo, id_profesional, campo):
+    """Aplica la edición de % , $ o IVA de una fila y sincroniza el otro campo"""
+    profesional = _buscar_profesional(tipo, id_profesional)
+    monto_juicio = st.session_state.monto_juicio
+    clave = f"{tipo}_{{}}_{id_profesional}"
+    
+    if campo == 'pct':
+        profesional['pesos'] = round((st.session_state[clave.format('pct')] / 100) * monto_juicio, 2)
+        st.session_state[clave.format('pesos')] = profesional['pesos']
+    elif campo == 'pesos':
+        profesional['pesos'] = round(st.session_state[clave.format('pesos')], 2)
+        st.session_state[clave.format('pct')] = round((profesional['pesos'] / monto_juicio * 100) if monto_juicio > 0 else 0.0, 2)
+    else:
+        profesional['iva'] = st.session_state[clave.format('iva')]
+
+def _actualizar_porcentajes():
+    """Recalcula los % mostrados cuando cambia el monto del juicio"""
+    monto_juicio = st.session_state.monto_juicio
+    for tipo in ('abog', 'aux'):
+        for profesional in st.session_state.get(f"{tipo}_data", []):
+            st.session_state[f"{tipo}_pct_{profesional['id']}"] = round((profesional['pesos'] / monto_juicio * 100) if monto_juicio > 0 else 0.0, 2)
+
+def _agregar_profesional(tipo):
+    """Agrega un abogado o auxiliar vacío"""
+    st.session_state[f"{tipo}_counter"] += 1
+    nuevo = {'id': st.session_state[f"{tipo}_counter"], 'pesos': 0.0}
+    if tipo == 'abog':
+        nuevo['iva'] = False
+    st.session_state[f"{tipo}_data"].append(nuevo)
+
+def _aplicar_distribucion(pesos):
+    """Carga en la regulación los montos de la distribución automática (abogados y luego auxiliares)"""
+    monto_juicio = st.session_state.monto_juicio
+    profesionales = [('abog', p) for p in st.session_state.abog_data] + [('aux', p) for p in st.session_state.aux_data]
+    for (tipo, profesional), monto in zip(profesionales, pesos):
+        profesional['pesos'] = round(monto, 2)
+        st.session_state[f"{tipo}_pesos_{profesional['id']}"] = profesional['pesos']
+        st.session_state[f"{tipo}_pct_{profesional['id']}"] = round((profesional['pesos'] / monto_juicio * 100) if monto_juicio > 0 else 0.0, 2)
+
+def _eliminar_profesional(tipo, id_profesional):
+    """Quita un abogado o auxiliar y los valores de sus widgets"""
+    st.session_state[f"{tipo}_data"] = [p for p in st.session_state[f"{tipo}_data"] if p['id'] != id_profesional]
+    for campo in ('pct', 'pesos', 'iva'):
+        st.session_state.pop(f"{tipo}_{campo}_{id_profesional}", None)
+
 # Cargar datos
 df_jus = cargar_dataset_jus()
 
@@ -193,6 +263,47 @@ with tab1:
                     """)
         else:
             st.info("👆 Ingrese los datos y presione CONVERTIR A JUS")
+    
+    st.markdown("---")
+    
+    # Conversión masiva de regulaciones
+    with st.expander("📦 CONVERSIÓN MASIVA DE REGULACIONES (CSV)"):
+        st.markdown(f"""
+        Cargue un CSV con las columnas **{', '.join(COLUMNAS_CONVERSION_JUS)}**. Cada monto se
+        convierte a JUS según el valor vigente a su fecha y se expresa en pesos al valor JUS de hoy.
+        - Montos en formato argentino: `1.234,56` (punto para miles, coma para decimales)
+        """)
+        archivo_jus = st.file_uploader("Regulaciones (CSV)", type=['csv'], key="conversion_jus_csv")
+        
+        if archivo_jus is not None:
+            try:
+                entrada_jus = pd.read_csv(archivo_jus, sep=None, engine='python', dtype=str)
+                resultado_lote = convertir_lote_jus(entrada_jus, df_jus, date.today())
+            except ValueError as e:
+                st.error(f"❌ {e}")
+            else:
+                validas = resultado_lote['observaciones'] != 'Fecha inválida'
+                validas &= resultado_lote['observaciones'] != 'Monto inválido'
+                col_l1, col_l2, col_l3 = st.columns(3)
+                with col_l1:
+                    st.metric("Regulaciones", len(resultado_lote))
+                with col_l2:
+                    st.metric("Total en JUS", f"{resultado_lote.loc[validas, 'jus'].sum():,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
+                with col_l3:
+                    st.metric("Total actualizado", formato_moneda(resultado_lote.loc[validas, 'monto_actualizado'].sum()))
+                
+                observadas = (resultado_lote['observaciones'] != '').sum()
+                if observadas:
+                    st.warning(f"⚠️ {observadas} filas con observaciones")
+                
+                st.dataframe(resultado_lote.round(2), use_container_width=True, hide_index=True)
+                st.download_button(
+                    label="📥 Descargar conversión (CSV)",
+                    data=resultado_lote.round(2).to_csv(index=False).encode('utf-8'),
+                    file_name=f"conversion_jus_{date.today().strftime('%Y%m%d')}.csv",
+                    mime="text/csv",
+                    key="download_conversion_jus"
+                )
 
 # ============================================
 # TAB 2: REGULACIÓN LEY 24432
@@ -211,7 +322,8 @@ with tab2:
             value=1000000.00,
             step=10000.00,
             format="%.2f",
-            key="monto_juicio"
+            key="monto_juicio",
+            on_change=_actualizar_porcentajes
         )
         
         fecha_sent = st.date_input(
@@ -227,12 +339,6 @@ with tab2:
     res_base = convertir_a_jus(monto_juicio, fecha_sent, df_jus)
     
     if res_base:
-        limite_25 = monto_juicio * 0.25
-        
-        with col_resultado:
-            st.markdown(f"**📊 Límite 25%:** {formato_moneda(limite_25)}")
-            st.caption(f"{(limite_25/res_base['valor_jus']):.2f} JUS | {res_base['acuerdo']}")
-        
         # Inicializar estados con keys únicos por ID
         if 'abog_data' not in st.session_state:
             st.session_state.abog_data = [{'id': 1, 'pesos': 0.0, 'iva': False}]
@@ -241,14 +347,16 @@ with tab2:
             st.session_state.aux_data = [{'id': 1, 'pesos': 0.0}]
             st.session_state.aux_counter = 1
         
-        # Calcular totales individuales (Caja siempre incluida)
-        total_abog = sum([a['pesos'] for a in st.session_state.abog_data])
-        total_iva = sum([a['pesos'] * 0.21 for a in st.session_state.abog_data if a.get('iva', False)])
-        total_caja = sum([a['pesos'] * 0.10 for a in st.session_state.abog_data])  # Caja siempre
-        total_aux = sum([a['pesos'] for a in st.session_state.aux_data])
+        # Totales y máximos permitidos en una sola pasada (Caja siempre incluida)
+        resumen = resumir_regulacion(monto_juicio, st.session_state.abog_data, st.session_state.aux_data)
+        limite_25 = resumen['limite']
+        total_aux = resumen['total_aux']
+        total_usado = resumen['total_usado']
+        pct_usado = resumen['pct_usado']
         
-        total_usado = total_abog + total_iva + total_caja + total_aux
-        pct_usado = (total_usado / monto_juicio) * 100
+        with col_resultado:
+            st.markdown(f"**📊 Límite 25%:** {formato_moneda(limite_25)}")
+            st.caption(f"{(limite_25/res_base['valor_jus']):.2f} JUS | {res_base['acuerdo']}")
         
         # Mostrar porcentaje usado
         with col_resultado:
@@ -271,77 +379,59 @@ with tab2:
             st.markdown('<div style="background-color: #4CAF50; color: white; padding: 10px; border-radius: 5px; text-align: center; margin-bottom: 10px;"><b>👨‍⚖️ Abogados</b></div>', unsafe_allow_html=True)
             
             for i, abog in enumerate(st.session_state.abog_data):
+                _inicializar_widgets('abog', abog, monto_juicio)
+                max_pesos_permitido = resumen['max_abogados'][i]
+                max_pct = (max_pesos_permitido / monto_juicio) * 100 if monto_juicio > 0 else 0
+                
                 col1, col2 = st.columns([1, 1])
                 
                 with col1:
-                    otros = sum([a['pesos'] for j, a in enumerate(st.session_state.abog_data) if j != i])
-                    otros_iva = sum([a['pesos'] * 0.21 for j, a in enumerate(st.session_state.abog_data) if j != i and a.get('iva', False)])
-                    otros_caja = sum([a['pesos'] * 0.10 for j, a in enumerate(st.session_state.abog_data) if j != i])
-                    disp = limite_25 - total_aux - otros - otros_iva - otros_caja
-                    
-                    monto_base_abog = abog['pesos']
-                    iva_abog = monto_base_abog * 0.21 if abog.get('iva', False) else 0
-                    caja_abog = monto_base_abog * 0.10
-                    monto_total_abog = monto_base_abog + iva_abog + caja_abog
-                    
-                    disp_ajustado = disp + monto_total_abog
-                    
-                    max_pct = (disp_ajustado / (monto_juicio * (1.21 if abog.get('iva', False) else 1) * 1.10)) * 100 if monto_juicio > 0 else 0
-                    
-                    pct = st.number_input(
+                    st.number_input(
                         "% del monto",
                         min_value=0.00,
-                        max_value=max(0.00, max_pct),
-                        value=round((abog['pesos'] / monto_juicio * 100) if monto_juicio > 0 else 0.0, 2),
+                        max_value=max(st.session_state[f"abog_pct_{abog['id']}"], max_pct),
                         step=0.01,
                         format="%.2f",
-                        key=f"abog_pct_{abog['id']}_{i}"
+                        key=f"abog_pct_{abog['id']}",
+                        on_change=_actualizar_profesional,
+                        args=('abog', abog['id'], 'pct')
                     )
-                    
-                    nuevo_pesos = round((pct / 100) * monto_juicio, 2)
-                    if abs(nuevo_pesos - abog['pesos']) > 0.001:
-                        st.session_state.abog_data[i]['pesos'] = nuevo_pesos
-                        st.rerun()
                 
                 with col2:
-                    max_pesos_permitido = disp_ajustado / ((1.21 if abog.get('iva', False) else 1) * 1.10)
-                    
-                    pesos = st.number_input(
+                    st.number_input(
                         "$ Monto",
                         min_value=0.00,
-                        max_value=max(0.00, max_pesos_permitido),
-                        value=round(abog['pesos'], 2),
+                        max_value=max(st.session_state[f"abog_pesos_{abog['id']}"], max_pesos_permitido),
                         step=100.00,
                         format="%.2f",
-                        key=f"abog_pesos_{abog['id']}_{i}"
+                        key=f"abog_pesos_{abog['id']}",
+                        on_change=_actualizar_profesional,
+                        args=('abog', abog['id'], 'pesos')
                     )
-                    
-                    if abs(pesos - abog['pesos']) > 0.001:
-                        st.session_state.abog_data[i]['pesos'] = round(pesos, 2)
-                        st.rerun()
                 
                 col_j, col_iv, col_del = st.columns([2, 1, 0.5])
                 
                 with col_j:
                     jus_abog = abog['pesos'] / res_base['valor_jus']
-                    alerta_jus = " ⚠️ No supera mínimo" if jus_abog < 7 else ""
+                    alerta_jus = " ⚠️ No supera mínimo" if jus_abog < MINIMO_JUS_ABOGADO else ""
                     st.caption(f"{jus_abog:.2f} JUS{alerta_jus}")
                 
                 with col_iv:
-                    iva = st.checkbox("IVA", key=f"abog_iva_{abog['id']}_{i}", value=abog.get('iva', False))
-                    if iva != abog.get('iva', False):
-                        st.session_state.abog_data[i]['iva'] = iva
-                        st.rerun()
+                    st.checkbox(
+                        "IVA",
+                        key=f"abog_iva_{abog['id']}",
+                        on_change=_actualizar_profesional,
+                        args=('abog', abog['id'], 'iva')
+                    )
                 
                 with col_del:
                     if len(st.session_state.abog_data) > 1:
-                        if st.button("🗑️", key=f"del_abog_{abog['id']}_{i}"):
-                            st.session_state.abog_data.pop(i)
-                            st.rerun()
+                        st.button("🗑️", key=f"del_abog_{abog['id']}",
+                                  on_click=_eliminar_profesional, args=('abog', abog['id']))
                 
-                detalles = [f"Caja: {formato_moneda(round(abog['pesos'] * 0.10, 2))}"]
+                detalles = [f"Caja: {formato_moneda(round(abog['pesos'] * CAJA, 2))}"]
                 if abog.get('iva', False):
-                    detalles.append(f"IVA: {formato_moneda(round(abog['pesos'] * 0.21, 2))}")
+                    detalles.append(f"IVA: {formato_moneda(round(abog['pesos'] * IVA, 2))}")
                 st.caption(" | ".join(detalles))
                 st.markdown("")
             
@@ -349,65 +439,44 @@ with tab2:
                 st.button("➕ Abogado", key="add_abog", disabled=True)
                 st.caption("⚠️ Límite alcanzado")
             else:
-                if st.button("➕ Abogado", key="add_abog"):
-                    st.session_state.abog_counter += 1
-                    st.session_state.abog_data.append({'id': st.session_state.abog_counter, 'pesos': 0.0, 'iva': False})
-                    st.rerun()
-            
-            total_abog_individual = sum([a['pesos'] for a in st.session_state.abog_data])
-            total_iva_individual = sum([a['pesos'] * 0.21 for a in st.session_state.abog_data if a.get('iva', False)])
-            total_caja_individual = sum([a['pesos'] * 0.10 for a in st.session_state.abog_data])
+                st.button("➕ Abogado", key="add_abog", on_click=_agregar_profesional, args=('abog',))
             
-            st.caption(f"**Total:** {formato_moneda(round(total_abog_individual, 2))} + Caja {formato_moneda(round(total_caja_individual, 2))} + IVA {formato_moneda(round(total_iva_individual, 2))}")
+            st.caption(f"**Total:** {formato_moneda(round(resumen['total_abog'], 2))} + Caja {formato_moneda(round(resumen['total_caja'], 2))} + IVA {formato_moneda(round(resumen['total_iva'], 2))}")
         
         # COLUMNA DERECHA: AUXILIARES
         with col_auxiliares:
             st.markdown('<div style="background-color: #2196F3; color: white; padding: 10px; border-radius: 5px; text-align: center; margin-bottom: 10px;"><b>🔬 Auxiliares</b></div>', unsafe_allow_html=True)
             
             for i, aux in enumerate(st.session_state.aux_data):
+                _inicializar_widgets('aux', aux, monto_juicio)
+                max_pesos_permitido = resumen['max_auxiliares'][i]
+                max_pct = (max_pesos_permitido / monto_juicio) * 100 if monto_juicio > 0 else 0
+                
                 col1, col2 = st.columns([1, 1])
                 
                 with col1:
-                    otros = sum([a['pesos'] for j, a in enumerate(st.session_state.aux_data) if j != i])
-                    total_abog_con_extras = sum([
-                        a['pesos'] + 
-                        (a['pesos'] * 0.21 if a.get('iva', False) else 0) + 
-                        (a['pesos'] * 0.10)
-                        for a in st.session_state.abog_data
-                    ])
-                    disp = limite_25 - total_abog_con_extras - otros
-                    
-                    max_pct = (disp / monto_juicio) * 100 if monto_juicio > 0 else 0
-                    
-                    pct = st.number_input(
+                    st.number_input(
                         "% del monto",
                         min_value=0.00,
-                        max_value=max(0.00, max_pct),
-                        value=round((aux['pesos'] / monto_juicio * 100) if monto_juicio > 0 else 0.0, 2),
+                        max_value=max(st.session_state[f"aux_pct_{aux['id']}"], max_pct),
                         step=0.01,
                         format="%.2f",
-                        key=f"aux_pct_{aux['id']}_{i}"
+                        key=f"aux_pct_{aux['id']}",
+                        on_change=_actualizar_profesional,
+                        args=('aux', aux['id'], 'pct')
                     )
-                    
-                    nuevo_pesos = round((pct / 100) * monto_juicio, 2)
-                    if abs(nuevo_pesos - aux['pesos']) > 0.001:
-                        st.session_state.aux_data[i]['pesos'] = nuevo_pesos
-                        st.rerun()
                 
                 with col2:
-                    pesos = st.number_input(
+                    st.number_input(
                         "$ Monto",
                         min_value=0.00,
-                        max_value=max(0.00, disp),
-                        value=round(aux['pesos'], 2),
+                        max_value=max(st.session_state[f"aux_pesos_{aux['id']}"], max_pesos_permitido),
                         step=100.00,
                         format="%.2f",
-                        key=f"aux_pesos_{aux['id']}_{i}"
+                        key=f"aux_pesos_{aux['id']}",
+                        on_change=_actualizar_profesional,
+                        args=('aux', aux['id'], 'pesos')
                     )
-                    
-                    if abs(pesos - aux['pesos']) > 0.001:
-                        st.session_state.aux_data[i]['pesos'] = round(pesos, 2)
-                        st.rerun()
                 
                 col_nom, col_del = st.columns([3, 0.5])
                 
@@ -416,20 +485,15 @@ with tab2:
                 
                 with col_del:
                     if len(st.session_state.aux_data) > 1:
-                        if st.button("🗑️", key=f"del_aux_{aux['id']}_{i}"):
-                            st.session_state.aux_data.pop(i)
-                            st.rerun()
+                        st.button("🗑️", key=f"del_aux_{aux['id']}",
+                                  on_click=_eliminar_profesional, args=('aux', aux['id']))
                 
                 st.markdown("")
             
-            if pct_usado >= 25.0:
+            if pct_usado >= 25.0 or len(st.session_state.aux_data) >= MAXIMO_AUXILIARES:
                 st.button("➕ Auxiliar", key="add_aux", disabled=True)
             else:
-                if st.button("➕ Auxiliar", key="add_aux"):
-                    if len(st.session_state.aux_data) < 5:
-                        st.session_state.aux_counter += 1
-                        st.session_state.aux_data.append({'id': st.session_state.aux_counter, 'pesos': 0.0})
-                        st.rerun()
+                st.button("➕ Auxiliar", key="add_aux", on_click=_agregar_profesional, args=('aux',))
             
             st.caption(f"**Total:** {formato_moneda(round(total_aux, 2))}")
         
@@ -452,8 +516,8 @@ with tab2:
             for i, abog in enumerate(st.session_state.abog_data):
                 jus_abog = abog['pesos'] / res_base['valor_jus']
                 pct_abog = (abog['pesos'] / monto_juicio) * 100
-                iva_abog = abog['pesos'] * 0.21 if abog.get('iva', False) else 0
-                caja_abog = abog['pesos'] * 0.10
+                iva_abog = abog['pesos'] * IVA if abog.get('iva', False) else 0
+                caja_abog = abog['pesos'] * CAJA
                 total_abog_individ = abog['pesos'] + iva_abog + caja_abog
                 
                 st.markdown(f"""
@@ -464,16 +528,14 @@ with tab2:
                 - **Subtotal: {formato_moneda(total_abog_individ)} ({(total_abog_individ/monto_juicio*100):.2f}%)**
                 """)
             
-            total_abog_individual = sum([a['pesos'] for a in st.session_state.abog_data])
-            total_iva_individual = sum([a['pesos'] * 0.21 for a in st.session_state.abog_data if a.get('iva', False)])
-            total_caja_individual = sum([a['pesos'] * 0.10 for a in st.session_state.abog_data])
+            total_abogados = resumen['total_abog'] + resumen['total_caja'] + resumen['total_iva']
             
             st.markdown(f"""
             **Total Abogados:**
-            - Honorarios: {formato_moneda(total_abog_individual)}
-            - Caja: {formato_moneda(total_caja_individual)}
-            - IVA: {formato_moneda(total_iva_individual)}
-            - **Total: {formato_moneda(total_abog_individual + total_caja_individual + total_iva_individual)} ({((total_abog_individual + total_caja_individual + total_iva_individual)/monto_juicio*100):.2f}%)**
+            - Honorarios: {formato_moneda(resumen['total_abog'])}
+            - Caja: {formato_moneda(resumen['total_caja'])}
+            - IVA: {formato_moneda(resumen['total_iva'])}
+            - **Total: {formato_moneda(total_abogados)} ({(total_abogados/monto_juicio*100):.2f}%)**
             
             ---
             
@@ -494,11 +556,72 @@ with tab2:
             ---
             
             **RESUMEN FINAL:**
-            - Total Abogados: {formato_moneda(total_abog_individual + total_caja_individual + total_iva_individual)} ({((total_abog_individual + total_caja_individual + total_iva_individual)/monto_juicio*100):.2f}%)
+            - Total Abogados: {formato_moneda(total_abogados)} ({(total_abogados/monto_juicio*100):.2f}%)
             - Total Auxiliares: {formato_moneda(total_aux)} ({(total_aux/monto_juicio*100):.2f}%)
             - **TOTAL GENERAL: {formato_moneda(total_usado)} ({pct_usado:.2f}%)**
             - **REMANENTE: {formato_moneda(limite_25 - total_usado)} ({(25.0 - pct_usado):.2f}%)**
             """)
+        
+        # Distribución automática del tope
+        with st.expander("🎯 Distribución Automática del 25%"):
+            st.caption(
+                f"Reparte el tope entre los profesionales cargados en proporción a sus pesos, "
+                f"incluyendo Caja e IVA de los abogados y asegurando el mínimo de "
+                f"{MINIMO_JUS_ABOGADO} JUS por abogado cuando el tope lo permite."
+            )
+            
+            profesionales = pd.DataFrame(
+                [{'profesional': f"Abogado {i+1}", 'iva': a.get('iva', False), 'peso': 1.0}
+                 for i, a in enumerate(st.session_state.abog_data)] +
+                [{'profesional': f"Auxiliar {i+1}", 'iva': False, 'peso': 1.0}
+                 for i, a in enumerate(st.session_state.aux_data)]
+            )
+            pesos_editados = st.data_editor(
+                profesionales,
+                key="optimizador_pesos",
+                hide_index=True,
+                num_rows="fixed",
+                use_container_width=True,
+                disabled=['profesional', 'iva'],
+                column_config={
+                    'profesional': st.column_config.TextColumn("Profesional"),
+                    'iva': st.column_config.CheckboxColumn("IVA"),
+                    'peso': st.column_config.NumberColumn("Peso", min_value=0.0, step=0.5, format="%.2f"),
+                },
+            )
+            
+            cant_abog = len(st.session_state.abog_data)
+            pesos_lista = pesos_editados['peso'].fillna(0.0).tolist()
+            distribucion = optimizar_distribucion(
+                monto_juicio,
+                res_base['valor_jus'],
+                [{'peso': p, 'iva': a.get('iva', False)} for p, a in zip(pesos_lista[:cant_abog], st.session_state.abog_data)],
+                [{'peso': p} for p in pesos_lista[cant_abog:]],
+            )
+            
+            tabla_dist = pd.DataFrame({
+                'Profesional': profesionales['profesional'],
+                'Honorarios': columna_moneda(distribucion['pesos']),
+                'JUS': distribucion['jus'].map(lambda v: f"{v:.2f}"),
+                'Caja': columna_moneda(distribucion['caja']),
+                'IVA': columna_moneda(distribucion['iva_monto']),
+                'Total': columna_moneda(distribucion['total']),
+                '%': distribucion['pct'].map(lambda v: f"{v:.2f}%"),
+            })
+            st.dataframe(tabla_dist, use_container_width=True, hide_index=True)
+            
+            total_dist = distribucion['total'].sum()
+            st.caption(f"**Total distribuido:** {formato_moneda(total_dist)} ({(total_dist/monto_juicio*100):.2f}%)")
+            abajo_minimo = (distribucion['tipo'] == 'Abogado') & (distribucion['peso'] > 0) & (distribucion['jus'] < MINIMO_JUS_ABOGADO)
+            if abajo_minimo.any():
+                st.warning(f"⚠️ El tope no alcanza para asegurar {MINIMO_JUS_ABOGADO} JUS a todos los abogados")
+            
+            st.button(
+                "✅ Aplicar distribución",
+                key="aplicar_distribucion",
+                on_click=_aplicar_distribucion,
+                args=(distribucion['pesos'].tolist(),)
+            )
 
 # Footer
 st.markdown("---")
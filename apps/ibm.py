@@ -5,12 +5,19 @@ CALCULADORA DE INGRESO BASE MENSUAL (IBM)
 Ley 24.557 - Art. 12 Inc. 1
 """
 
+import sys
 import streamlit as st
 import pandas as pd
+from pathlib import Path
 from datetime import datetime, date
 from dateutil.relativedelta import relativedelta
 from decimal import Decimal, ROUND_HALF_UP
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.indices import cargar_series
+from utils.ibm import calcular_ibm_nomina, COLUMNAS_NOMINA
+from utils.formato import formato_moneda_exacta
+
 # Configuración de la página
 st.set_page_config(
     page_title="Calculadora IBM - Ley 24557",
@@ -41,7 +48,7 @@ def cargar_ripte():
     # Crear columna de fecha
     df['fecha'] = pd.to_datetime(
         df['anio'].astype(str) + '-' + 
-        df['mes'].str[:3].map({
+        df['mes'].str.strip().str[:3].map({
             'Ene': '01', 'Feb': '02', 'Mar': '03', 'Abr': '04',
             'May': '05', 'Jun': '06', 'Jul': '07', 'Ago': '08',
             'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dic': '12'
@@ -53,7 +60,7 @@ def obtener_ripte(df_ripte, año, mes):
     """Obtiene el índice RIPTE para un año y mes"""
     fila = df_ripte[
         (df_ripte['anio'] == año) & 
-        (df_ripte['mes'].str.lower().str[:3] == mes.lower()[:3])
+        (df_ripte['mes'].str.strip().str.lower().str[:3] == mes.lower()[:3])
     ]
     if not fila.empty:
         return float(fila.iloc[0]['indice_ripte'])
@@ -95,15 +102,37 @@ def obtener_dias_mes(año, mes):
     ultimo = sig_mes - relativedelta(days=1)
     return ultimo.day
 
+def actualizar_salario(salario, variacion):
+    """Actualiza un salario por la variación RIPTE (sin variación se mantiene)"""
+    if variacion is not None and salario > 0:
+        return salario * (1 + variacion)
+    return salario
+
+@st.cache_data
+def tabla_ripte_pmi(fecha_pmi):
+    """Períodos, RIPTE, variación y días de los 12 meses anteriores a la PMI"""
+    df_ripte = cargar_ripte()
+    mes_pmi = obtener_nombre_mes(fecha_pmi).split('.-')[0]
+    filas = []
+    for mes in obtener_meses_anteriores(fecha_pmi, 12):
+        nombre = obtener_nombre_mes(mes)
+        mes_nombre = nombre.split('.-')[0]
+        filas.append({
+            'key': f"{mes.year}_{mes.month}",
+            'periodo': nombre,
+            'ripte': obtener_ripte(df_ripte, mes.year, mes_nombre),
+            'variacion': calcular_variacion_ripte(df_ripte, mes.year, mes_nombre, fecha_pmi.year, mes_pmi),
+            'dias': obtener_dias_mes(mes.year, mes.month),
+        })
+    tabla = pd.DataFrame(filas)
+    # Sin dato RIPTE se conserva None (como en la carga fila por fila)
+    for col in ['ripte', 'variacion']:
+        tabla[col] = tabla[col].astype(object).where(tabla[col].notna(), None)
+    return tabla
+
 def formatear_moneda(valor):
-    """Formatea como moneda argentina"""
-    if valor is None:
-        return "$0,00"
-    decimal_val = Decimal(str(valor))
-    redondeado = decimal_val.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-    valor_str = f"{redondeado:,.2f}"
-    valor_str = valor_str.replace(",", "X").replace(".", ",").replace("X", ".")
-    return f"${valor_str}"
+    """Formatea como moneda argentina (redondeo mitad hacia arriba)"""
+    return formato_moneda_exacta(valor)
 
 def formatear_porcentaje(valor):
     """Formatea como porcentaje"""
@@ -180,170 +209,176 @@ with col_fecha2:
 
 st.markdown("---")
 
-# Obtener 12 meses anteriores
-meses = obtener_meses_anteriores(fecha_pmi, 12)
-
-# Inicializar session_state
+# Inicializar session_state (salarios cargados por mes, se conservan al cambiar la PMI)
 if 'salarios' not in st.session_state:
     st.session_state.salarios = {}
 
-# TABLA DE CÁLCULO
-st.subheader("💰 Tabla de Cálculo de Salarios")
-
-# Encabezados de la tabla
-col_headers = st.columns([0.5, 1.2, 1.5, 1, 1.2, 1.5, 0.8])
-with col_headers[0]:
-    st.markdown("**✓**")
-with col_headers[1]:
-    st.markdown("**Período**")
-with col_headers[2]:
-    st.markdown("**Salario**")
-with col_headers[3]:
-    st.markdown("**RIPTE**")
-with col_headers[4]:
-    st.markdown("**Variación**")
-with col_headers[5]:
-    st.markdown("**Actualizado**")
-with col_headers[6]:
-    st.markdown("**Días**")
-
-st.markdown("---")
-
-datos_calc = []
-
-# Filas de la tabla
-for mes in meses:
-    nombre = obtener_nombre_mes(mes)
-    key = f"{mes.year}_{mes.month}"
-    
-    cols = st.columns([0.5, 1.2, 1.5, 1, 1.2, 1.5, 0.8])
-    
-    # Checkbox
-    with cols[0]:
-        incluir = st.checkbox("", value=True, key=f"c_{key}", label_visibility="collapsed")
-    
-    # Período
-    with cols[1]:
-        st.text(nombre)
-    
-    # Input Salario
-    with cols[2]:
-        salario = st.number_input(
-            f"Salario {nombre}",
-            min_value=0.0,
-            value=0.0,
-            step=1000.0,
-            format="%.2f",
-            key=f"s_{key}",
-            label_visibility="collapsed"
+def _tabla_para_pmi(fecha_pmi):
+    """Tabla de trabajo de la PMI actual, reconstruida solo cuando cambia la PMI"""
+    if st.session_state.get('ibm_tabla_pmi') != fecha_pmi:
+        tabla = tabla_ripte_pmi(fecha_pmi)
+        cargados = [st.session_state.salarios.get(k, (True, 0.0)) for k in tabla['key']]
+        tabla['incluir'] = [c[0] for c in cargados]
+        tabla['salario'] = [c[1] for c in cargados]
+        tabla['salario_act'] = [
+            actualizar_salario(sal, var) for sal, var in zip(tabla['salario'], tabla['variacion'])
+        ]
+        st.session_state.ibm_tabla = tabla
+        st.session_state.ibm_tabla_pmi = fecha_pmi
+    return st.session_state.ibm_tabla
+
+def _aplicar_ediciones(clave_editor):
+    """Aplica solo las filas editadas en la grilla y recalcula su salario actualizado"""
+    tabla = st.session_state.ibm_tabla
+    for fila, cambios in st.session_state[clave_editor]['edited_rows'].items():
+        fila = int(fila)
+        if 'incluir' in cambios:
+            tabla.at[fila, 'incluir'] = bool(cambios['incluir'])
+        if 'salario' in cambios:
+            salario = cambios['salario']
+            tabla.at[fila, 'salario'] = float(salario) if salario is not None else 0.0
+            tabla.at[fila, 'salario_act'] = actualizar_salario(
+                tabla.at[fila, 'salario'], tabla.at[fila, 'variacion']
+            )
+        st.session_state.salarios[tabla.at[fila, 'key']] = (
+            tabla.at[fila, 'incluir'], tabla.at[fila, 'salario']
         )
-    
-    # Calcular variación RIPTE
-    mes_nombre = nombre.split('.-')[0]
-    año_mes = mes.year
-    año_pmi = fecha_pmi.year
-    mes_pmi = obtener_nombre_mes(fecha_pmi).split('.-')[0]
-    
-    variacion = calcular_variacion_ripte(df_ripte, año_mes, mes_nombre, año_pmi, mes_pmi)
-    
-    # Calcular salario actualizado
-    if variacion is not None and salario > 0:
-        salario_act = salario * (1 + variacion)
-    else:
-        salario_act = salario
-    
-    # Obtener RIPTE
-    ripte = obtener_ripte(df_ripte, año_mes, mes_nombre)
-    dias = obtener_dias_mes(mes.year, mes.month)
-    
-    # Mostrar RIPTE
-    with cols[3]:
-        if ripte:
-            st.text(f"{ripte:.2f}")
-        else:
-            st.text("N/A")
-    
-    # Mostrar Variación
-    with cols[4]:
-        if variacion is not None:
-            st.text(formatear_porcentaje(variacion))
-        else:
-            st.text("N/A")
-    
-    # Mostrar Actualizado
-    with cols[5]:
-        if salario > 0:
-            st.text(formatear_moneda(salario_act))
-        else:
-            st.text("-")
-    
-    # Mostrar Días
-    with cols[6]:
-        st.text(str(dias))
-    
-    datos_calc.append({
-        'periodo': nombre,
-        'salario': salario,
-        'ripte': ripte if ripte else 0,
-        'variacion': variacion,
-        'salario_act': salario_act,
-        'dias': dias,
-        'incluir': incluir
-    })
 
-# Línea separadora
-st.markdown("---")
+# TABLA DE CÁLCULO
+@st.fragment
+def tabla_salarios(fecha_pmi):
+    """Grilla de salarios y resultado IBM (las ediciones solo re-ejecutan este bloque)"""
+    st.subheader("💰 Tabla de Cálculo de Salarios")
+
+    tabla = _tabla_para_pmi(fecha_pmi)
+    # La clave depende de la PMI para que las ediciones no se arrastren a otros meses
+    clave_editor = f"ibm_editor_{fecha_pmi.isoformat()}"
+    vista = pd.DataFrame({
+        'incluir': tabla['incluir'],
+        'periodo': tabla['periodo'],
+        'salario': tabla['salario'],
+        'ripte': [f"{r:.2f}" if r else "N/A" for r in tabla['ripte']],
+        'variacion': [formatear_porcentaje(v) if v is not None else "N/A" for v in tabla['variacion']],
+        'actualizado': [
+            formatear_moneda(act) if sal > 0 else "-"
+            for sal, act in zip(tabla['salario'], tabla['salario_act'])
+        ],
+        'dias': tabla['dias'],
+    })
 
-# TOTALES Y IBM
-total_orig = sum(Decimal(str(d['salario'])) for d in datos_calc if d['incluir'] and d['salario'] > 0)
-total_act = sum(Decimal(str(d['salario_act'])) for d in datos_calc if d['incluir'] and d['salario'] > 0)
-total_dias = sum(d['dias'] for d in datos_calc if d['incluir'] and d['salario'] > 0)
-meses_datos = sum(1 for d in datos_calc if d['incluir'] and d['salario'] > 0)
-
-# Calcular IBM
-if meses_datos > 0:
-    ibm = total_act / Decimal(str(meses_datos))
-    ibm = ibm.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-else:
-    ibm = Decimal('0')
-
-# Mostrar totales en la tabla
-col_tot = st.columns([0.5, 1.2, 1.5, 1, 1.2, 1.5, 0.8])
-with col_tot[0]:
-    st.markdown("")
-with col_tot[1]:
-    st.markdown("**TOTALES**")
-with col_tot[2]:
-    st.markdown(f"**{formatear_moneda(total_orig)}**")
-with col_tot[3]:
-    st.markdown("")
-with col_tot[4]:
-    st.markdown("")
-with col_tot[5]:
-    st.markdown(f"**{formatear_moneda(total_act)}**")
-with col_tot[6]:
-    st.markdown(f"**{total_dias}**")
+    st.data_editor(
+        vista,
+        key=clave_editor,
+        on_change=_aplicar_ediciones,
+        args=(clave_editor,),
+        hide_index=True,
+        num_rows="fixed",
+        use_container_width=True,
+        disabled=['periodo', 'ripte', 'variacion', 'actualizado', 'dias'],
+        column_config={
+            'incluir': st.column_config.CheckboxColumn("✓", width="small"),
+            'periodo': st.column_config.TextColumn("Período"),
+            'salario': st.column_config.NumberColumn("Salario", min_value=0.0, step=1000.0, format="%.2f"),
+            'ripte': st.column_config.TextColumn("RIPTE"),
+            'variacion': st.column_config.TextColumn("Variación"),
+            'actualizado': st.column_config.TextColumn("Actualizado"),
+            'dias': st.column_config.NumberColumn("Días", width="small"),
+        },
+    )
 
-st.markdown("---")
+    datos_calc = [{
+        'periodo': fila.periodo,
+        'salario': fila.salario,
+        'ripte': fila.ripte if fila.ripte else 0,
+        'variacion': fila.variacion,
+        'salario_act': fila.salario_act,
+        'dias': fila.dias,
+        'incluir': fila.incluir
+    } for fila in tabla.itertuples()]
+
+    # TOTALES Y IBM
+    total_orig = sum(Decimal(str(d['salario'])) for d in datos_calc if d['incluir'] and d['salario'] > 0)
+    total_act = sum(Decimal(str(d['salario_act'])) for d in datos_calc if d['incluir'] and d['salario'] > 0)
+    total_dias = sum(d['dias'] for d in datos_calc if d['incluir'] and d['salario'] > 0)
+    meses_datos = sum(1 for d in datos_calc if d['incluir'] and d['salario'] > 0)
+
+    # Calcular IBM
+    if meses_datos > 0:
+        ibm = total_act / Decimal(str(meses_datos))
+        ibm = ibm.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    else:
+        ibm = Decimal('0')
+
+    # Mostrar totales
+    col_tot = st.columns(3)
+    with col_tot[0]:
+        st.markdown(f"**Total original:** {formatear_moneda(total_orig)}")
+    with col_tot[1]:
+        st.markdown(f"**Total actualizado:** {formatear_moneda(total_act)}")
+    with col_tot[2]:
+        st.markdown(f"**Días:** {total_dias}")
+
+    st.markdown("---")
+
+    # Resultado IBM
+    col_ibm1, col_ibm2, col_ibm3 = st.columns([1, 2, 1])
+    with col_ibm2:
+        st.success("**INGRESO BASE MENSUAL (IBM)**")
+        st.markdown(f"# {formatear_moneda(ibm)}")
+        st.caption(f"Promedio de {meses_datos} meses con datos")
+
+    st.markdown("---")
+
+    # Botón para mostrar texto plano
+    if st.button("📋 Copiar Cuadro", use_container_width=True, type="primary"):
+        texto = generar_texto_plano(datos_calc, fecha_pmi, ibm)
+        st.text_area(
+            "Texto para copiar a Word",
+            value=texto,
+            height=400,
+            key="texto_plano"
+        )
 
-# Resultado IBM
-col_ibm1, col_ibm2, col_ibm3 = st.columns([1, 2, 1])
-with col_ibm2:
-    st.success("**INGRESO BASE MENSUAL (IBM)**")
-    st.markdown(f"# {formatear_moneda(ibm)}")
-    st.caption(f"Promedio de {meses_datos} meses con datos")
+tabla_salarios(fecha_pmi)
 
+# Cálculo masivo desde nómina
 st.markdown("---")
-
-# Botón para mostrar texto plano
-if st.button("📋 Copiar Cuadro", use_container_width=True, type="primary"):
-    texto = generar_texto_plano(datos_calc, fecha_pmi, ibm)
-    st.text_area(
-        "Texto para copiar a Word",
-        value=texto,
-        height=400,
-        key="texto_plano"
-    )
+with st.expander("📦 CÁLCULO MASIVO DESDE NÓMINA (CSV)"):
+    st.markdown(f"""
+    Cargue un CSV con una fila por trabajador y mes, con las columnas
+    **{', '.join(COLUMNAS_NOMINA)}**. Para cada trabajador se toman los salarios
+    de los 12 meses anteriores a su PMI y se calcula el IBM con la misma
+    actualización RIPTE de la tabla anterior. El archivo se procesa por bloques,
+    por lo que admite nóminas de cientos de miles de filas.
+    """)
+    archivo_nomina = st.file_uploader("Nómina (CSV)", type=['csv'], key="nomina_ibm_csv")
+
+    if archivo_nomina is not None:
+        try:
+            with st.spinner("Procesando nómina..."):
+                resultado_nomina = calcular_ibm_nomina(archivo_nomina, cargar_series())
+        except ValueError as e:
+            st.error(f"❌ {e}")
+        else:
+            if resultado_nomina.empty:
+                st.warning("⚠️ No se encontraron salarios dentro de los 12 meses anteriores a la PMI")
+            else:
+                col_n1, col_n2, col_n3 = st.columns(3)
+                with col_n1:
+                    st.metric("Trabajadores", f"{len(resultado_nomina):,}".replace(",", "."))
+                with col_n2:
+                    st.metric("IBM promedio", formatear_moneda(resultado_nomina['ibm'].mean()))
+                with col_n3:
+                    st.metric("Meses promedio", f"{resultado_nomina['meses'].mean():.1f}".replace(".", ","))
+
+                st.dataframe(resultado_nomina.round(2), use_container_width=True, hide_index=True)
+                st.download_button(
+                    label="📥 Descargar IBM por trabajador (CSV)",
+                    data=resultado_nomina.round(2).to_csv(index=False).encode('utf-8'),
+                    file_name="ibm_nomina.csv",
+                    mime="text/csv",
+                    key="download_ibm_nomina"
+                )
 
 # Información legal
 st.markdown("---")
@@ -8,6 +8,7 @@ Aplicación principal con autenticación y menú de acceso a todas las herramien
 """
 
 import streamlit as st
+import pandas as pd
 from pathlib import Path
 import sys
 
@@ -16,6 +17,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 # Importar módulo de autenticación
 from utils.auth import AuthSystem
+from utils.indices import ultimos_datos
 
 # Importar session manager (opcional - para persistencia de sesión)
 try:
@@ -366,59 +368,19 @@ def mostrar_menu_principal():
     """Muestra el menú principal con todas las aplicaciones"""
     mostrar_header()
     
-    # Cargar datasets para mostrar últimos datos
-    try:
-        import pandas as pd
-        
-        df_ripte = pd.read_csv("data/dataset_ripte.csv")
-        df_ripte['fecha'] = pd.to_datetime(df_ripte['año'].astype(str) + '-' + 
-                                          df_ripte['mes'].str[:3].map({
-                                              'Ene': '01', 'Feb': '02', 'Mar': '03', 'Abr': '04',
-                                              'May': '05', 'Jun': '06', 'Jul': '07', 'Ago': '08',
-                                              'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dic': '12'
-                                          }) + '-01')
-        
-        df_ipc = pd.read_csv("data/dataset_ipc.csv")
-        df_ipc['periodo'] = pd.to_datetime(df_ipc['periodo'])
-        
-        df_tasa = pd.read_csv("data/dataset_tasa.csv")
-        df_tasa['Desde'] = pd.to_datetime(df_tasa['Desde'])
-        df_tasa['Hasta'] = pd.to_datetime(df_tasa['Hasta'])
-        
-        # Obtener últimos datos
-        ultimo_ripte_txt = ""
-        ultimo_ipc_txt = ""
-        ultima_tasa_txt = ""
-        
-        if not df_ripte.empty:
-            ultimo_ripte = df_ripte.iloc[-1]
-            fecha_ripte = ultimo_ripte['fecha']
-            valor_ripte = ultimo_ripte['índice RIPTE']
-            mes_ripte = fecha_ripte.month
-            año_ripte = fecha_ripte.year
-            ultimo_ripte_txt = f"RIPTE {mes_ripte}/{año_ripte}: {valor_ripte:,.0f}"
-        
-        if not df_ipc.empty:
-            ultimo_ipc = df_ipc.iloc[-1]
-            fecha_ipc = ultimo_ipc['periodo']
-            variacion_ipc = ultimo_ipc['variacion_mensual']
-            mes_ipc = fecha_ipc.month
-            año_ipc = fecha_ipc.year
-            ultimo_ipc_txt = f"IPC {mes_ipc}/{año_ipc}: {variacion_ipc:.2f}%"
-        
-        if not df_tasa.empty:
-            ultima_tasa = df_tasa.iloc[0]
-            valor_tasa = ultima_tasa['Valor']
-            fecha_hasta = ultima_tasa['Hasta']
-            fecha_txt = fecha_hasta.strftime("%d/%m/%Y")
-            ultima_tasa_txt = f"TASA {fecha_txt}: {valor_tasa:.2f}%"
-        
-        # Mostrar alerta con últimos datos
-        st.warning(f"**📊 Últimos Datos:** {ultimo_ripte_txt} | {ultimo_ipc_txt} | {ultima_tasa_txt}")
-    
-    except Exception as e:
-        # Si hay error, simplemente no mostrar la alerta
-        pass
+    # Últimos datos (resumen en memoria, se relee solo si cambian los datasets)
+    ultimos = ultimos_datos()
+    textos = []
+    if ultimos['ripte']:
+        fecha_ripte = ultimos['ripte']['fecha']
+        textos.append(f"RIPTE {fecha_ripte.month}/{fecha_ripte.year}: {ultimos['ripte']['valor']:,.0f}")
+    if ultimos['ipc']:
+        fecha_ipc = ultimos['ipc']['fecha']
+        textos.append(f"IPC {fecha_ipc.month}/{fecha_ipc.year}: {ultimos['ipc']['variacion']:.2f}%")
+    if ultimos['tasa'] and pd.notnull(ultimos['tasa']['hasta']):
+        textos.append(f"TASA {ultimos['tasa']['hasta'].strftime('%d/%m/%Y')}: {ultimos['tasa']['valor']:.2f}%")
+    if textos:
+        st.warning(f"**📊 Últimos Datos:** {' | '.join(textos)}")
     
     # Mensaje de bienvenida personalizado
     usuario = st.session_state.usuario
@@ -9,7 +9,9 @@ from .data_loader import (
     cargar_dataset_ipc,
     cargar_dataset_pisos,
     cargar_dataset_ripte,
-    cargar_dataset_tasa
+    cargar_dataset_tasa,
+    firma_datasets,
+    derivado_dataset
 )
 
 from .auth import AuthSystem
@@ -21,5 +23,7 @@ __all__ = [
     'cargar_dataset_pisos',
     'cargar_dataset_ripte',
     'cargar_dataset_tasa',
+    'firma_datasets',
+    'derivado_dataset',
     'AuthSystem'
 ]
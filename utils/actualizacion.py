@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sistema de Cálculos y Herramientas - Tribunal de Trabajo 2 de Quilmes
+Módulo: Actualización - Actualización vectorizada de montos
+
+Replica los métodos de la Calculadora de Actualización (RIPTE + tasa pura,
+Tasa Activa e IPC + tasa pura) operando sobre columnas completas, para
+actualizar en una sola pasada todos los períodos de un reclamo.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .indices import SeriesActualizacion, parsear_fechas
+
+# Columnas esperadas en la planilla de diferencias salariales
+COLUMNAS_PERIODOS = ['fecha', 'monto']
+
+
+def _meses_ipc(series: SeriesActualizacion, desde, hasta) -> np.ndarray:
+    """Cantidad de períodos de IPC publicados entre el mes inicial y el final"""
+    m0 = pd.DatetimeIndex(desde).values.astype('datetime64[M]')
+    m1 = pd.DatetimeIndex(hasta).values.astype('datetime64[M]')
+    return (np.searchsorted(series.ipc_periodos, m1, side='right')
+            - np.searchsorted(series.ipc_periodos, m0, side='left'))
+
+
+def actualizar_montos(fechas, montos, fecha_final, tasa_pura_ripte: float,
+                      tasa_pura_ipc: float, series: SeriesActualizacion) -> pd.DataFrame:
+    """
+    Actualiza cada monto desde su propia fecha hasta una fecha final común
+
+    Args:
+        fechas: Columna de fechas iniciales (una por monto)
+        montos: Columna de montos a actualizar
+        fecha_final: Fecha final común
+        tasa_pura_ripte: Tasa pura (%) adicional al RIPTE
+        tasa_pura_ipc: Tasa pura (%) adicional al IPC
+        series: Series acumuladas de RIPTE, Tasa e IPC
+
+    Returns:
+        DataFrame con el desglose de RIPTE, Tasa Activa e IPC por fila
+    """
+    fechas = pd.DatetimeIndex(fechas)
+    montos = np.asarray(montos, dtype=float)
+    finales = np.full(len(fechas), np.datetime64(pd.Timestamp(fecha_final).date(), 'D'))
+
+    # RIPTE + tasa pura
+    coef_ripte = series.coeficiente_ripte(fechas, finales)
+    ripte_actualizado = montos * coef_ripte
+    ripte_interes = ripte_actualizado * (tasa_pura_ripte / 100)
+
+    # Tasa Activa
+    tasa_pct = series.tasa_acumulada(fechas, finales)
+
+    # IPC + tasa pura (sin períodos publicados no se actualiza ni se aplica interés)
+    factor_ipc = series.factor_ipc(fechas, finales)
+    meses_ipc = _meses_ipc(series, fechas, finales)
+    ipc_actualizado = montos * factor_ipc
+    ipc_interes = np.where(meses_ipc > 0, ipc_actualizado * (tasa_pura_ipc / 100), 0.0)
+
+    return pd.DataFrame({
+        'fecha': fechas,
+        'monto': montos,
+        'coef_ripte': coef_ripte,
+        'ripte_actualizado': ripte_actualizado,
+        'ripte_interes': ripte_interes,
+        'ripte_total': ripte_actualizado + ripte_interes,
+        'tasa_pct': tasa_pct,
+        'tasa_total': montos * (1 + tasa_pct / 100),
+        'ipc_inflacion': (factor_ipc - 1) * 100,
+        'ipc_interes': ipc_interes,
+        'ipc_total': ipc_actualizado + ipc_interes,
+    })
+
+
+def matriz_comparativa(monto: float, fecha_inicial, fecha_final, series: SeriesActualizacion,
+                       tasas_puras=range(1, 7)) -> pd.DataFrame:
+    """
+    Compara RIPTE + x% e IPC + x% para varias tasas puras junto con la Tasa Activa
+
+    Los índices del período se consultan una sola vez y las tasas puras se
+    aplican como un vector.
+
+    Args:
+        monto: Monto a actualizar
+        fecha_inicial: Fecha inicial
+        fecha_final: Fecha final
+        series: Series acumuladas de RIPTE, Tasa e IPC
+        tasas_puras: Tasas puras (%) a comparar
+
+    Returns:
+        DataFrame con una fila por tasa pura y los totales de cada método
+    """
+    tasas = np.asarray(list(tasas_puras), dtype=float)
+    fila = actualizar_montos([fecha_inicial], [monto], fecha_final, 0.0, 0.0, series).iloc[0]
+    # Sin períodos de IPC publicados el método no aplica interés (como en actualizar_ipc)
+    hay_ipc = _meses_ipc(series, [fecha_inicial], [fecha_final])[0] > 0
+    interes_ipc = tasas if hay_ipc else np.zeros_like(tasas)
+
+    return pd.DataFrame({
+        'tasa_pura': tasas,
+        'ripte_total': fila['ripte_actualizado'] * (1 + tasas / 100),
+        'ipc_total': monto * (1 + fila['ipc_inflacion'] / 100) * (1 + interes_ipc / 100),
+        'tasa_total': np.full(len(tasas), fila['tasa_total']),
+    })
+
+
+def actualizar_periodos(df: pd.DataFrame, fecha_final, tasa_pura_ripte: float,
+                        tasa_pura_ipc: float, series: SeriesActualizacion) -> pd.DataFrame:
+    """
+    Actualiza una planilla de períodos (fecha, monto) a una fecha final común
+
+    Las filas con fecha o monto inválidos, o con fecha posterior a la fecha
+    final, se informan en la columna 'observaciones' y no se actualizan.
+
+    Args:
+        df: DataFrame con las columnas 'fecha' y 'monto'
+        fecha_final: Fecha final común
+        tasa_pura_ripte: Tasa pura (%) adicional al RIPTE
+        tasa_pura_ipc: Tasa pura (%) adicional al IPC
+        series: Series acumuladas de RIPTE, Tasa e IPC
+
+    Returns:
+        DataFrame con el desglose por fila y la columna 'observaciones'
+
+    Raises:
+        ValueError: Si faltan columnas requeridas
+    """
+    entrada = df.copy()
+    entrada.columns = [str(c).strip().lower() for c in entrada.columns]
+    faltantes = [c for c in COLUMNAS_PERIODOS if c not in entrada.columns]
+    if faltantes:
+        raise ValueError(
+            f"Faltan columnas en el archivo: {faltantes}. "
+            f"Columnas requeridas: {COLUMNAS_PERIODOS}"
+        )
+
+    fechas = parsear_fechas(entrada['fecha'])
+    montos = pd.to_numeric(
+        entrada['monto'].astype(str).str.replace('$', '', regex=False).str.strip(),
+        errors='coerce'
+    )
+
+    observaciones = pd.Series('', index=entrada.index)
+    observaciones[fechas.isna()] = 'Fecha inválida'
+    observaciones[(observaciones == '') & (fechas > pd.Timestamp(fecha_final))] = 'Fecha posterior a la fecha final'
+    observaciones[(observaciones == '') & ~(montos >= 0)] = 'Monto inválido'
+    validas = (observaciones == '').to_numpy()
+
+    calculado = actualizar_montos(
+        fechas[validas], montos[validas], fecha_final, tasa_pura_ripte, tasa_pura_ipc, series
+    ).drop(columns=['fecha', 'monto'])
+    calculado.index = entrada.index[validas]
+
+    resultado = pd.DataFrame({
+        'fecha': fechas.dt.strftime('%d/%m/%Y'),
+        'monto': montos,
+    }, index=entrada.index)
+    resultado = resultado.join(calculado)
+    resultado['observaciones'] = observaciones
+    return resultado
+
+
+def imputar_pagos(capital: float, fecha_inicial, fecha_final, pagos: pd.DataFrame,
+                  metodo: str, tasa_pura: float, series: SeriesActualizacion,
+                  tasa_por_tramo: bool = False, tasa_pura_anual: bool = True) -> pd.DataFrame:
+    """
+    Actualiza un capital con pagos a cuenta, imputando cada pago primero a
+    intereses y luego a capital
+
+    El período se divide en tramos entre pagos consecutivos. Con Tasa Activa
+    cada tramo devenga capital × tasa acumulada del tramo; con RIPTE el capital
+    se actualiza por el coeficiente del tramo y devenga la tasa pura en
+    proporción a los días del tramo (ver tasa_pura_anual). Los factores de
+    todos los tramos se obtienen en una sola consulta a las series acumuladas.
+
+    Args:
+        capital: Capital inicial
+        fecha_inicial: Fecha desde la que se actualiza el capital
+        fecha_final: Fecha de cierre de la liquidación
+        pagos: DataFrame con las columnas 'fecha' y 'monto'
+        metodo: 'tasa' (Tasa Activa) o 'ripte' (RIPTE + tasa pura)
+        tasa_pura: Tasa pura (%) para el método RIPTE
+        series: Series acumuladas de RIPTE, Tasa e IPC
+        tasa_por_tramo: True para acumular la Tasa Activa con el criterio de
+            la Calculadora LRT (aporte de cada tramo de tasa redondeado a 2
+            decimales); sin pagos el saldo coincide con el de esa calculadora
+        tasa_pura_anual: True si la tasa pura es anual (cada tramo devenga
+            tasa × días / 365, criterio de la Calculadora LRT); False para
+            aplicarla una sola vez sobre todo el período, como actualizar_montos,
+            repartida entre los tramos en proporción a sus días
+
+    Returns:
+        DataFrame con una fila por evento (inicio, pagos y cierre) y los saldos
+
+    Raises:
+        ValueError: Si el método no es válido o hay pagos fuera del período
+    """
+    if metodo not in ('tasa', 'ripte'):
+        raise ValueError(f"Método '{metodo}' no reconocido. Opciones válidas: ['tasa', 'ripte']")
+
+    inicio = pd.Timestamp(fecha_inicial)
+    cierre = pd.Timestamp(fecha_final)
+    fechas_pago = parsear_fechas(pagos['fecha']) if len(pagos) else pd.Series(dtype='datetime64[ns]')
+    montos_pago = pd.to_numeric(pagos['monto'], errors='coerce') if len(pagos) else pd.Series(dtype=float)
+    if fechas_pago.isna().any() or montos_pago.isna().any() or (montos_pago < 0).any():
+        raise ValueError("Hay pagos con fecha o monto inválidos")
+    if ((fechas_pago <= inicio) | (fechas_pago > cierre)).any():
+        raise ValueError("Los pagos deben estar comprendidos entre la fecha inicial y la fecha final")
+
+    orden = np.argsort(fechas_pago.to_numpy(), kind='stable')
+    fechas_pago = pd.DatetimeIndex(fechas_pago.to_numpy()[orden])
+    montos_pago = montos_pago.to_numpy(dtype=float)[orden]
+
+    # Tramos: [inicio, pago 1), [pago 1, pago 2), ..., [último pago, cierre]
+    desde = pd.DatetimeIndex([inicio]).append(fechas_pago)
+    hasta = fechas_pago.append(pd.DatetimeIndex([cierre]))
+    hasta_tasa = hasta - pd.to_timedelta(np.r_[np.ones(len(fechas_pago)), 0], unit='D')
+    dias = (hasta - desde).days.to_numpy()
+    if tasa_pura_anual:
+        proporcion_tasa = dias / 365
+    elif dias.sum() > 0:
+        proporcion_tasa = dias / dias.sum()
+    else:
+        proporcion_tasa = np.r_[np.zeros(len(dias) - 1), 1.0]
+
+    if metodo == 'tasa' and tasa_por_tramo:
+        # Tasa de cada tramo como diferencia del acumulado desde la fecha inicial
+        acumulada = series.tasa_acumulada_por_tramo(inicio, hasta_tasa)
+        factores = np.diff(np.r_[0.0, acumulada])
+    elif metodo == 'tasa':
+        factores = series.tasa_acumulada(desde, hasta_tasa)
+    else:
+        factores = series.coeficiente_ripte(desde, hasta)
+
+    saldo_capital = float(capital)
+    saldo_interes = 0.0
+    filas = [{
+        'fecha': inicio, 'concepto': 'Capital inicial', 'dias': 0, 'factor': np.nan,
+        'capital_actualizado': saldo_capital, 'interes_tramo': 0.0, 'pago': 0.0,
+        'imputado_interes': 0.0, 'imputado_capital': 0.0, 'excedente': 0.0,
+        'saldo_interes': 0.0, 'saldo_capital': saldo_capital, 'saldo_total': saldo_capital,
+    }]
+
+    for k in range(len(desde)):
+        if metodo == 'tasa':
+            interes = saldo_capital * factores[k] / 100
+        else:
+            saldo_capital = saldo_capital * factores[k]
+            interes = saldo_capital * (tasa_pura / 100) * proporcion_tasa[k]
+        saldo_interes += interes
+        capital_actualizado = saldo_capital
+
+        es_pago = k < len(fechas_pago)
+        pago = montos_pago[k] if es_pago else 0.0
+        imputado_interes = min(pago, saldo_interes)
+        imputado_capital = min(pago - imputado_interes, saldo_capital)
+        saldo_interes -= imputado_interes
+        saldo_capital -= imputado_capital
+
+        filas.append({
+            'fecha': hasta[k], 'concepto': 'Pago a cuenta' if es_pago else 'Saldo final',
+            'dias': int(dias[k]), 'factor': factores[k],
+            'capital_actualizado': capital_actualizado, 'interes_tramo': interes, 'pago': pago,
+            'imputado_interes': imputado_interes, 'imputado_capital': imputado_capital,
+            'excedente': pago - imputado_interes - imputado_capital,
+            'saldo_interes': saldo_interes, 'saldo_capital': saldo_capital,
+            'saldo_total': saldo_capital + saldo_interes,
+        })
+
+    return pd.DataFrame(filas)
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sistema de Cálculos y Herramientas - Tribunal de Trabajo 2 de Quilmes
+Módulo: Almacén - Lectura paginada y edición por filas de los datasets CSV
+
+Cada archivo se indexa una sola vez por versión (posición en bytes de cada
+fila), de modo que una página se lee con un único acceso directo sin cargar
+el dataset completo. Al guardar solo se serializan las filas modificadas o
+agregadas; el resto del archivo se copia byte a byte, sin pasar por pandas.
+
+Las filas nuevas se agregan al final del archivo sin reescribirlo. Cuando hay
+que reescribirlo, se arma en un temporal y se reemplaza de una sola vez, de
+modo que las demás sesiones nunca leen un archivo a medio escribir. Cada
+cambio queda registrado como una versión en el historial (utils.historial).
+"""
+
+import csv
+import io
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .data_loader import DataLoader, derivado_dataset
+from .historial import asegurar_base, registrar_delta
+
+# Filas por página en el navegador de datasets
+FILAS_POR_PAGINA = 50
+
+
+def escribir_atomico(ruta: Path, contenido: bytes) -> None:
+    """
+    Reemplaza el contenido de un archivo de una sola vez
+
+    Se escribe un temporal en la misma carpeta y se renombra sobre el
+    original: quien lee el archivo ve la versión anterior o la nueva
+    completa, nunca una parcial.
+
+    Args:
+        ruta: Archivo a reemplazar
+        contenido: Nuevo contenido completo
+    """
+    ruta = Path(ruta)
+    descriptor, temporal = tempfile.mkstemp(dir=ruta.parent, prefix=f".{ruta.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as archivo:
+            archivo.write(contenido)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        if ruta.exists():
+            shutil.copymode(ruta, temporal)
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.unlink(temporal)
+        raise
+
+
+class AlmacenCSV:
+    """Índice de filas de un dataset CSV para leerlo y editarlo por páginas"""
+
+    def __init__(self, ruta: Path, clave: Optional[str] = None):
+        """
+        Args:
+            ruta: Archivo CSV
+            clave: Clave del dataset; si se indica, los cambios se registran en el historial
+        """
+        self.ruta = Path(ruta)
+        self.clave = clave
+        stat = self.ruta.stat()
+        self.version = stat.st_mtime_ns
+        self.tamaño = stat.st_size
+        datos = self.ruta.read_bytes()
+
+        # Límites de cada línea: la línea i ocupa limites[i]:limites[i + 1]
+        saltos = np.flatnonzero(np.frombuffer(datos, dtype=np.uint8) == 10) + 1
+        limites = np.concatenate(([0], saltos)).astype(np.int64)
+        if limites[-1] < len(datos):
+            limites = np.append(limites, len(datos))
+        self.limites = limites
+
+        encabezado = datos[:limites[1]] if len(limites) > 1 else datos
+        self.salto = b'\r\n' if encabezado.endswith(b'\r\n') else b'\n'
+        self.columnas = next(csv.reader([encabezado.decode('utf-8').rstrip('\r\n')]), [])
+
+    @property
+    def filas(self) -> int:
+        """Cantidad de filas de datos (sin el encabezado)"""
+        return max(len(self.limites) - 2, 0)
+
+    def paginas(self, filas_por_pagina: int = FILAS_POR_PAGINA) -> int:
+        """Cantidad de páginas (al menos una, aunque el dataset esté vacío)"""
+        return max(1, -(-self.filas // filas_por_pagina))
+
+    def _leer(self, desde: int, hasta: int) -> List[List[str]]:
+        """Lee y separa las filas [desde, hasta) con un solo acceso al archivo"""
+        if hasta <= desde:
+            return []
+        inicio, fin = int(self.limites[desde + 1]), int(self.limites[hasta + 1])
+        with open(self.ruta, 'rb') as archivo:
+            archivo.seek(inicio)
+            bloque = archivo.read(fin - inicio)
+        return list(csv.reader(io.StringIO(bloque.decode('utf-8'), newline='')))
+
+    def _completar(self, registro: List[str]) -> List[str]:
+        """Ajusta un registro a la cantidad de columnas del encabezado"""
+        ancho = len(self.columnas)
+        return (registro + [''] * ancho)[:ancho]
+
+    def pagina(self, numero: int, filas_por_pagina: int = FILAS_POR_PAGINA) -> pd.DataFrame:
+        """
+        Lee una página del dataset
+
+        Los valores se devuelven como texto, tal como figuran en el archivo,
+        para que las filas que no se editan se conserven sin cambios.
+
+        Args:
+            numero: Número de página (desde 0)
+            filas_por_pagina: Tamaño de la página
+
+        Returns:
+            DataFrame con las filas de la página, indexado por su número de fila
+        """
+        desde = min(max(numero, 0) * filas_por_pagina, self.filas)
+        hasta = min(desde + filas_por_pagina, self.filas)
+        registros = [self._completar(r) for r in self._leer(desde, hasta)]
+        return pd.DataFrame(registros, columns=self.columnas, index=pd.RangeIndex(desde, hasta), dtype=object)
+
+    def _serializar(self, registro: List[str]) -> bytes:
+        """Texto CSV de una fila con el mismo fin de línea que el archivo"""
+        salida = io.StringIO()
+        csv.writer(salida, lineterminator=self.salto.decode()).writerow(registro)
+        return salida.getvalue().encode('utf-8')
+
+    @staticmethod
+    def _texto(linea: bytes) -> str:
+        """Línea serializada sin el salto final, como se guarda en el historial"""
+        return linea.decode('utf-8').rstrip('\r\n')
+
+    def _verificar_vigente(self) -> None:
+        """Evita aplicar cambios sobre un índice de una versión anterior del archivo"""
+        stat = self.ruta.stat()
+        if (stat.st_mtime_ns, stat.st_size) != (self.version, self.tamaño):
+            raise RuntimeError("El archivo cambió desde que se abrió la página. Vuelva a cargarla e intente de nuevo.")
+
+    def _registro(self, valores: Dict[str, object], base: Optional[List[str]] = None) -> List[str]:
+        """Registro completo a partir de los valores editados por columna"""
+        registro = list(base) if base is not None else [''] * len(self.columnas)
+        for posicion, columna in enumerate(self.columnas):
+            if columna in valores:
+                valor = valores[columna]
+                registro[posicion] = '' if valor is None or (isinstance(valor, float) and np.isnan(valor)) else str(valor)
+        return registro
+
+    def agregar_filas(self, agregadas: Iterable[Dict[str, object]], autor: str = '') -> int:
+        """
+        Agrega filas al final del archivo sin reescribirlo
+
+        Args:
+            agregadas: Valores por columna de cada fila nueva
+            autor: Usuario que hace el cambio (para el historial)
+
+        Returns:
+            Cantidad de filas agregadas
+        """
+        registros = [self._registro(valores) for valores in agregadas]
+        if not registros:
+            return 0
+        lineas = [self._serializar(registro) for registro in registros]
+        contenido = b''.join(lineas)
+        if self.clave:
+            asegurar_base(self.clave, self.ruta, autor)
+        with open(self.ruta, 'ab+') as archivo:
+            # Si la última línea no termina en salto, se completa antes de agregar
+            if archivo.seek(0, os.SEEK_END):
+                archivo.seek(-1, os.SEEK_END)
+                if archivo.read(1) != b'\n':
+                    contenido = self.salto + contenido
+            archivo.write(contenido)
+        if self.clave:
+            registrar_delta(self.clave, self.ruta, {'agregadas': [self._texto(linea) for linea in lineas]}, autor)
+        return len(registros)
+
+    def guardar_cambios(self, modificadas: Dict[int, Dict[str, object]],
+                        eliminadas: Iterable[int] = (),
+                        agregadas: Iterable[Dict[str, object]] = (),
+                        autor: str = '') -> int:
+        """
+        Aplica ediciones fila por fila y guarda el archivo
+
+        Solo se leen y serializan las filas modificadas; los tramos de filas
+        sin cambios se copian tal cual y el archivo se reemplaza de una sola
+        vez. Si solo hay filas nuevas, se agregan al final sin reescribirlo.
+
+        Args:
+            modificadas: {número de fila: {columna: nuevo valor}}
+            eliminadas: Números de fila a eliminar
+            agregadas: Valores por columna de cada fila nueva
+            autor: Usuario que hace el cambio (para el historial)
+
+        Returns:
+            Cantidad de filas afectadas
+        """
+        eliminadas = set(eliminadas)
+        modificadas = {fila: valores for fila, valores in modificadas.items() if fila not in eliminadas}
+        tocadas = sorted(eliminadas | set(modificadas))
+        if not tocadas:
+            return self.agregar_filas(agregadas, autor)
+        agregadas = [self._serializar(self._registro(valores)) for valores in agregadas]
+
+        self._verificar_vigente()
+        if self.clave:
+            asegurar_base(self.clave, self.ruta, autor)
+        datos = self.ruta.read_bytes()
+        nuevas = {}
+        partes = []
+        cursor = 0
+        for fila in tocadas:
+            inicio, fin = int(self.limites[fila + 1]), int(self.limites[fila + 2])
+            partes.append(datos[cursor:inicio])
+            if fila in modificadas:
+                base = self._completar(next(csv.reader([datos[inicio:fin].decode('utf-8').rstrip('\r\n')]), []))
+                linea = self._serializar(self._registro(modificadas[fila], base))
+                nuevas[fila] = linea
+                # La última fila conserva la ausencia de salto final del archivo original
+                partes.append(linea if datos[inicio:fin].endswith(b'\n') else linea.rstrip(b'\r\n'))
+            cursor = fin
+        partes.append(datos[cursor:])
+
+        contenido = b''.join(partes)
+        if agregadas:
+            if contenido and not contenido.endswith(b'\n'):
+                contenido += self.salto
+            contenido += b''.join(agregadas)
+
+        escribir_atomico(self.ruta, contenido)
+        if self.clave:
+            registrar_delta(self.clave, self.ruta, {
+                'eliminadas': sorted(eliminadas),
+                'modificadas': {fila: self._texto(linea) for fila, linea in nuevas.items()},
+                'agregadas': [self._texto(linea) for linea in agregadas],
+            }, autor)
+        return len(tocadas) + len(agregadas)
+
+
+def almacen_dataset(clave: str) -> AlmacenCSV:
+    """
+    Obtiene el índice de un dataset, reconstruyéndolo solo si cambia el archivo
+
+    Args:
+        clave: Clave del dataset ('jus', 'ipc', 'pisos', 'ripte', 'tasa')
+    """
+    ruta = DataLoader.DATA_DIR / DataLoader.DATASETS[clave]
+    return derivado_dataset(f"almacen_{clave}", (clave,), lambda: AlmacenCSV(ruta, clave))
@@ -10,10 +10,14 @@ en el sistema, proporcionando funciones reutilizables y manejo de errores.
 
 import pandas as pd
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 import streamlit as st
 from datetime import datetime
 
+# Artefactos derivados de los datasets (tablas renderizadas, exportaciones) con su firma
+_CACHE_DERIVADOS: Dict[str, tuple] = {}
+
+
 class DataLoader:
     """Clase para cargar y gestionar datasets del sistema"""
     
@@ -268,6 +272,55 @@ class DataLoader:
         return validacion
 
 
+def firma_datasets(*claves: str) -> tuple:
+    """
+    Obtiene una firma liviana (fecha de modificación y tamaño) de los datasets
+
+    La firma cambia cada vez que se modifica alguno de los archivos, por lo que
+    sirve como clave de caché para los datos derivados de ellos.
+
+    Args:
+        *claves: Claves de los datasets a considerar (por defecto, todos)
+
+    Returns:
+        Tupla con (clave, mtime_ns, tamaño) por dataset
+    """
+    firma = []
+    for key in (claves or tuple(DataLoader.DATASETS.keys())):
+        ruta = DataLoader.DATA_DIR / DataLoader.DATASETS[key]
+        try:
+            stat = ruta.stat()
+            firma.append((key, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            firma.append((key, None, None))
+    return tuple(firma)
+
+
+def derivado_dataset(nombre: str, claves: tuple, construir: Callable[[], Any]) -> Any:
+    """
+    Obtiene un artefacto derivado de los datasets, reconstruyéndolo solo si cambian
+
+    Las apps se reejecutan completas en cada interacción; los resultados que
+    dependen solo de los datos (tablas HTML, bytes de exportación) se guardan
+    junto con la firma de los datasets de los que provienen y se reutilizan
+    mientras esa firma no cambie.
+
+    Args:
+        nombre: Identificador del artefacto
+        claves: Claves de los datasets de los que depende
+        construir: Función sin argumentos que genera el artefacto
+
+    Returns:
+        El artefacto correspondiente a la versión actual de los datasets
+    """
+    firma = firma_datasets(*claves)
+    entrada = _CACHE_DERIVADOS.get(nombre)
+    if entrada is None or entrada[0] != firma:
+        entrada = (firma, construir())
+        _CACHE_DERIVADOS[nombre] = entrada
+    return entrada[1]
+
+
 # Funciones helper para mantener compatibilidad con código existente
 def cargar_dataset_jus() -> pd.DataFrame:
     """Función helper para cargar dataset JUS"""
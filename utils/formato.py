@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sistema de Cálculos y Herramientas - Tribunal de Trabajo 2 de Quilmes
+Módulo: Formato - Importes y porcentajes con formato argentino
+
+Formato único de moneda ($ 1.234,56) y porcentaje (12,34%) para todas las
+calculadoras.
+"""
+
+from decimal import Decimal, ROUND_HALF_UP
+
+import pandas as pd
+
+# Intercambia separadores: 1,234.56 -> 1.234,56
+_SEPARADORES = str.maketrans(',.', '.,')
+
+
+def formato_moneda(valor) -> str:
+    """Formatea un valor como moneda argentina (ej: $ 1.234,56)"""
+    return f"$ {valor:,.2f}".translate(_SEPARADORES)
+
+
+def formato_moneda_exacta(valor) -> str:
+    """
+    Formatea como moneda argentina redondeando el valor decimal mitad hacia arriba
+
+    Criterio de la Calculadora IBM: sin espacio después del signo ($1.234,56)
+    y "$0,00" para valores faltantes.
+    """
+    if valor is None:
+        return "$0,00"
+    redondeado = Decimal(str(valor)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    return f"${redondeado:,.2f}".translate(_SEPARADORES)
+
+
+def formato_porcentaje(valor) -> str:
+    """Formatea un porcentaje con coma decimal (ej: 12,34%)"""
+    return f"{valor:.2f}%".replace('.', ',')
+
+
+def columna_moneda(valores) -> list:
+    """Formatea una columna de importes como moneda argentina (formato_moneda por valor)"""
+    return [formato_moneda(valor) for valor in pd.Series(valores, dtype=float)]
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sistema de Cálculos y Herramientas - Tribunal de Trabajo 2 de Quilmes
+Módulo: Historial - Versiones de los datasets y reconstrucción "a una fecha"
+
+Cada cambio guardado desde la administración se registra como una versión
+con un número correlativo común a todos los datasets. Cada versión guarda
+solo las filas eliminadas, modificadas y agregadas (delta por filas) y cada
+cierta cantidad de versiones se guarda una copia completa (punto de control).
+Un dataset se reconstruye en cualquier versión partiendo del punto de control
+anterior y aplicando los deltas siguientes, sin guardar copias completas de
+cada cambio.
+
+Estructura en data/historial/:
+    versiones.jsonl           una línea JSON por versión
+    checkpoints/<clave>_<n>.csv  copia completa del dataset en la versión n
+"""
+
+import io
+import json
+import shutil
+import threading
+from datetime import datetime, time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+import streamlit as st
+
+from .data_loader import DataLoader
+
+HISTORIAL_DIR = DataLoader.DATA_DIR / 'historial'
+ARCHIVO_VERSIONES = HISTORIAL_DIR / 'versiones.jsonl'
+CHECKPOINTS_DIR = HISTORIAL_DIR / 'checkpoints'
+
+# Deltas de un dataset entre dos copias completas consecutivas
+CADA_CHECKPOINT = 25
+
+# Reconstrucciones que se conservan en memoria (las versiones no cambian)
+MAXIMO_RECONSTRUCCIONES_CACHE = 32
+
+# Registro de versiones leído, con la firma del archivo del que proviene
+_CACHE_VERSIONES: Dict[str, tuple] = {}
+
+_BLOQUEO = threading.Lock()
+
+
+def _firma_archivo(ruta: Path) -> Optional[List[int]]:
+    """Fecha de modificación y tamaño de un archivo (None si no existe)"""
+    try:
+        stat = Path(ruta).stat()
+        return [stat.st_mtime_ns, stat.st_size]
+    except OSError:
+        return None
+
+
+def versiones() -> List[dict]:
+    """
+    Lista de versiones registradas, de la más antigua a la más reciente
+
+    Cada versión es un diccionario con 'version', 'dataset', 'fecha' (ISO),
+    'autor', 'tipo' ('base', 'externa' o 'delta') y, según el caso, 'delta'
+    y 'checkpoint'.
+    """
+    firma = _firma_archivo(ARCHIVO_VERSIONES)
+    if firma is None:
+        return []
+    entrada = _CACHE_VERSIONES.get('versiones')
+    if entrada is None or entrada[0] != firma:
+        with open(ARCHIVO_VERSIONES, encoding='utf-8') as archivo:
+            registro = [json.loads(linea) for linea in archivo if linea.strip()]
+        entrada = (firma, registro)
+        _CACHE_VERSIONES['versiones'] = entrada
+    return entrada[1]
+
+
+def ultima_version() -> Optional[int]:
+    """Número de la última versión registrada (None si no hay historial)"""
+    registro = versiones()
+    return registro[-1]['version'] if registro else None
+
+
+def resolver_version(version: Optional[int] = None, fecha=None) -> Optional[int]:
+    """
+    Traduce un pedido "a una versión" o "a una fecha" a un número de versión
+
+    Args:
+        version: Número de versión (tiene prioridad sobre la fecha)
+        fecha: Fecha u hora; una fecha sin hora incluye todo ese día
+
+    Returns:
+        Número de versión, o None para usar los archivos actuales
+    """
+    if version is not None:
+        return int(version)
+    if fecha is None:
+        return None
+    if not isinstance(fecha, datetime):
+        fecha = datetime.combine(pd.Timestamp(fecha).date(), time.max)
+    limite = fecha.isoformat()
+    anteriores = [v['version'] for v in versiones() if v['fecha'] <= limite]
+    return anteriores[-1] if anteriores else 0
+
+
+def _guardar_checkpoint(clave: str, numero: int, ruta: Path) -> str:
+    """Copia completa del dataset para la versión indicada"""
+    CHECKPOINTS_DIR.mkdir(parents=True, exist_ok=True)
+    nombre = f"{clave}_{numero}.csv"
+    shutil.copyfile(ruta, CHECKPOINTS_DIR / nombre)
+    return nombre
+
+
+def _agregar_version(entrada: dict) -> None:
+    """Agrega una línea al registro de versiones"""
+    HISTORIAL_DIR.mkdir(parents=True, exist_ok=True)
+    with open(ARCHIVO_VERSIONES, 'a', encoding='utf-8') as archivo:
+        archivo.write(json.dumps(entrada, ensure_ascii=False) + '\n')
+
+
+def tiene_historial(clave: str) -> bool:
+    """True si el dataset ya tiene al menos una versión registrada"""
+    return any(v['dataset'] == clave for v in versiones())
+
+
+def asegurar_base(clave: str, ruta: Path, autor: str = '') -> None:
+    """
+    Registra el estado actual de un dataset antes de modificarlo
+
+    Si el dataset todavía no tiene historial, o si el archivo cambió por fuera
+    de la administración desde la última versión registrada, se guarda una
+    copia completa para que los deltas siguientes partan del contenido real.
+
+    Los demás datasets que todavía no tienen historial también se copian en
+    ese momento: así cualquier versión se reconstruye solo con el historial,
+    sin depender de los archivos actuales, que pueden cambiar después.
+    """
+    with _BLOQUEO:
+        registro = versiones()
+        propias = [v for v in registro if v['dataset'] == clave]
+        con_historial = {v['dataset'] for v in registro}
+        pendientes = [
+            (otra, DataLoader.DATA_DIR / archivo)
+            for otra, archivo in DataLoader.DATASETS.items()
+            if otra != clave and otra not in con_historial and (DataLoader.DATA_DIR / archivo).exists()
+        ]
+        if not propias or propias[-1]['firma'] != _firma_archivo(ruta):
+            pendientes.append((clave, ruta))
+
+        numero = registro[-1]['version'] if registro else 0
+        for dataset, archivo in pendientes:
+            numero += 1
+            _agregar_version({
+                'version': numero,
+                'dataset': dataset,
+                'fecha': datetime.now().isoformat(timespec='seconds'),
+                'autor': autor,
+                'tipo': 'externa' if dataset == clave and propias else 'base',
+                'checkpoint': _guardar_checkpoint(dataset, numero, archivo),
+                'firma': _firma_archivo(archivo),
+            })
+
+
+def registrar_delta(clave: str, ruta: Path, delta: dict, autor: str = '') -> int:
+    """
+    Registra un cambio por filas ya aplicado al archivo del dataset
+
+    Args:
+        clave: Clave del dataset
+        ruta: Archivo del dataset (ya modificado)
+        delta: {'eliminadas': [fila, ...], 'modificadas': {fila: línea},
+                'agregadas': [línea, ...]}, con filas numeradas sobre la
+                versión anterior y líneas CSV sin el salto final
+        autor: Usuario que hizo el cambio
+
+    Returns:
+        Número de la nueva versión
+    """
+    with _BLOQUEO:
+        registro = versiones()
+        propias = [v for v in registro if v['dataset'] == clave]
+        numero = (registro[-1]['version'] if registro else 0) + 1
+        entrada = {
+            'version': numero,
+            'dataset': clave,
+            'fecha': datetime.now().isoformat(timespec='seconds'),
+            'autor': autor,
+            'tipo': 'delta',
+            'delta': {
+                'eliminadas': sorted(int(fila) for fila in delta.get('eliminadas', ())),
+                'modificadas': {str(fila): linea for fila, linea in delta.get('modificadas', {}).items()},
+                'agregadas': list(delta.get('agregadas', ())),
+            },
+            'firma': _firma_archivo(ruta),
+        }
+        desde_checkpoint = 0
+        for anterior in reversed(propias):
+            if 'checkpoint' in anterior:
+                break
+            desde_checkpoint += 1
+        if desde_checkpoint + 1 >= CADA_CHECKPOINT:
+            entrada['checkpoint'] = _guardar_checkpoint(clave, numero, ruta)
+        _agregar_version(entrada)
+        return numero
+
+
+def _lineas(contenido: bytes) -> tuple:
+    """Separa un CSV en líneas sin salto final y detecta el fin de línea usado"""
+    texto = contenido.decode('utf-8')
+    salto = '\r\n' if texto.split('\n', 1)[0].endswith('\r') else '\n'
+    lineas = texto.split('\n')
+    if lineas and lineas[-1] == '':
+        lineas.pop()
+    return [linea.rstrip('\r') for linea in lineas], salto
+
+
+def _aplicar(filas: List[str], delta: dict) -> List[str]:
+    """Aplica un delta por filas a las filas de datos (sin encabezado)"""
+    eliminadas = set(delta.get('eliminadas', ()))
+    modificadas = {int(fila): linea for fila, linea in delta.get('modificadas', {}).items()}
+    resultado = [modificadas.get(i, linea) for i, linea in enumerate(filas) if i not in eliminadas]
+    return resultado + list(delta.get('agregadas', ()))
+
+
+@lru_cache(maxsize=MAXIMO_RECONSTRUCCIONES_CACHE)
+def _reconstruir(clave: str, numero: int) -> bytes:
+    """Contenido del dataset tal como quedó en la versión propia indicada"""
+    propias = [v for v in versiones() if v['dataset'] == clave and v['version'] <= numero]
+    inicio = max(i for i, v in enumerate(propias) if 'checkpoint' in v)
+    contenido = (CHECKPOINTS_DIR / propias[inicio]['checkpoint']).read_bytes()
+    if inicio == len(propias) - 1:
+        return contenido
+
+    lineas, salto = _lineas(contenido)
+    encabezado, filas = lineas[:1], lineas[1:]
+    for entrada in propias[inicio + 1:]:
+        filas = _aplicar(filas, entrada['delta'])
+    return (salto.join(encabezado + filas) + salto).encode('utf-8')
+
+
+def contenido_en(clave: str, version: Optional[int] = None, fecha=None) -> Optional[bytes]:
+    """
+    Contenido de un dataset en una versión o fecha dada
+
+    Se usa la última versión propia del dataset que no supere la pedida; si
+    el pedido es anterior al inicio de su historial, el primer estado
+    registrado. Devuelve None cuando hay que usar el archivo actual (sin
+    versión pedida o sin historial para ese dataset).
+    """
+    numero = resolver_version(version, fecha)
+    if numero is None:
+        return None
+    propias = [v['version'] for v in versiones() if v['dataset'] == clave]
+    if not propias:
+        return None
+    anteriores = [v for v in propias if v <= numero]
+    return _reconstruir(clave, anteriores[-1] if anteriores else propias[0])
+
+
+def leer_csv(clave: str, version: Optional[int] = None, fecha=None, **kwargs) -> pd.DataFrame:
+    """
+    Lee un dataset con pandas, actual o en una versión/fecha anterior
+
+    Args:
+        clave: Clave del dataset ('jus', 'ipc', 'pisos', 'ripte', 'tasa')
+        version: Versión del historial (None para los datos actuales)
+        fecha: Alternativa a version: datos vigentes a esa fecha
+        **kwargs: Argumentos adicionales para pd.read_csv()
+    """
+    contenido = contenido_en(clave, version, fecha)
+    if contenido is None:
+        return pd.read_csv(DataLoader.DATA_DIR / DataLoader.DATASETS[clave], **kwargs)
+    return pd.read_csv(io.BytesIO(contenido), **kwargs)
+
+
+def describir_version(version: Optional[int]) -> str:
+    """Texto de una versión para los selectores de las calculadoras"""
+    if version is None:
+        return "Datos actuales"
+    for entrada in versiones():
+        if entrada['version'] == version:
+            fecha = datetime.fromisoformat(entrada['fecha']).strftime('%d/%m/%Y %H:%M')
+            return f"Versión {version} — {fecha} ({entrada['dataset'].upper()})"
+    return f"Versión {version}"
+
+
+def selector_version(key: str) -> Optional[int]:
+    """
+    Selector de versión de los datasets para recalcular con datos anteriores
+
+    No muestra nada mientras no haya historial.
+
+    Returns:
+        Versión elegida, o None para los datos actuales
+    """
+    registro = versiones()
+    if not registro:
+        return None
+    with st.expander("📚 Datos históricos"):
+        version = st.selectbox(
+            "Calcular con los datasets vigentes en",
+            [None] + [v['version'] for v in reversed(registro)],
+            format_func=describir_version,
+            key=key,
+        )
+        st.caption("Permite reproducir una liquidación con los índices tal como estaban cargados en esa versión.")
+    return version
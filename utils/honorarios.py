@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sistema de Cálculos y Herramientas - Tribunal de Trabajo 2 de Quilmes
+Módulo: Honorarios - Distribución de honorarios bajo el tope de la Ley 24.432
+
+Modelo de asignación de la pestaña de regulación: totales y máximos
+permitidos por profesional calculados en una sola pasada, y distribución
+automática del tope entre los profesionales según pesos.
+"""
+
+import math
+import re
+import numpy as np
+import pandas as pd
+
+from .indices import parsear_fechas
+
+# Alícuotas y topes de la regulación
+IVA = 0.21
+CAJA = 0.10
+LIMITE_REGULACION = 0.25
+MINIMO_JUS_ABOGADO = 7
+MAXIMO_AUXILIARES = 5
+
+# Columnas esperadas en el archivo de conversión masiva a JUS
+COLUMNAS_CONVERSION_JUS = ['monto', 'fecha']
+
+# Importe en formato argentino: 1234 | 1234,56 | 1.234 | 1.234.567,89
+_IMPORTE_ARGENTINO = re.compile(r'^-?(\d+|\d{1,3}(\.\d{3})+)(,\d+)?$')
+
+
+def factor_abogado(iva: bool) -> float:
+    """Costo total por peso regulado a un abogado (honorario + Caja + IVA si corresponde)"""
+    return 1 + CAJA + (IVA if iva else 0)
+
+
+def resumir_regulacion(monto_juicio: float, abogados: list, auxiliares: list) -> dict:
+    """
+    Calcula los totales de la regulación y el máximo permitido por profesional
+
+    Los totales se acumulan en una sola pasada; el máximo de cada fila es su
+    propio honorario más el remanente del tope dividido por su costo por peso,
+    por lo que no hace falta volver a sumar a los demás profesionales.
+
+    Args:
+        monto_juicio: Monto del juicio
+        abogados: Lista de dicts con 'pesos' e 'iva'
+        auxiliares: Lista de dicts con 'pesos'
+
+    Returns:
+        Dict con el límite, los totales por concepto, el total usado, el
+        porcentaje usado, el remanente y los máximos por fila ('max_abogados',
+        'max_auxiliares', en pesos)
+    """
+    limite = monto_juicio * LIMITE_REGULACION
+
+    total_abog = total_iva = total_caja = total_aux = 0.0
+    for abog in abogados:
+        total_abog += abog['pesos']
+        total_caja += abog['pesos'] * CAJA
+        if abog.get('iva', False):
+            total_iva += abog['pesos'] * IVA
+    for aux in auxiliares:
+        total_aux += aux['pesos']
+
+    total_usado = total_abog + total_iva + total_caja + total_aux
+    remanente = limite - total_usado
+
+    return {
+        'limite': limite,
+        'total_abog': total_abog,
+        'total_iva': total_iva,
+        'total_caja': total_caja,
+        'total_aux': total_aux,
+        'total_usado': total_usado,
+        'pct_usado': (total_usado / monto_juicio) * 100 if monto_juicio > 0 else 0.0,
+        'remanente': remanente,
+        'max_abogados': [
+            max(0.0, a['pesos'] + remanente / factor_abogado(a.get('iva', False))) for a in abogados
+        ],
+        'max_auxiliares': [max(0.0, a['pesos'] + remanente) for a in auxiliares],
+    }
+
+
+def _redondear_abajo(valor: float) -> float:
+    """Trunca a centavos, para que la suma redondeada no supere el tope"""
+    return math.floor(round(valor * 100, 6)) / 100
+
+
+def optimizar_distribucion(monto_juicio: float, valor_jus: float,
+                           abogados: list, auxiliares: list) -> pd.DataFrame:
+    """
+    Distribuye el tope del 25% entre los profesionales según sus pesos
+
+    Cada profesional recibe t × peso, con t el mayor valor que agota el tope
+    considerando la Caja (10%) y el IVA (21%) de los abogados. Los abogados
+    cuya cuota quedaría por debajo del mínimo de 7 JUS se fijan en el mínimo
+    y el resto del tope se reparte entre los demás; recorriéndolos de menor a
+    mayor peso, t se obtiene en forma cerrada sin iterar sobre montos.
+
+    Args:
+        monto_juicio: Monto del juicio
+        valor_jus: Valor del JUS aplicable (ver convertir_a_jus)
+        abogados: Lista de dicts con 'peso' e 'iva'
+        auxiliares: Lista de dicts con 'peso' (hasta MAXIMO_AUXILIARES)
+
+    Returns:
+        DataFrame con una fila por profesional: tipo, peso, iva, pesos, caja,
+        iva_monto, total, pct (sobre el monto del juicio), jus y minimo
+        (True si se fijó en el mínimo de 7 JUS)
+
+    Raises:
+        ValueError: Si hay más auxiliares que los admitidos o pesos negativos
+    """
+    if len(auxiliares) > MAXIMO_AUXILIARES:
+        raise ValueError(f"Se admiten hasta {MAXIMO_AUXILIARES} auxiliares")
+
+    pesos = np.array([a['peso'] for a in abogados] + [a['peso'] for a in auxiliares], dtype=float)
+    if (pesos < 0).any():
+        raise ValueError("Los pesos no pueden ser negativos")
+    es_abogado = np.r_[np.ones(len(abogados), dtype=bool), np.zeros(len(auxiliares), dtype=bool)]
+    con_iva = np.r_[[bool(a.get('iva', False)) for a in abogados], np.zeros(len(auxiliares), dtype=bool)].astype(bool)
+    factores = np.where(es_abogado, 1 + CAJA + np.where(con_iva, IVA, 0.0), 1.0)
+
+    limite = monto_juicio * LIMITE_REGULACION
+    minimo = MINIMO_JUS_ABOGADO * valor_jus
+    en_minimo = np.zeros(len(pesos), dtype=bool)
+
+    # Abogados de menor a mayor peso: el k-ésimo queda en el mínimo si la cuota
+    # que le correspondería repartiendo el resto entre los siguientes no lo alcanza
+    # (peso 0 excluye al profesional de la distribución)
+    libres_costo = float((factores * pesos).sum())
+    disponible = limite
+    for i in sorted(np.flatnonzero(es_abogado & (pesos > 0)), key=lambda j: pesos[j]):
+        t = disponible / libres_costo if libres_costo > 0 else 0.0
+        if t * pesos[i] >= minimo or disponible < factores[i] * minimo:
+            break
+        en_minimo[i] = True
+        disponible -= factores[i] * minimo
+        libres_costo -= factores[i] * pesos[i]
+
+    t = disponible / libres_costo if libres_costo > 0 else 0.0
+    asignado = np.where(en_minimo, minimo, t * pesos)
+    asignado = np.array([_redondear_abajo(v) for v in asignado])
+
+    caja = np.where(es_abogado, asignado * CAJA, 0.0)
+    iva_monto = np.where(con_iva, asignado * IVA, 0.0)
+    total = asignado + caja + iva_monto
+
+    return pd.DataFrame({
+        'tipo': np.where(es_abogado, 'Abogado', 'Auxiliar'),
+        'peso': pesos,
+        'iva': con_iva,
+        'pesos': asignado,
+        'caja': caja,
+        'iva_monto': iva_monto,
+        'total': total,
+        'pct': total / monto_juicio * 100 if monto_juicio > 0 else np.zeros(len(pesos)),
+        'jus': asignado / valor_jus if valor_jus > 0 else np.zeros(len(pesos)),
+        'minimo': en_minimo,
+    })
+
+
+def _vigencias_jus(df_jus: pd.DataFrame):
+    """
+    Inicios efectivos de vigencia de cada valor JUS, sin superposiciones
+
+    Las filas se ordenan por fecha de entrada en vigencia (el dataset puede
+    estar cargado en cualquier orden). Si dos acuerdos se superponen rige el
+    que empezó antes, por eso cada fila rige recién desde el día siguiente al
+    último fin anterior.
+
+    Returns:
+        Tupla (posición en df_jus de cada fila ordenada, inicio efectivo, fin)
+    """
+    inicio = df_jus['FECHA ENTRADA EN VIGENCIA'].to_numpy(dtype='datetime64[D]')
+    orden = np.argsort(inicio, kind='stable')
+    inicio = inicio[orden]
+    fin = df_jus['FECHA DE FINALIZACION'].to_numpy(dtype='datetime64[D]')[orden]
+    fin_abierto = np.where(np.isnat(fin), np.datetime64('9999-12-31'), fin)
+    fin_previo = np.maximum.accumulate(fin_abierto)
+    inicio_efectivo = inicio.copy()
+    inicio_efectivo[1:] = np.maximum(inicio[1:], fin_previo[:-1] + np.timedelta64(1, 'D'))
+    return orden, inicio_efectivo, fin_abierto
+
+
+def buscar_valores_jus(fechas, df_jus: pd.DataFrame):
+    """
+    Valor JUS vigente para cada fecha con una única búsqueda por intervalos
+
+    Mismo criterio que convertir_a_jus: sin valor vigente para la fecha se
+    toma el último valor publicado.
+
+    Args:
+        fechas: Columna de fechas
+        df_jus: Dataset JUS con las fechas ya convertidas y 'VALOR IUS' numérico
+
+    Returns:
+        Tupla (posición de fila en df_jus, True si la fecha tenía valor vigente)
+    """
+    dias = pd.DatetimeIndex(fechas).values.astype('datetime64[D]')
+    orden, inicio_efectivo, fin = _vigencias_jus(df_jus)
+    idx = np.searchsorted(inicio_efectivo, dias, side='right') - 1
+    idx_valido = np.clip(idx, 0, len(inicio_efectivo) - 1)
+    vigente = (idx >= 0) & (dias <= fin[idx_valido]) & (inicio_efectivo[idx_valido] <= fin[idx_valido])
+    return np.where(vigente, orden[idx_valido], len(df_jus) - 1), vigente
+
+
+def parsear_importes(valores: pd.Series):
+    """
+    Convierte importes en formato argentino ("$ 1.234,56") a números
+
+    Igual que VALOR IUS en el dataset JUS: el punto separa miles y la coma
+    los decimales. Un punto que no agrupa miles ("1234.56") es ambiguo y no
+    se convierte, para no multiplicar el monto por 100 o 1000 sin aviso.
+
+    Returns:
+        Tupla (importes, con NaN en los inválidos; True para los ambiguos)
+    """
+    texto = valores.astype(str).str.replace('$', '', regex=False).str.replace(' ', '', regex=False).str.strip()
+    argentino = texto.str.match(_IMPORTE_ARGENTINO)
+    importes = pd.to_numeric(
+        texto.where(argentino).str.replace('.', '', regex=False).str.replace(',', '.', regex=False),
+        errors='coerce'
+    )
+    return importes, ~argentino & texto.str.contains('.', regex=False)
+
+
+def convertir_lote_jus(df: pd.DataFrame, df_jus: pd.DataFrame, fecha_actual) -> pd.DataFrame:
+    """
+    Convierte una lista de regulaciones (monto, fecha) a JUS y a pesos actuales
+
+    Cada monto se divide por el JUS vigente a su fecha y el resultado se
+    multiplica por el JUS vigente a la fecha actual. Los montos se leen en
+    formato argentino (ver parsear_importes). Las filas con fecha o monto
+    inválidos se informan en la columna 'observaciones'.
+
+    Args:
+        df: DataFrame con las columnas 'monto' y 'fecha'
+        df_jus: Dataset JUS con las fechas ya convertidas y 'VALOR IUS' numérico
+        fecha_actual: Fecha a la que se expresa el monto actualizado
+
+    Returns:
+        DataFrame con fecha, monto, valor_jus, acuerdo, jus, valor_jus_actual,
+        monto_actualizado y observaciones
+
+    Raises:
+        ValueError: Si faltan columnas requeridas
+    """
+    entrada = df.copy()
+    entrada.columns = [str(c).strip().lower() for c in entrada.columns]
+    faltantes = [c for c in COLUMNAS_CONVERSION_JUS if c not in entrada.columns]
+    if faltantes:
+        raise ValueError(
+            f"Faltan columnas en el archivo: {faltantes}. "
+            f"Columnas requeridas: {COLUMNAS_CONVERSION_JUS}"
+        )
+
+    fechas = parsear_fechas(entrada['fecha'])
+    montos, ambiguos = parsear_importes(entrada['monto'])
+
+    observaciones = pd.Series('', index=entrada.index)
+    observaciones[fechas.isna()] = 'Fecha inválida'
+    observaciones[(observaciones == '') & ambiguos] = 'Monto ambiguo: use el formato 1.234,56'
+    observaciones[(observaciones == '') & ~(montos >= 0)] = 'Monto inválido'
+    validas = (observaciones == '').to_numpy()
+
+    fechas_validas = fechas.fillna(pd.Timestamp(fecha_actual))
+    idx, vigente = buscar_valores_jus(fechas_validas, df_jus)
+    observaciones[validas & ~vigente] = 'Sin valor vigente: se usó el último JUS'
+
+    idx_actual, _ = buscar_valores_jus([pd.Timestamp(fecha_actual)], df_jus)
+    valor_actual = float(df_jus['VALOR IUS'].iloc[idx_actual[0]])
+
+    valor_jus = df_jus['VALOR IUS'].to_numpy(dtype=float)[idx]
+    jus_exacto = montos.to_numpy(dtype=float) / valor_jus
+
+    resultado = pd.DataFrame({
+        'fecha': fechas.dt.strftime('%d/%m/%Y'),
+        'monto': montos,
+        'valor_jus': valor_jus,
+        'acuerdo': df_jus['ACUERDO'].to_numpy()[idx],
+        'jus': np.round(jus_exacto, 2),
+        'valor_jus_actual': valor_actual,
+        'monto_actualizado': jus_exacto * valor_actual,
+    }, index=entrada.index)
+    resultado.loc[~validas, ['valor_jus', 'acuerdo', 'jus', 'valor_jus_actual', 'monto_actualizado']] = np.nan
+    resultado['observaciones'] = observaciones
+    return resultado
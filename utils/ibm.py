@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sistema de Cálculos y Herramientas - Tribunal de Trabajo 2 de Quilmes
+Módulo: IBM - Cálculo masivo del Ingreso Base Mensual (Ley 24.557 Art. 12)
+
+Procesa nóminas con una fila por trabajador y mes, leyéndolas por bloques
+para mantener acotado el uso de memoria, y aplica la misma actualización
+RIPTE que la Calculadora IBM a todos los trabajadores en una sola pasada.
+"""
+
+import csv
+import numpy as np
+import pandas as pd
+
+from .indices import SeriesActualizacion, parsear_fechas
+from .liquidacion import redondear_vector
+
+# Columnas esperadas en la nómina
+COLUMNAS_NOMINA = ['trabajador', 'pmi', 'periodo', 'salario']
+
+# Filas leídas por bloque
+TAMAÑO_BLOQUE = 200_000
+
+
+def _detectar_separador(archivo) -> str:
+    """Detecta el separador del CSV leyendo solo el comienzo del archivo"""
+    inicio = archivo.read(8192)
+    archivo.seek(0)
+    if isinstance(inicio, bytes):
+        inicio = inicio.decode('utf-8', errors='ignore')
+    try:
+        return csv.Sniffer().sniff(inicio, delimiters=',;\t').delimiter
+    except csv.Error:
+        return ','
+
+
+def _reducir_bloque(bloque: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reduce un bloque de la nómina a salarios por trabajador, PMI y mes
+
+    Solo se conservan los 12 meses anteriores al mes de la PMI.
+    """
+    bloque.columns = [str(c).strip().lower() for c in bloque.columns]
+    faltantes = [c for c in COLUMNAS_NOMINA if c not in bloque.columns]
+    if faltantes:
+        raise ValueError(
+            f"Faltan columnas en el archivo: {faltantes}. "
+            f"Columnas requeridas: {COLUMNAS_NOMINA}"
+        )
+
+    pmi = parsear_fechas(bloque['pmi'])
+    periodo = parsear_fechas(bloque['periodo'])
+    salario = pd.to_numeric(
+        bloque['salario'].astype(str).str.replace('$', '', regex=False).str.strip(),
+        errors='coerce'
+    )
+
+    mes_pmi = pmi.dt.year * 12 + pmi.dt.month - 1
+    mes_periodo = periodo.dt.year * 12 + periodo.dt.month - 1
+    distancia = mes_pmi - mes_periodo
+    validas = (distancia >= 1) & (distancia <= 12) & (salario > 0)
+
+    return pd.DataFrame({
+        'trabajador': bloque['trabajador'].astype(str).str.strip()[validas],
+        'pmi': pmi.dt.normalize()[validas],
+        'mes': mes_periodo[validas].astype(np.int64),
+        'mes_pmi': mes_pmi[validas].astype(np.int64),
+        'salario': salario[validas],
+    }).groupby(['trabajador', 'pmi', 'mes', 'mes_pmi'], as_index=False)['salario'].sum()
+
+
+def _ripte_del_mes(series: SeriesActualizacion, meses: np.ndarray) -> np.ndarray:
+    """
+    Índice RIPTE publicado para cada mes (año × 12 + mes - 1), NaN si no hay dato
+
+    Como obtener_ripte, busca el mes exacto sin tomar el índice anterior.
+    """
+    if len(series.ripte_valores) == 0:
+        return np.full(len(meses), np.nan)
+    meses_ripte = series.ripte_fechas.astype('datetime64[M]').astype(np.int64) + 1970 * 12
+    idx = np.clip(np.searchsorted(meses_ripte, meses), 0, len(meses_ripte) - 1)
+    return np.where(meses_ripte[idx] == meses, series.ripte_valores[idx], np.nan)
+
+
+def calcular_ibm_nomina(archivo, series: SeriesActualizacion,
+                        tamaño_bloque: int = TAMAÑO_BLOQUE) -> pd.DataFrame:
+    """
+    Calcula el IBM de cada trabajador a partir de una nómina mensual
+
+    Cada salario de los 12 meses anteriores a la PMI se actualiza por la
+    variación RIPTE entre su mes y el mes de la PMI (sin índice publicado
+    para alguno de los dos meses se toma el salario sin actualizar), y el
+    IBM es el promedio de los salarios actualizados.
+
+    Args:
+        archivo: Ruta o archivo abierto (CSV con trabajador, pmi, periodo, salario)
+        series: Series acumuladas (se usa el RIPTE)
+        tamaño_bloque: Filas leídas por bloque
+
+    Returns:
+        DataFrame con una fila por trabajador y PMI: meses, total_original,
+        total_actualizado, dias e ibm
+
+    Raises:
+        ValueError: Si faltan columnas obligatorias
+    """
+    if isinstance(archivo, (str, bytes)) or hasattr(archivo, '__fspath__'):
+        with open(archivo, 'rb') as f:
+            separador = _detectar_separador(f)
+    else:
+        separador = _detectar_separador(archivo)
+
+    parciales = []
+    for bloque in pd.read_csv(archivo, sep=separador, chunksize=tamaño_bloque, dtype=str):
+        parciales.append(_reducir_bloque(bloque))
+        # Se combinan los parciales para que la memoria dependa de los trabajadores, no de las filas
+        if len(parciales) > 8:
+            parciales = [pd.concat(parciales).groupby(['trabajador', 'pmi', 'mes', 'mes_pmi'], as_index=False)['salario'].sum()]
+
+    if not parciales:
+        return pd.DataFrame(columns=['trabajador', 'pmi', 'meses', 'total_original', 'total_actualizado', 'dias', 'ibm'])
+    meses = pd.concat(parciales).groupby(['trabajador', 'pmi', 'mes', 'mes_pmi'], as_index=False)['salario'].sum()
+
+    # Variación RIPTE entre el mes del salario y el mes de la PMI (como calcular_variacion_ripte)
+    ripte_mes = _ripte_del_mes(series, meses['mes'].to_numpy())
+    ripte_pmi = _ripte_del_mes(series, meses['mes_pmi'].to_numpy())
+    with np.errstate(divide='ignore', invalid='ignore'):
+        variacion = (ripte_pmi - ripte_mes) / ripte_mes
+    variacion = np.where(np.isfinite(variacion), variacion, 0.0)
+
+    anio = meses['mes'] // 12
+    mes = meses['mes'] % 12 + 1
+    meses['dias'] = pd.to_datetime(pd.DataFrame({'year': anio, 'month': mes, 'day': 1})).dt.days_in_month
+    meses['salario_act'] = meses['salario'] * (1 + variacion)
+
+    resultado = meses.groupby(['trabajador', 'pmi'], as_index=False).agg(
+        meses=('salario', 'size'),
+        total_original=('salario', 'sum'),
+        total_actualizado=('salario_act', 'sum'),
+        dias=('dias', 'sum'),
+    )
+    resultado['ibm'] = redondear_vector(resultado['total_actualizado'] / resultado['meses'])
+    resultado['pmi'] = resultado['pmi'].dt.strftime('%d/%m/%Y')
+    return resultado
@@ -0,0 +1,603 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sistema de Cálculos y Herramientas - Tribunal de Trabajo 2 de Quilmes
+Módulo: Índices - Series acumuladas de RIPTE, Tasa Activa e IPC
+
+Precalcula sumas y productos acumulados de las series de actualización
+para que cada consulta (desde, hasta) se resuelva con búsquedas binarias
+sobre arreglos, sin recorrer los datasets fila por fila. Todas las
+consultas aceptan fechas sueltas o columnas completas.
+"""
+
+import numpy as np
+import pandas as pd
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Dict
+
+from .data_loader import DataLoader, derivado_dataset, firma_datasets
+from .historial import leer_csv, resolver_version, tiene_historial
+
+# Meses en español (y abreviaturas) usados en dataset_ripte.csv
+MESES_NUMERO = {
+    'ene': 1, 'feb': 2, 'mar': 3, 'abr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'ago': 8, 'sep': 9, 'set': 9, 'oct': 10, 'nov': 11, 'dic': 12
+}
+
+# Caché de series por firma de datasets
+_CACHE_SERIES: Dict[tuple, 'SeriesActualizacion'] = {}
+
+# Caché del resumen de últimos datos por firma de datasets
+_CACHE_ULTIMOS: Dict[tuple, dict] = {}
+
+
+def parsear_fechas(valores) -> pd.Series:
+    """
+    Convierte una columna de fechas en formato ISO o argentino (dd/mm/aaaa)
+
+    Args:
+        valores: Serie, lista o escalar con fechas
+
+    Returns:
+        Serie datetime64 (NaT para los valores no reconocidos)
+    """
+    serie = pd.Series(valores) if not isinstance(valores, pd.Series) else valores
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+    iso = pd.to_datetime(serie, format='ISO8601', errors='coerce')
+    faltantes = iso.isna() & serie.notna()
+    if faltantes.any():
+        iso[faltantes] = pd.to_datetime(
+            serie[faltantes].astype(str).str.strip(),
+            dayfirst=True, format='mixed', errors='coerce'
+        )
+    return iso
+
+
+def _a_dias(fechas) -> np.ndarray:
+    """Convierte fechas (escalares o columnas) a un arreglo datetime64[D]"""
+    if isinstance(fechas, np.ndarray) and fechas.dtype.kind == 'M':
+        return fechas.astype('datetime64[D]')
+    return np.atleast_1d(np.asarray(pd.to_datetime(fechas), dtype='datetime64[D]'))
+
+
+def _columna(df: pd.DataFrame, *candidatos: str) -> Optional[str]:
+    """Devuelve la primera columna existente (sin distinguir mayúsculas)"""
+    columnas = {str(c).strip().lower().replace("\ufeff", ""): c for c in df.columns}
+    for cand in candidatos:
+        if cand in columnas:
+            return columnas[cand]
+    return None
+
+
+class SeriesActualizacion:
+    """Series acumuladas de RIPTE, Tasa Activa e IPC para consultas vectorizadas"""
+
+    def __init__(self, ripte_fechas, ripte_valores, tasa_desde, tasa_hasta,
+                 tasa_valores, ipc_periodos, ipc_variaciones):
+        """
+        Construye los arreglos acumulados
+
+        Args:
+            ripte_fechas: Fechas (primer día del mes) de cada índice RIPTE
+            ripte_valores: Índices RIPTE
+            tasa_desde: Inicio de vigencia de cada tasa
+            tasa_hasta: Fin de vigencia (inclusive) de cada tasa
+            tasa_valores: Tasa activa mensual (%) de cada tramo
+            ipc_periodos: Períodos mensuales del IPC
+            ipc_variaciones: Variación mensual (%) de cada período
+        """
+        # RIPTE: índices ordenados por fecha
+        fechas = _a_dias(ripte_fechas) if len(ripte_fechas) else np.array([], dtype='datetime64[D]')
+        valores = np.asarray(ripte_valores, dtype=float)
+        validos = ~np.isnat(fechas) & ~np.isnan(valores) if len(fechas) else np.array([], dtype=bool)
+        orden = np.argsort(fechas[validos], kind='stable')
+        self.ripte_fechas = fechas[validos][orden]
+        self.ripte_valores = valores[validos][orden]
+
+        # TASA: aporte diario (valor / 30) acumulado sobre una grilla de días
+        desde = _a_dias(tasa_desde) if len(tasa_desde) else np.array([], dtype='datetime64[D]')
+        hasta = _a_dias(tasa_hasta) if len(tasa_hasta) else np.array([], dtype='datetime64[D]')
+        tasas = np.asarray(tasa_valores, dtype=float)
+        validos = (~np.isnat(desde) & ~np.isnat(hasta) & ~np.isnan(tasas) & (desde <= hasta)) if len(desde) else np.array([], dtype=bool)
+        desde, hasta, tasas = desde[validos], hasta[validos], tasas[validos]
+
+        if len(desde):
+            self.tasa_origen = desde.min()
+            self.tasa_fin = hasta.max()
+            n_dias = int((self.tasa_fin - self.tasa_origen).astype(int)) + 1
+            inicio = (desde - self.tasa_origen).astype(int)
+            fin = (hasta - self.tasa_origen).astype(int) + 1
+            diferencias = np.zeros(n_dias + 1)
+            np.add.at(diferencias, inicio, tasas / 30.0)
+            np.add.at(diferencias, fin, -tasas / 30.0)
+            diaria = np.cumsum(diferencias[:-1])
+        else:
+            self.tasa_origen = np.datetime64('1970-01-01')
+            self.tasa_fin = self.tasa_origen
+            diaria = np.zeros(0)
+        # tasa_acumulada_dias[k] = suma de los aportes de los días [origen, origen + k)
+        self.tasa_acumulada_dias = np.concatenate([[0.0], np.cumsum(diaria)])
+        self.tasa_desde = desde
+        self.tasa_hasta = hasta
+        self.tasa_valores = tasas
+
+        # IPC: producto acumulado de (1 + variación / 100) por mes
+        periodos = (np.atleast_1d(np.asarray(pd.to_datetime(ipc_periodos), dtype='datetime64[M]'))
+                    if len(ipc_periodos) else np.array([], dtype='datetime64[M]'))
+        variaciones = np.asarray(ipc_variaciones, dtype=float)
+        validos = ~np.isnat(periodos) if len(periodos) else np.array([], dtype=bool)
+        orden = np.argsort(periodos[validos], kind='stable')
+        self.ipc_periodos = periodos[validos][orden]
+        self.ipc_variaciones = variaciones[validos][orden]
+        factores = 1.0 + np.nan_to_num(self.ipc_variaciones, nan=0.0) / 100.0
+        self.ipc_producto = np.concatenate([[1.0], np.cumprod(factores)])
+
+        # Tablas de coeficientes al último dato (se arman a demanda una sola vez)
+        self._tablas = None
+
+    @classmethod
+    def desde_dataframes(cls, df_ripte: pd.DataFrame, df_tasa: pd.DataFrame,
+                         df_ipc: pd.DataFrame) -> 'SeriesActualizacion':
+        """
+        Construye las series a partir de DataFrames ya cargados
+
+        Acepta tanto los nombres de columnas originales de los CSV como los
+        normalizados por las calculadoras ('ripte', 'tasa', 'ipc', etc.).
+
+        Args:
+            df_ripte: Dataset RIPTE con fecha e índice
+            df_tasa: Dataset de tasa activa con desde, hasta y valor
+            df_ipc: Dataset IPC con período y variación mensual
+
+        Returns:
+            SeriesActualizacion
+        """
+        col_fecha = _columna(df_ripte, 'fecha', 'fecha_combined')
+        col_valor = _columna(df_ripte, 'indice_ripte', 'ripte')
+        if col_fecha is None:
+            fechas_mes = fechas_ripte(df_ripte)
+        else:
+            fechas_mes = df_ripte[col_fecha]
+
+        col_desde = _columna(df_tasa, 'desde', 'fecha')
+        col_hasta = _columna(df_tasa, 'hasta') or col_desde
+        col_tasa = _columna(df_tasa, 'tasa', 'valor', 'porcentaje')
+        tasa_valores = (df_tasa[col_tasa].astype(str).str.replace(',', '.', regex=False)
+                        if col_tasa is not None else pd.Series(dtype=float))
+
+        col_periodo = _columna(df_ipc, 'periodo', 'fecha')
+        col_ipc = _columna(df_ipc, 'variacion_mensual', 'ipc')
+
+        return cls(
+            ripte_fechas=pd.to_datetime(fechas_mes, errors='coerce'),
+            ripte_valores=pd.to_numeric(df_ripte[col_valor], errors='coerce'),
+            tasa_desde=pd.to_datetime(df_tasa[col_desde], errors='coerce') if col_desde else [],
+            tasa_hasta=pd.to_datetime(df_tasa[col_hasta], errors='coerce') if col_hasta else [],
+            tasa_valores=pd.to_numeric(tasa_valores, errors='coerce'),
+            ipc_periodos=pd.to_datetime(df_ipc[col_periodo], errors='coerce'),
+            ipc_variaciones=pd.to_numeric(df_ipc[col_ipc], errors='coerce'),
+        )
+
+    # ------------------------------------------------------------------
+    # RIPTE
+    # ------------------------------------------------------------------
+    def ripte_en(self, fechas, si_no_hay: str = 'primero') -> np.ndarray:
+        """
+        Obtiene el último índice RIPTE publicado a cada fecha
+
+        Args:
+            fechas: Fecha o columna de fechas
+            si_no_hay: Índice a usar si no hay datos previos ('primero' o 'ultimo')
+
+        Returns:
+            Arreglo con los índices RIPTE
+        """
+        dias = _a_dias(fechas)
+        if len(self.ripte_valores) == 0:
+            return np.zeros(len(dias))
+        idx = np.searchsorted(self.ripte_fechas, dias, side='right') - 1
+        defecto = self.ripte_valores[0] if si_no_hay == 'primero' else self.ripte_valores[-1]
+        return np.where(idx >= 0, self.ripte_valores[np.clip(idx, 0, None)], defecto)
+
+    def coeficiente_ripte(self, desde, hasta) -> np.ndarray:
+        """
+        Coeficiente RIPTE final / RIPTE inicial para cada par de fechas
+
+        Args:
+            desde: Fecha(s) inicial(es)
+            hasta: Fecha(s) final(es)
+
+        Returns:
+            Arreglo de coeficientes (1.0 si el índice inicial no es válido)
+        """
+        ripte_inicial = self.ripte_en(desde, 'primero')
+        ripte_final = self.ripte_en(hasta, 'ultimo')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(ripte_inicial > 0, ripte_final / ripte_inicial, 1.0)
+
+    # ------------------------------------------------------------------
+    # TASA ACTIVA
+    # ------------------------------------------------------------------
+    def tasa_acumulada(self, desde, hasta) -> np.ndarray:
+        """
+        Porcentaje de tasa activa acumulado entre dos fechas (ambas inclusive)
+
+        Equivale a sumar valor × días / 30 por cada tramo intersectado.
+
+        Args:
+            desde: Fecha(s) inicial(es)
+            hasta: Fecha(s) final(es)
+
+        Returns:
+            Arreglo con el porcentaje acumulado
+        """
+        d0 = _a_dias(desde)
+        d1 = _a_dias(hasta)
+        n = len(self.tasa_acumulada_dias) - 1
+        i = np.clip((d0 - self.tasa_origen).astype(int), 0, n)
+        j = np.clip((d1 - self.tasa_origen).astype(int) + 1, 0, n)
+        return np.where(d0 <= d1, self.tasa_acumulada_dias[j] - self.tasa_acumulada_dias[np.minimum(i, j)], 0.0)
+
+    def tasa_acumulada_por_tramo(self, desde, hasta) -> np.ndarray:
+        """
+        Porcentaje de tasa activa desde una fecha fija hasta cada fecha final,
+        redondeando a 2 decimales el aporte de cada tramo
+
+        Reproduce el criterio de la Calculadora LRT (suma de valor × días / 30
+        redondeado por tramo). Los tramos completos se acumulan una sola vez y
+        los tramos en curso se expanden por día, por lo que cada fecha final se
+        resuelve con una búsqueda en arreglos.
+
+        Args:
+            desde: Fecha inicial (única)
+            hasta: Fecha(s) final(es)
+
+        Returns:
+            Arreglo con el porcentaje acumulado para cada fecha final
+        """
+        inicio = _a_dias(desde)[0]
+        finales = _a_dias(hasta)
+        if len(finales) == 0 or len(self.tasa_valores) == 0:
+            return np.zeros(len(finales))
+        ultimo = max(finales.max(), inicio)
+        n = int((ultimo - inicio).astype(int)) + 1
+
+        # Intersección de cada tramo con [inicio, ultimo], en días relativos a inicio
+        s0 = (np.maximum(self.tasa_desde, inicio) - inicio).astype(np.int64)
+        s1 = (self.tasa_hasta - inicio).astype(np.int64)
+        validos = (s0 <= s1) & (s0 < n)
+        s0, s1 = s0[validos], s1[validos]
+        tasas = self.tasa_valores[validos]
+        # Tasa en millonésimas: el aporte en centésimos de punto es tasa × días / 300000
+        tasa_micro = np.rint(tasas * 1e6).astype(np.int64)
+
+        def aportes(indices, dias):
+            numerador = tasa_micro[indices] * dias
+            resultado = (2 * numerador + 300000) // 600000
+            # Mitad exacta de centésimo: se respeta el redondeo Decimal del cálculo original
+            for k in np.flatnonzero((2 * numerador) % 600000 == 300000):
+                aporte = Decimal(str(tasas[indices[k]])) * (Decimal(int(dias[k])) / Decimal('30.0'))
+                resultado[k] = int(aporte.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP) * 100)
+            return resultado
+
+        # Tramos completos: suman su aporte total a partir del día en que terminan
+        completos = s1 < n
+        idx_completos = np.flatnonzero(completos)
+        acumulado = np.zeros(n, dtype=np.int64)
+        np.add.at(acumulado, s1[completos], aportes(idx_completos, s1[completos] - s0[completos] + 1))
+        acumulado = np.cumsum(acumulado)
+
+        # Tramos en curso: aporte parcial para cada día anterior a su fin
+        largos = np.minimum(s1 - 1, n - 1) - s0 + 1
+        largos = np.where(largos > 0, largos, 0)
+        idx_tramos = np.repeat(np.arange(len(s0)), largos)
+        desplazamiento = np.arange(len(idx_tramos)) - np.repeat(np.cumsum(largos) - largos, largos)
+        parcial = np.zeros(n, dtype=np.int64)
+        np.add.at(parcial, s0[idx_tramos] + desplazamiento, aportes(idx_tramos, desplazamiento + 1))
+
+        k = (finales - inicio).astype(np.int64)
+        return np.where(k >= 0, (acumulado + parcial)[np.clip(k, 0, n - 1)] / 100.0, 0.0)
+
+    # ------------------------------------------------------------------
+    # IPC
+    # ------------------------------------------------------------------
+    def factor_ipc(self, desde, hasta) -> np.ndarray:
+        """
+        Factor inflacionario acumulado entre el mes inicial y el final (inclusive)
+
+        Args:
+            desde: Fecha(s) inicial(es)
+            hasta: Fecha(s) final(es)
+
+        Returns:
+            Arreglo con el producto de (1 + variación / 100)
+        """
+        m0 = _a_dias(desde).astype('datetime64[M]')
+        m1 = _a_dias(hasta).astype('datetime64[M]')
+        i = np.searchsorted(self.ipc_periodos, m0, side='left')
+        j = np.searchsorted(self.ipc_periodos, m1, side='right')
+        return np.where(i < j, self.ipc_producto[j] / self.ipc_producto[np.minimum(i, j)], 1.0)
+
+    def inflacion_acumulada(self, desde, hasta) -> np.ndarray:
+        """Inflación acumulada (%) entre dos fechas"""
+        return (self.factor_ipc(desde, hasta) - 1.0) * 100.0
+
+
+    # ------------------------------------------------------------------
+    # TABLAS AL ÚLTIMO DATO
+    # ------------------------------------------------------------------
+    def tablas_coeficientes(self) -> Dict[str, pd.DataFrame]:
+        """
+        Tablas de coeficientes desde cada mes (o día) hasta el último dato publicado
+
+        Returns:
+            Diccionario con las tablas 'ripte' (por mes), 'tasa' (por día)
+            e 'ipc' (por mes)
+        """
+        if self._tablas is None:
+            ultimo_ripte = self.ripte_valores[-1] if len(self.ripte_valores) else np.nan
+            n_dias = len(self.tasa_acumulada_dias) - 1
+            total_ipc = self.ipc_producto[-1]
+            self._tablas = {
+                'ripte': pd.DataFrame({
+                    'mes': pd.to_datetime(self.ripte_fechas),
+                    'indice_ripte': self.ripte_valores,
+                    'coeficiente': ultimo_ripte / self.ripte_valores,
+                }),
+                'tasa': pd.DataFrame({
+                    'desde': pd.to_datetime(self.tasa_origen + np.arange(n_dias)),
+                    'tasa_acumulada': self.tasa_acumulada_dias[-1] - self.tasa_acumulada_dias[:-1],
+                }),
+                'ipc': pd.DataFrame({
+                    'mes': pd.to_datetime(self.ipc_periodos),
+                    'factor': total_ipc / self.ipc_producto[:-1],
+                    'inflacion_acumulada': (total_ipc / self.ipc_producto[:-1] - 1.0) * 100.0,
+                }),
+            }
+        return self._tablas
+
+    def datos_hasta(self, fecha) -> bool:
+        """
+        Indica si todos los datos publicados terminan a más tardar en la fecha dada
+
+        Se cumple cuando el último tramo de tasa activa termina y los últimos
+        períodos de RIPTE e IPC comienzan en la fecha o antes. Solo en ese caso
+        los coeficientes al último dato coinciden con los calculados a esa fecha.
+        """
+        dia = _a_dias(fecha)[0]
+        if len(self.tasa_valores) and self.tasa_fin > dia:
+            return False
+        if len(self.ripte_fechas) and self.ripte_fechas[-1] > dia:
+            return False
+        if len(self.ipc_periodos) and self.ipc_periodos[-1] > dia.astype('datetime64[M]'):
+            return False
+        return True
+
+    def coeficientes_al_ultimo_dato(self, desde) -> Dict[str, float]:
+        """
+        Coeficientes desde una fecha hasta el último dato publicado (fecha final = hoy)
+
+        Equivale a coeficiente_ripte, tasa_acumulada y factor_ipc con fecha final
+        posterior a los datos, resuelto con una búsqueda en las tablas precalculadas.
+        Solo es válido como cálculo "a hoy" si datos_hasta(hoy) es verdadero; si
+        algún tramo termina después, se acumula hasta el final de ese tramo.
+
+        Args:
+            desde: Fecha inicial
+
+        Returns:
+            Diccionario con 'coef_ripte', 'tasa_pct', 'factor_ipc' y 'meses_ipc'
+        """
+        tablas = self.tablas_coeficientes()
+        dia = _a_dias(desde)[0]
+
+        # RIPTE: último índice publicado a la fecha inicial (o el primero si no hay)
+        i = max(int(np.searchsorted(self.ripte_fechas, dia, side='right')) - 1, 0)
+        coef_ripte = float(tablas['ripte']['coeficiente'].iat[i]) if len(tablas['ripte']) else 1.0
+
+        # TASA: fila del día inicial (0 si es posterior al último dato)
+        k = int((dia - self.tasa_origen).astype(int))
+        tasa = tablas['tasa']['tasa_acumulada']
+        tasa_pct = float(tasa.iat[max(k, 0)]) if k < len(tasa) else 0.0
+
+        # IPC: primer período desde el mes inicial
+        j = int(np.searchsorted(self.ipc_periodos, dia.astype('datetime64[M]'), side='left'))
+        meses_ipc = len(self.ipc_periodos) - j
+        factor_ipc = float(tablas['ipc']['factor'].iat[j]) if meses_ipc > 0 else 1.0
+
+        return {'coef_ripte': coef_ripte, 'tasa_pct': tasa_pct,
+                'factor_ipc': factor_ipc, 'meses_ipc': meses_ipc}
+
+
+def buscar_cruces(fechas, valores_a, valores_b) -> pd.DataFrame:
+    """
+    Detecta las fechas en que una serie pasa a superar a la otra
+
+    Los empates no se consideran cruce: se mantiene el método que iba
+    adelante hasta que el otro lo supera estrictamente.
+
+    Args:
+        fechas: Fechas ordenadas de cada punto
+        valores_a: Valores del método A en cada fecha
+        valores_b: Valores del método B en cada fecha
+
+    Returns:
+        DataFrame con una fila por cruce: fecha_anterior, a_anterior,
+        b_anterior, fecha_cruce, a_cruce, b_cruce y favorable ('A' o 'B')
+    """
+    fechas = pd.DatetimeIndex(fechas)
+    a = np.asarray(valores_a, dtype=float)
+    b = np.asarray(valores_b, dtype=float)
+    signo = np.sign(a - b)
+
+    # Propaga el último signo no nulo sobre los empates
+    no_nulos = np.where(signo != 0, np.arange(len(signo)), -1)
+    ultimo = np.maximum.accumulate(no_nulos) if len(signo) else no_nulos
+    signo = np.where(ultimo >= 0, signo[np.clip(ultimo, 0, None)], 0)
+
+    cruces = np.flatnonzero((signo[1:] != signo[:-1]) & (signo[:-1] != 0)) + 1
+    previos = cruces - 1
+    return pd.DataFrame({
+        'fecha_anterior': fechas[previos],
+        'a_anterior': a[previos],
+        'b_anterior': b[previos],
+        'fecha_cruce': fechas[cruces],
+        'a_cruce': a[cruces],
+        'b_cruce': b[cruces],
+        'favorable': np.where(signo[cruces] > 0, 'A', 'B'),
+    })
+
+
+def fechas_ripte(df_ripte: pd.DataFrame) -> pd.Series:
+    """
+    Arma la fecha (primer día del mes) a partir de las columnas año y mes
+
+    Acepta nombres de mes con espacios o en cualquier combinación de
+    mayúsculas (" Septiembre", "set") y meses numéricos.
+    """
+    col_anio = _columna(df_ripte, 'año', 'anio')
+    col_mes = _columna(df_ripte, 'mes')
+    mes = df_ripte[col_mes].astype(str).str.strip().str.lower().str[:3].map(MESES_NUMERO)
+    numerico = pd.to_numeric(df_ripte[col_mes], errors='coerce')
+    mes = mes.fillna(numerico)
+    anio = pd.to_numeric(df_ripte[col_anio], errors='coerce')
+    return pd.to_datetime(
+        pd.DataFrame({'year': anio, 'month': mes, 'day': 1}), errors='coerce'
+    )
+
+
+def _leer_series(version: Optional[int] = None) -> SeriesActualizacion:
+    """Lee los CSV de RIPTE, Tasa e IPC (actuales o de una versión) y construye las series"""
+    df_ripte = leer_csv('ripte', version)
+    df_ripte['fecha'] = fechas_ripte(df_ripte)
+
+    df_tasa = leer_csv('tasa', version)
+    col_desde = _columna(df_tasa, 'desde')
+    col_hasta = _columna(df_tasa, 'hasta')
+    df_tasa[col_desde] = parsear_fechas(df_tasa[col_desde])
+    df_tasa[col_hasta] = parsear_fechas(df_tasa[col_hasta])
+
+    df_ipc = leer_csv('ipc', version)
+
+    return SeriesActualizacion.desde_dataframes(df_ripte, df_tasa, df_ipc)
+
+
+@lru_cache(maxsize=8)
+def _series_version(version: int) -> SeriesActualizacion:
+    """
+    Series de una versión del historial (las versiones no cambian)
+
+    Solo para versiones en las que RIPTE, Tasa e IPC se reconstruyen desde
+    el historial; ver cargar_series.
+    """
+    return _leer_series(version)
+
+
+def cargar_series(version: Optional[int] = None, fecha=None) -> SeriesActualizacion:
+    """
+    Carga las series de actualización, reconstruyéndolas solo si cambian los datos
+
+    Args:
+        version: Versión del historial de datasets (None para los datos actuales)
+        fecha: Alternativa a version: datasets vigentes a esa fecha
+
+    Returns:
+        SeriesActualizacion vigente para los archivos actuales de data/ o
+        para los datasets tal como estaban en la versión pedida
+    """
+    numero = resolver_version(version, fecha)
+    if numero is not None:
+        sin_historial = tuple(clave for clave in ('ripte', 'tasa', 'ipc') if not tiene_historial(clave))
+        if sin_historial:
+            # Esos datasets se leen de los archivos actuales: el resultado
+            # vale solo mientras no cambien
+            return derivado_dataset(f"series_version_{numero}", sin_historial, lambda: _leer_series(numero))
+        return _series_version(numero)
+    clave = firma_datasets('ripte', 'tasa', 'ipc')
+    if clave not in _CACHE_SERIES:
+        _CACHE_SERIES.clear()
+        _CACHE_SERIES[clave] = _leer_series()
+    return _CACHE_SERIES[clave]
+
+
+def _ultima_fila(fechas: pd.Series, valores: pd.Series):
+    """Fila con la fecha más reciente entre las que tienen fecha y valor"""
+    validas = fechas.notna() & valores.notna()
+    if not validas.any():
+        return None
+    return fechas[validas].idxmax()
+
+
+def _leer_ultimos_datos(data_dir: Path) -> dict:
+    """Lee el último valor publicado de cada dataset (None si falta o no se puede leer)"""
+    ultimos = {'ripte': None, 'ipc': None, 'tasa': None, 'piso': None}
+
+    try:
+        df = pd.read_csv(data_dir / DataLoader.DATASETS['ripte'])
+        fechas = fechas_ripte(df)
+        valores = pd.to_numeric(df[_columna(df, 'indice_ripte', 'ripte')], errors='coerce')
+        fila = _ultima_fila(fechas, valores)
+        if fila is not None:
+            ultimos['ripte'] = {'fecha': fechas[fila], 'valor': float(valores[fila])}
+    except Exception:
+        pass
+
+    try:
+        df = pd.read_csv(data_dir / DataLoader.DATASETS['ipc'])
+        fechas = parsear_fechas(df[_columna(df, 'periodo', 'fecha')])
+        valores = pd.to_numeric(df[_columna(df, 'variacion_mensual', 'ipc')], errors='coerce')
+        fila = _ultima_fila(fechas, valores)
+        if fila is not None:
+            ultimos['ipc'] = {'fecha': fechas[fila], 'variacion': float(valores[fila])}
+    except Exception:
+        pass
+
+    try:
+        df = pd.read_csv(data_dir / DataLoader.DATASETS['tasa'])
+        desde = parsear_fechas(df[_columna(df, 'desde')])
+        hasta = parsear_fechas(df[_columna(df, 'hasta')])
+        valores = pd.to_numeric(
+            df[_columna(df, 'valor', 'tasa')].astype(str).str.replace(',', '.', regex=False), errors='coerce'
+        )
+        fila = _ultima_fila(desde, valores)
+        if fila is not None:
+            ultimos['tasa'] = {'desde': desde[fila], 'hasta': hasta[fila], 'valor': float(valores[fila])}
+    except Exception:
+        pass
+
+    try:
+        df = pd.read_csv(data_dir / DataLoader.DATASETS['pisos'])
+        desde = parsear_fechas(df[_columna(df, 'fecha_inicio', 'desde')])
+        hasta = parsear_fechas(df[_columna(df, 'fecha_fin', 'hasta')])
+        valores = pd.to_numeric(df[_columna(df, 'monto_minimo', 'piso')], errors='coerce')
+        fila = _ultima_fila(desde, valores)
+        if fila is not None:
+            ultimos['piso'] = {
+                'norma': str(df[_columna(df, 'norma', 'resol')][fila]),
+                'desde': desde[fila],
+                'hasta': hasta[fila],
+                'monto': float(valores[fila]),
+            }
+    except Exception:
+        pass
+
+    return ultimos
+
+
+def ultimos_datos() -> dict:
+    """
+    Resumen de los últimos datos publicados, releído solo si cambian los datasets
+
+    Returns:
+        Dict con 'ripte' (fecha, valor), 'ipc' (fecha, variacion), 'tasa'
+        (desde, hasta, valor) y 'piso' (norma, desde, hasta, monto); cada
+        entrada es None si el dataset falta o no tiene datos válidos
+    """
+    clave = firma_datasets('ripte', 'ipc', 'tasa', 'pisos')
+    if clave not in _CACHE_ULTIMOS:
+        _CACHE_ULTIMOS.clear()
+        _CACHE_ULTIMOS[clave] = _leer_ultimos_datos(DataLoader.DATA_DIR)
+    return _CACHE_ULTIMOS[clave]
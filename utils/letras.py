@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sistema de Cálculos y Herramientas - Tribunal de Trabajo 2 de Quilmes
+Módulo: Letras - Importes en letras ("PESOS ... CON xx/100")
+
+Los textos de los números de 0 a 999 se arman una sola vez en una tabla, de
+modo que cada importe se compone con a lo sumo cuatro búsquedas. Los importes
+ya convertidos se conservan en memoria y las columnas completas se convierten
+resolviendo cada parte entera distinta una sola vez.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+UNIDADES = ['', 'UN', 'DOS', 'TRES', 'CUATRO', 'CINCO', 'SEIS', 'SIETE', 'OCHO', 'NUEVE']
+DECENAS = ['', '', 'VEINTE', 'TREINTA', 'CUARENTA', 'CINCUENTA', 'SESENTA', 'SETENTA', 'OCHENTA', 'NOVENTA']
+ESPECIALES = ['DIEZ', 'ONCE', 'DOCE', 'TRECE', 'CATORCE', 'QUINCE', 'DIECISÉIS', 'DIECISIETE', 'DIECIOCHO', 'DIECINUEVE']
+CENTENAS = ['', 'CIENTO', 'DOSCIENTOS', 'TRESCIENTOS', 'CUATROCIENTOS', 'QUINIENTOS', 'SEISCIENTOS',
+            'SETECIENTOS', 'OCHOCIENTOS', 'NOVECIENTOS']
+
+# Importes completos que se conservan en memoria
+MAXIMO_IMPORTES_CACHE = 4096
+
+
+def _convertir_grupo(n: int) -> str:
+    """Texto de un número de 0 a 999 (usado solo para armar la tabla)"""
+    if n == 0:
+        return ''
+    if n == 100:
+        return 'CIEN'
+    if n < 10:
+        return UNIDADES[n]
+    if n < 20:
+        return ESPECIALES[n - 10]
+    if n < 100:
+        dec, uni = divmod(n, 10)
+        if uni == 0:
+            return DECENAS[dec]
+        return DECENAS[dec] + (' Y ' if dec > 2 else 'I') + UNIDADES[uni]
+    cen, resto = divmod(n, 100)
+    if resto == 0:
+        return CENTENAS[cen]
+    return CENTENAS[cen] + ' ' + _convertir_grupo(resto)
+
+
+GRUPOS = tuple(_convertir_grupo(n) for n in range(1000))
+
+
+def _millones(millones: int) -> str:
+    """Texto de los millones (mismo texto que usaba la calculadora LRT)"""
+    return ('UN' if millones == 1 else GRUPOS[millones]) + ' MILLÓN' + ('ES' if millones > 1 else '')
+
+
+def _resto_millon(resto: int) -> str:
+    """Miles y unidades de un resto menor a un millón, precedidos por un espacio"""
+    texto = ''
+    if resto >= 1000:
+        texto += ' ' + GRUPOS[resto // 1000] + ' MIL'
+        resto %= 1000
+    if resto > 0:
+        texto += ' ' + GRUPOS[resto]
+    return texto
+
+
+@lru_cache(maxsize=MAXIMO_IMPORTES_CACHE)
+def entero_a_letras(entero: int) -> str:
+    """Texto de la parte entera de un importe (hasta 999.999.999.999)"""
+    if entero >= 1_000_000_000:
+        texto = GRUPOS[entero // 1_000_000_000] + ' MIL'
+        resto = entero % 1_000_000_000
+        if resto >= 1_000_000:
+            texto += ' ' + _millones(resto // 1_000_000)
+            resto %= 1_000_000
+        return texto + _resto_millon(resto)
+    if entero >= 1_000_000:
+        return _millones(entero // 1_000_000) + _resto_millon(entero % 1_000_000)
+    if entero >= 1000:
+        resto = entero % 1000
+        return GRUPOS[entero // 1000] + ' MIL' + (' ' + GRUPOS[resto] if resto else '')
+    return GRUPOS[entero]
+
+
+@lru_cache(maxsize=MAXIMO_IMPORTES_CACHE)
+def numero_a_letras(numero) -> str:
+    """Convierte un número a su representación en letras (pesos argentinos)"""
+    if numero == 0:
+        return 'CERO PESOS'
+
+    entero = int(numero)
+    decimal = int(round((numero - entero) * 100))
+    return f'PESOS {entero_a_letras(entero)} CON {decimal:02d}/100'
+
+
+def numeros_a_letras(valores) -> np.ndarray:
+    """
+    Convierte una columna de importes a letras en una sola pasada
+
+    Las partes entera y decimal se separan sobre el arreglo completo y cada
+    parte entera distinta se convierte una sola vez; el resultado es igual a
+    aplicar numero_a_letras a cada valor.
+
+    Args:
+        valores: Arreglo o columna de importes
+
+    Returns:
+        Arreglo de textos, uno por importe (vacío para los valores faltantes)
+    """
+    valores = np.asarray(valores, dtype=float)
+    faltantes = np.isnan(valores)
+    valores = np.where(faltantes, 0.0, valores)
+    enteros = np.trunc(valores).astype(np.int64)
+    decimales = np.round((valores - enteros) * 100).astype(np.int64)
+
+    distintos, posiciones = np.unique(enteros, return_inverse=True)
+    textos = np.array([entero_a_letras(int(e)) for e in distintos], dtype=object)[posiciones.ravel()]
+    centavos = np.char.zfill(decimales.astype(str), 2).astype(object)
+
+    resultado = 'PESOS ' + textos + ' CON ' + centavos + '/100'
+    resultado[valores == 0] = 'CERO PESOS'
+    resultado[faltantes] = ''
+    return resultado
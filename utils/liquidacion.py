@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sistema de Cálculos y Herramientas - Tribunal de Trabajo 2 de Quilmes
+Módulo: Liquidación - Cálculo vectorizado de indemnizaciones por despido
+
+Replica los conceptos de la Calculadora de Despidos (LCT 20.744) operando
+sobre columnas completas, para liquidar carteras de trabajadores en una
+sola pasada junto con las actualizaciones RIPTE + 3%, Tasa Activa e IPC.
+"""
+
+import unicodedata
+import numpy as np
+import pandas as pd
+
+from .indices import SeriesActualizacion, parsear_fechas
+
+# Columnas esperadas en el archivo de liquidación masiva
+COLUMNAS_LOTE = ['ingreso', 'despido', 'liquidacion', 'salario', 'preaviso']
+
+# Valores que indican que el preaviso fue pagado
+VALORES_VERDADEROS = {'si', 'sí', 's', 'true', 'verdadero', '1', 'x', 'pagado', 'se pagó', 'se pago'}
+
+
+def redondear_vector(valores) -> np.ndarray:
+    """
+    Redondea a 2 decimales (mitad hacia arriba) un arreglo de importes
+
+    Args:
+        valores: Arreglo o columna de importes
+
+    Returns:
+        Arreglo redondeado según criterio contable/judicial
+    """
+    centavos = np.round(np.asarray(valores, dtype=float) * 100, 4)
+    return np.sign(centavos) * np.floor(np.abs(centavos) + 0.5) / 100
+
+
+def redondear_fraccion(numerador, denominador) -> np.ndarray:
+    """Redondea numerador / denominador (enteros no negativos) a la unidad, mitad hacia arriba"""
+    numerador = np.asarray(numerador, dtype=np.int64)
+    denominador = np.asarray(denominador, dtype=np.int64)
+    return (2 * numerador + denominador) // (2 * denominador)
+
+
+def calcular_antiguedad_vector(fecha_ingreso, fecha_despido):
+    """
+    Calcula años y meses de antigüedad para columnas de fechas
+
+    Misma regla que calcular_antiguedad: la fracción mayor a 3 meses
+    se computa como un año completo adicional.
+
+    Args:
+        fecha_ingreso: Columna de fechas de ingreso
+        fecha_despido: Columna de fechas de despido
+
+    Returns:
+        Tupla (años, meses) de arreglos enteros
+    """
+    ingreso = pd.DatetimeIndex(fecha_ingreso)
+    despido = pd.DatetimeIndex(fecha_despido)
+
+    años = np.asarray(despido.year - ingreso.year)
+    meses = np.asarray(despido.month - ingreso.month)
+    dias = np.asarray(despido.day - ingreso.day)
+
+    meses = meses - (dias < 0)
+    años = años - (meses < 0)
+    meses = np.where(meses < 0, meses + 12, meses)
+
+    fraccion = meses > 3
+    años = np.where(fraccion, años + 1, años)
+    meses = np.where(fraccion, 0, meses)
+
+    return años, meses
+
+
+def calcular_dias_vacaciones_vector(años_antiguedad) -> np.ndarray:
+    """Días de vacaciones según LCT 20744 para un arreglo de antigüedades"""
+    años = np.asarray(años_antiguedad)
+    return np.select([años < 5, años < 10, años < 20], [14, 21, 28], default=35)
+
+
+def _normalizar_columna(nombre) -> str:
+    """Normaliza el nombre de una columna (minúsculas, sin acentos ni espacios)"""
+    texto = unicodedata.normalize('NFKD', str(nombre)).encode('ascii', 'ignore').decode()
+    return texto.strip().lower().replace(' ', '_')
+
+
+def _parsear_preaviso(valores: pd.Series) -> np.ndarray:
+    """Interpreta la columna preaviso (True si se pagó)"""
+    if pd.api.types.is_bool_dtype(valores):
+        return valores.to_numpy()
+    texto = valores.fillna('').astype(str).str.strip().str.lower()
+    return texto.isin(VALORES_VERDADEROS).to_numpy()
+
+
+def liquidar_despidos(fecha_ingreso, fecha_despido, fecha_liquidacion, salario,
+                      se_pago_preaviso, series: SeriesActualizacion) -> pd.DataFrame:
+    """
+    Liquida los conceptos del despido y sus actualizaciones sobre columnas
+
+    Args:
+        fecha_ingreso: Columna de fechas de ingreso
+        fecha_despido: Columna de fechas de despido
+        fecha_liquidacion: Columna de fechas de liquidación
+        salario: Columna de salarios mensuales brutos
+        se_pago_preaviso: Columna booleana (True si se pagó preaviso)
+        series: Series acumuladas de RIPTE, Tasa e IPC
+
+    Returns:
+        DataFrame con un concepto por columna y una fila por liquidación
+    """
+    ingreso = pd.DatetimeIndex(fecha_ingreso)
+    despido = pd.DatetimeIndex(fecha_despido)
+    liquidacion = pd.DatetimeIndex(fecha_liquidacion)
+    salario = np.asarray(salario, dtype=float)
+    se_pago_preaviso = np.asarray(se_pago_preaviso, dtype=bool)
+
+    # Antigüedad
+    años, meses = calcular_antiguedad_vector(ingreso, despido)
+
+    # Los conceptos se calculan en centavos como fracciones exactas
+    # (numerador / denominador) para redondear igual que con Decimal
+    centavos = np.round(salario * 100).astype(np.int64)
+
+    # 1. Antigüedad Art. 245
+    antiguedad_245 = (centavos * años, 1)
+
+    # 2. Sustitutiva de preaviso
+    salarios_preaviso = np.where(años < 5, 1, 2)
+    sustitutiva = np.where(se_pago_preaviso, 0, centavos * salarios_preaviso)
+    sustitutiva_preaviso = (sustitutiva, 1)
+    sac_preaviso = (sustitutiva, 12)
+
+    # 3. Días trabajados del mes
+    dias_mes = np.asarray(despido.days_in_month)
+    dias_trabajados_mes = np.asarray(despido.day)
+    dias_trabajados = (centavos * dias_trabajados_mes, dias_mes)
+
+    # 4. Integración mes de despido
+    dias_integracion = dias_mes - dias_trabajados_mes
+    integracion_mes = (centavos * dias_integracion, dias_mes)
+    sac_integracion = (centavos * dias_integracion, dias_mes * 12)
+
+    # 5. SAC proporcional
+    primer_semestre = np.asarray(despido.month) <= 6
+    inicio_semestre = pd.to_datetime(pd.DataFrame({
+        'year': despido.year,
+        'month': np.where(primer_semestre, 1, 7),
+        'day': 1
+    }))
+    dias_desde_sac = np.asarray((despido - pd.DatetimeIndex(inicio_semestre)).days)
+    sac_proporcional = (centavos * dias_desde_sac, 365)
+
+    # 6. Vacaciones no gozadas
+    dias_vacaciones = calcular_dias_vacaciones_vector(años)
+    vacaciones = (centavos * dias_vacaciones, 25)
+    sac_vacaciones = (centavos * dias_vacaciones, 25 * 12)
+
+    fracciones = {
+        'antiguedad_245': antiguedad_245,
+        'sustitutiva_preaviso': sustitutiva_preaviso,
+        'sac_preaviso': sac_preaviso,
+        'dias_trabajados': dias_trabajados,
+        'integracion_mes': integracion_mes,
+        'sac_integracion': sac_integracion,
+        'sac_proporcional': sac_proporcional,
+        'vacaciones': vacaciones,
+        'sac_vacaciones': sac_vacaciones,
+    }
+    # Total - redondear cada concepto a 2 decimales
+    conceptos_centavos = {k: redondear_fraccion(*v) for k, v in fracciones.items()}
+    total = sum(conceptos_centavos.values()) / 100
+    conceptos = {k: v / 100 for k, v in conceptos_centavos.items()}
+
+    # Actualizaciones desde el despido hasta la liquidación
+    actualizado_ripte = total * series.coeficiente_ripte(despido, liquidacion) * 1.03
+    actualizado_tasa = total * (1.0 + series.tasa_acumulada(despido, liquidacion) / 100.0)
+    ipc_acumulado = series.inflacion_acumulada(despido, liquidacion)
+
+    resultado = pd.DataFrame({
+        'años': años,
+        'meses': meses,
+        'salarios_preaviso': salarios_preaviso,
+        'dias_trabajados_mes': dias_trabajados_mes,
+        'dias_integracion': dias_integracion,
+        'dias_desde_sac': dias_desde_sac,
+        'dias_vacaciones': dias_vacaciones,
+        **conceptos,
+        'total': total,
+        'actualizado_ripte': actualizado_ripte,
+        'actualizado_tasa': actualizado_tasa,
+        'ipc_acumulado': ipc_acumulado,
+    })
+    return resultado
+
+
+def liquidar_lote(df: pd.DataFrame, series: SeriesActualizacion) -> pd.DataFrame:
+    """
+    Liquida un lote de trabajadores leído de un CSV
+
+    El archivo debe tener las columnas ingreso, despido, liquidacion, salario
+    y preaviso (sí/no: si se pagó el preaviso). Las filas con datos inválidos
+    se devuelven con la columna 'observaciones' completa y sin importes.
+
+    Args:
+        df: DataFrame con una fila por trabajador
+        series: Series acumuladas de RIPTE, Tasa e IPC
+
+    Returns:
+        DataFrame con los datos de entrada, cada concepto y las actualizaciones
+
+    Raises:
+        ValueError: Si faltan columnas obligatorias
+    """
+    entrada = df.copy()
+    entrada.columns = [_normalizar_columna(c) for c in entrada.columns]
+    faltantes = [c for c in COLUMNAS_LOTE if c not in entrada.columns]
+    if faltantes:
+        raise ValueError(
+            f"Faltan columnas en el archivo: {faltantes}. "
+            f"Columnas requeridas: {COLUMNAS_LOTE}"
+        )
+
+    ingreso = parsear_fechas(entrada['ingreso'])
+    despido = parsear_fechas(entrada['despido'])
+    liquidacion = parsear_fechas(entrada['liquidacion'])
+    salario = pd.to_numeric(
+        entrada['salario'].astype(str).str.replace('$', '', regex=False).str.strip(),
+        errors='coerce'
+    )
+    preaviso = _parsear_preaviso(entrada['preaviso'])
+
+    observaciones = pd.Series('', index=entrada.index)
+    observaciones[ingreso.isna() | despido.isna() | liquidacion.isna()] = 'Fecha inválida'
+    observaciones[(observaciones == '') & (despido < ingreso)] = 'Despido anterior al ingreso'
+    observaciones[(observaciones == '') & (liquidacion < despido)] = 'Liquidación anterior al despido'
+    observaciones[(observaciones == '') & ~(salario >= 0)] = 'Salario inválido'
+    validas = (observaciones == '').to_numpy()
+
+    calculado = liquidar_despidos(
+        ingreso[validas], despido[validas], liquidacion[validas],
+        salario[validas], preaviso[validas], series
+    )
+    calculado.index = entrada.index[validas]
+
+    resultado = pd.DataFrame({
+        'ingreso': ingreso.dt.strftime('%d/%m/%Y'),
+        'despido': despido.dt.strftime('%d/%m/%Y'),
+        'liquidacion': liquidacion.dt.strftime('%d/%m/%Y'),
+        'salario': salario,
+        'preaviso': np.where(preaviso, 'Se pagó', 'Sin preaviso'),
+    }, index=entrada.index)
+    resultado = resultado.join(calculado)
+    resultado['observaciones'] = observaciones
+    return resultado
+
+
+def fechas_periodicas(desde, hasta, frecuencia: str) -> pd.DatetimeIndex:
+    """
+    Fechas entre desde y hasta (inclusive), día por día o mes a mes
+
+    Los meses se cuentan siempre desde la fecha inicial (desde + k meses) para
+    que el día no se corra: desde el 31/01 se obtiene 29/02, 31/03, 30/04...
+    y no 29/02, 29/03, 29/04...
+
+    Args:
+        desde: Primera fecha
+        hasta: Última fecha
+        frecuencia: 'diaria' o 'mensual'
+    """
+    inicio, fin = pd.Timestamp(desde), pd.Timestamp(hasta)
+    if frecuencia == 'diaria':
+        return pd.date_range(inicio, fin, freq='D')
+    meses = max((fin.year - inicio.year) * 12 + fin.month - inicio.month, -1) + 1
+    fechas = pd.DatetimeIndex([inicio + pd.DateOffset(months=k) for k in range(meses)])
+    return fechas[fechas <= fin]
+
+
+def barrido_fechas(fecha_ingreso, fecha_despido, fecha_liquidacion, salario,
+                   se_pago_preaviso: bool, variable: str, desde, hasta,
+                   frecuencia: str, series: SeriesActualizacion) -> pd.DataFrame:
+    """
+    Liquida un mismo trabajador variando la fecha de despido o de liquidación
+
+    Args:
+        fecha_ingreso: Fecha de ingreso (fija)
+        fecha_despido: Fecha de despido (fija si variable == 'liquidacion')
+        fecha_liquidacion: Fecha de liquidación (fija si variable == 'despido')
+        salario: Salario mensual bruto
+        se_pago_preaviso: True si se pagó el preaviso
+        variable: Fecha a variar ('despido' o 'liquidacion')
+        desde: Primera fecha del barrido
+        hasta: Última fecha del barrido
+        frecuencia: 'diaria' o 'mensual'
+        series: Series acumuladas de RIPTE, Tasa e IPC
+
+    Returns:
+        DataFrame con una fila por fecha (columna 'fecha') y la liquidación completa
+
+    Raises:
+        ValueError: Si la variable o la frecuencia no son válidas
+    """
+    if variable not in ('despido', 'liquidacion'):
+        raise ValueError(f"Variable '{variable}' no reconocida. Opciones válidas: ['despido', 'liquidacion']")
+    if frecuencia not in ('diaria', 'mensual'):
+        raise ValueError(f"Frecuencia '{frecuencia}' no reconocida. Opciones válidas: ['diaria', 'mensual']")
+
+    fechas = fechas_periodicas(desde, hasta, frecuencia)
+
+    ingreso = pd.Timestamp(fecha_ingreso)
+    if variable == 'despido':
+        despido = fechas
+        liquidacion = pd.DatetimeIndex([pd.Timestamp(fecha_liquidacion)] * len(fechas))
+        validas = (despido >= ingreso) & (despido <= liquidacion)
+    else:
+        despido = pd.DatetimeIndex([pd.Timestamp(fecha_despido)] * len(fechas))
+        liquidacion = fechas
+        validas = (despido >= ingreso) & (liquidacion >= despido)
+
+    fechas = fechas[validas]
+    n = len(fechas)
+    resultado = liquidar_despidos(
+        pd.DatetimeIndex([ingreso] * n), despido[validas], liquidacion[validas],
+        np.full(n, float(salario)), np.full(n, bool(se_pago_preaviso)), series
+    )
+    resultado.insert(0, 'fecha', fechas)
+    return resultado
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sistema de Cálculos y Herramientas - Tribunal de Trabajo 2 de Quilmes
+Módulo: Plantillas - Textos y documentos de las calculadoras
+
+Las plantillas usan la sintaxis de str.format ({campo}, {campo:formato}) con
+dos conversiones propias: !m (moneda argentina) y !p (porcentaje con coma).
+Cada plantilla se analiza una sola vez por proceso y el resultado de
+renderizarla se conserva por el hash de los valores, de modo que el mismo
+documento no se vuelve a armar en cada ejecución ni en cada fila de un lote.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from string import Formatter
+
+from .formato import formato_moneda, formato_porcentaje
+
+# Documentos renderizados que se conservan en memoria
+MAXIMO_RENDER_CACHE = 256
+
+_CACHE_RENDER = OrderedDict()
+_LOCK_RENDER = threading.Lock()
+
+
+def clave_reporte(*partes) -> str:
+    """Hash estable de los datos de un documento (dicts, listas, números y textos)"""
+    contenido = json.dumps(partes, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+
+class Plantilla:
+    """Texto con campos {campo[!conversión][:formato]}, analizado una sola vez"""
+
+    CONVERSIONES = {
+        'm': formato_moneda,
+        'p': formato_porcentaje,
+        's': str,
+        'r': repr,
+    }
+
+    def __init__(self, texto: str):
+        self.texto = texto
+        self.segmentos = list(Formatter().parse(texto))
+        self.campos = {campo for _, campo, _, _ in self.segmentos if campo}
+
+    def renderizar(self, valores: dict) -> str:
+        """Completa la plantilla con los valores (KeyError si falta un campo)"""
+        partes = []
+        for literal, campo, formato, conversion in self.segmentos:
+            partes.append(literal)
+            if campo is None:
+                continue
+            valor = valores[campo]
+            if conversion:
+                valor = self.CONVERSIONES[conversion](valor)
+            partes.append(format(valor, formato or ''))
+        return ''.join(partes)
+
+
+def compilar(estructura):
+    """
+    Compila una estructura de plantillas (textos, listas y dicts anidados)
+
+    Los dicts con la clave 'si' se conservan solo cuando el campo indicado
+    es verdadero; 'fila' reemplaza al dict por su contenido.
+    """
+    if isinstance(estructura, str):
+        return Plantilla(estructura)
+    if isinstance(estructura, (list, tuple)):
+        return [compilar(e) for e in estructura]
+    if isinstance(estructura, dict):
+        return {k: (v if k in ('si', 'destacadas') else compilar(v)) for k, v in estructura.items()}
+    return estructura
+
+
+def _completar(compilada, valores: dict):
+    """Renderiza una estructura compilada, descartando los elementos condicionales falsos"""
+    if isinstance(compilada, Plantilla):
+        return compilada.renderizar(valores)
+    if isinstance(compilada, list):
+        completa = []
+        for elemento in compilada:
+            if isinstance(elemento, dict) and 'si' in elemento and not valores.get(elemento['si']):
+                continue
+            completa.append(_completar(elemento, valores))
+        return completa
+    if isinstance(compilada, dict):
+        if 'fila' in compilada:
+            return _completar(compilada['fila'], valores)
+        return {k: _completar(v, valores) for k, v in compilada.items() if k != 'si'}
+    return compilada
+
+
+# ============================================
+# PLANTILLAS
+# ============================================
+
+PLANTILLAS = {
+    'lrt_piso_aplicado': (
+        "El monto es inferior al piso mínimo determinado por la {piso_norma}, que multiplicado por el "
+        "porcentaje de incapacidad ({incapacidad_pct}%) alcanza la suma de {piso_proporcional!m}, "
+        "por lo que se aplica este último."
+    ),
+    'lrt_piso_superado': (
+        "Dicho monto supera el piso mínimo determinado por la {piso_norma}, que multiplicado por el "
+        "porcentaje de incapacidad ({incapacidad_pct}%) alcanza la suma de {piso_proporcional!m}."
+    ),
+    'lrt_sentencia': """a) Fórmula:
+Valor de IBM ({ibm!m}) x 53 x 65/edad({edad}) x Incapacidad ({incapacidad_pct}%)
+Capital calculado: {capital_formula!m}
+{texto_piso}
+
+b) {texto_20_pct}
+
+Total: {capital_base!m}
+SON {capital_letras}
+
+c) Mientras la tasa legal aplicable (Tasa Activa Banco Nación) alcanzó para el período comprometido ({mes_pmi} {anio_pmi} a la fecha) un total del {tasa_activa_pct!p}, la inflación del mismo período alcanzó la suma de {inflacion_acum_pct!p}.""",
+    # Las líneas conservan el espacio final del texto original de la liquidación
+    'lrt_liquidacion': (
+        "Quilmes, en la fecha en que se suscribe con firma digital (Ac. SCBA. 3975/20). \n"
+        "**LIQUIDACION** que practica la Actuaria en el presente expediente. ** **\n"
+        "\n"
+        "--Capital {capital_base!m} \n"
+        "--Actualización mediante {metodo_usado}, ({mes_ultimo_ripte}/{anio_ultimo_ripte} {ripte_final:,.2f} "
+        "-último índice publicado- / {mes_pmi} {anio_pmi} {ripte_pmi:,.2f} = coef {ripte_coef:.2f} = "
+        "{pct_ripte:.0f}%) {ripte_actualizado!m} \n"
+        "--Interés puro del 3% anual desde {pmi_date:%d/%m/%Y} hasta {final_date:%d/%m/%Y} {interes_puro_3_pct!m} \n"
+        "--SUBTOTAL {total_actualizacion!m} \n"
+        "\n"
+        "*Tasa de Justicia (2,2%) {tasa_justicia!m} *\n"
+        "Sobretasa Contribución Caja de Abogados (10% de Tasa) {sobretasa_caja!m} \n"
+        "\n"
+        "**TOTAL** **{total_final!m}** \n"
+        "\n"
+        "Importa la presente liquidación la suma de {monto_letras}- \n"
+        "\n"
+        "De la liquidación practicada, traslado a las partes por el plazo de cinco (5) días, bajo "
+        "apercibimiento de tenerla por consentida (art 59 de la Ley 15.057 - RC 1840/24 SCBA ) Notifíquese.-"
+    ),
+    'lrt_informe': {
+        'encabezado': ["JUDICIAL", "{juzgado}"],
+        'caratula': [
+            ["Expediente", "{expediente}"],
+            ["Actor/a", "{actor}"],
+            {'si': 'demandado', 'fila': ["Demandado/a", "{demandado}"]},
+            ["Fecha", "{fecha_informe:%d/%m/%Y}"],
+        ],
+        'titulo': "CÁLCULO DE INDEMNIZACIÓN - LEY 24.557",
+        'secciones': [
+            {
+                'titulo': "DATOS DEL CASO",
+                'encabezados': ["Concepto", "Valor"],
+                'tabla': [
+                    ["Fecha del Siniestro (PMI)", "{pmi_date:%d/%m/%Y}"],
+                    ["Fecha de Cálculo", "{final_date:%d/%m/%Y}"],
+                    ["Ingreso Base Mensual (IBM)", "{ibm!m}"],
+                    ["Edad del Trabajador", "{edad} años"],
+                    ["Porcentaje de Incapacidad", "{incapacidad_pct}%"],
+                    ["20% Art. 3 Ley 26.773", "{texto_incluye_20}"],
+                ],
+            },
+            {
+                'titulo': "RESULTADOS DEL CÁLCULO",
+                'encabezados': ["Concepto", "Monto"],
+                'tabla': [
+                    ["Capital Base (Fórmula)", "{capital_formula!m}"],
+                    ["{piso_info}", "{texto_piso_monto}"],
+                    ["20% Art. 3 Ley 26.773", "{texto_adicional_20}"],
+                    ["CAPITAL BASE TOTAL", "{capital_base!m}"],
+                    ["Actualización RIPTE + 3%", "{total_ripte_3!m}"],
+                    ["Actualización Tasa Activa BNA", "{total_tasa_activa!m}"],
+                    ["Método más favorable: {metodo_favorable}", "{monto_favorable!m}"],
+                ],
+                'destacadas': [3, 6],
+            },
+            {
+                'titulo': "DETALLE ACTUALIZACIÓN RIPTE",
+                'lineas': [
+                    ["RIPTE {mes_pmi}/{anio_pmi}:", "{ripte_pmi:,.2f}"],
+                    ["RIPTE - ultimo indice al mes de {mes_final}/{anio_final}:", "{ripte_final:,.2f}"],
+                    ["Coeficiente:", "{ripte_coef:.2f} ({pct_ripte:.0f}%)"],
+                    ["Capital actualizado RIPTE:", "{ripte_actualizado!m}"],
+                    ["Interés puro 3% anual:", "{interes_puro_3_pct!m}"],
+                ],
+                'total': "TOTAL RIPTE + 3%: {total_ripte_3!m}",
+            },
+            {
+                'titulo': "DETALLE ACTUALIZACIÓN TASA ACTIVA",
+                'lineas': [["Tasa Activa BNA acumulada:", "{tasa_activa_pct!p}"]],
+                'total': "TOTAL TASA ACTIVA: {total_tasa_activa!m}",
+            },
+            {
+                'titulo': "INFLACIÓN (REFERENCIA)",
+                'lineas': [["Inflación acumulada del período (IPC):", "{inflacion_acum_pct!p}"]],
+            },
+            {
+                'titulo': "FÓRMULA APLICADA",
+                'lineas': [
+                    "IBM ({ibm!m}) × 53 × 65/edad({edad}) × Incapacidad ({incapacidad_pct}%)",
+                    ["Capital calculado:", "{capital_formula!m}"],
+                    "{piso_info}",
+                ],
+            },
+            {
+                'titulo': "LIQUIDACIÓN JUDICIAL",
+                'tabla': [
+                    ["Capital actualizado ({metodo_favorable})", "{monto_favorable!m}"],
+                    ["Tasa de Justicia (2,2%)", "{tasa_justicia!m}"],
+                    ["Sobretasa Contribución Caja de Abogados (10%)", "{sobretasa_caja!m}"],
+                    ["TOTAL FINAL", "{total_final!m}"],
+                ],
+                'destacadas': [3],
+                'nota': "{monto_letras}",
+            },
+        ],
+        'pie': [
+            "Documento generado por Calculadora Indemnizaciones LRT",
+            "{juzgado}",
+            "Fecha de generación: {fecha_generacion:%d/%m/%Y}",
+        ],
+    },
+    'despidos_pdf': {
+        'expediente': [
+            {'si': 'nro_expediente', 'fila': "<b>Expediente Nro:</b> {nro_expediente}"},
+            {'si': 'caratula', 'fila': "<b>Carátula:</b> {caratula}"},
+        ],
+        'trabajador': [
+            ["Fecha de Ingreso:", "{fecha_ingreso}"],
+            ["Fecha de Despido:", "{fecha_despido}"],
+            ["Antigüedad:", "{años} años"],
+            ["Salario Mensual Bruto:", "{salario!m}"],
+            ["Preaviso:", "{preaviso}"],
+        ],
+        'conceptos': [
+            ["Concepto", "Importe"],
+            ["Antigüedad Art. 245", "{antiguedad_245!m}"],
+            {'si': 'sustitutiva_preaviso', 'fila': ["Sustitutiva de Preaviso", "{sustitutiva_preaviso!m}"]},
+            {'si': 'sustitutiva_preaviso', 'fila': ["SAC Preaviso", "{sac_preaviso!m}"]},
+            ["Días trabajados del Mes", "{dias_trabajados!m}"],
+            ["Integración mes de Despido", "{integracion_mes!m}"],
+            ["SAC Integración mes", "{sac_integracion!m}"],
+            ["SAC Proporcional", "{sac_proporcional!m}"],
+            ["Vacaciones no Gozadas", "{vacaciones!m}"],
+            ["SAC Vacaciones", "{sac_vacaciones!m}"],
+            {'si': 'otros_conceptos', 'fila': ["Otros Conceptos", "{otros_conceptos!m}"]},
+        ],
+        'total': [["INDEMNIZACIÓN TOTAL", "{total_final!m}"]],
+        'actualizacion': [
+            ["Método", "Monto Actualizado"],
+            ["Actualización RIPTE + 3%", "{ripte!m}"],
+            ["Actualización Tasa Activa", "{tasa!m}"],
+        ],
+    },
+}
+
+
+@lru_cache(maxsize=None)
+def plantilla(nombre: str):
+    """Plantilla compilada por nombre (se analiza una sola vez por proceso)"""
+    return compilar(PLANTILLAS[nombre])
+
+
+def renderizar(nombre: str, valores: dict):
+    """
+    Renderiza una plantilla registrada, reutilizando el resultado para los mismos valores
+
+    Args:
+        nombre: Clave en PLANTILLAS
+        valores: Valores de los campos (Results, datos_calculo, carátula, etc.)
+
+    Returns:
+        Texto, o estructura de textos para las plantillas de documentos
+    """
+    clave = (nombre, clave_reporte(valores))
+    with _LOCK_RENDER:
+        if clave in _CACHE_RENDER:
+            _CACHE_RENDER.move_to_end(clave)
+            return _CACHE_RENDER[clave]
+
+    resultado = _completar(plantilla(nombre), valores)
+
+    with _LOCK_RENDER:
+        _CACHE_RENDER[clave] = resultado
+        while len(_CACHE_RENDER) > MAXIMO_RENDER_CACHE:
+            _CACHE_RENDER.popitem(last=False)
+    return resultado
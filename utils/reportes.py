@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sistema de Cálculos y Herramientas - Tribunal de Trabajo 2 de Quilmes
+Módulo: Reportes - Generación de PDF de las calculadoras
+
+Los estilos de reportlab se construyen una vez por proceso y los PDF ya
+generados se conservan por el hash de sus datos, de modo que volver a
+descargar el mismo resultado no reconstruye el documento. Los lotes de
+documentos se generan en procesos separados y se escriben en un ZIP a
+medida que cada PDF está listo.
+"""
+
+import os
+import tempfile
+import threading
+import zipfile
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from functools import lru_cache
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, KeepTogether
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.lib.enums import TA_CENTER
+
+from .plantillas import clave_reporte, renderizar
+
+# PDF generados que se conservan en memoria
+MAXIMO_PDF_CACHE = 32
+
+_CACHE_PDF = OrderedDict()
+_LOCK_PDF = threading.Lock()
+
+
+def pdf_cacheado(clave: str, generar) -> bytes:
+    """
+    Devuelve el PDF guardado para la clave o lo genera con generar()
+
+    Args:
+        clave: Hash de los datos del reporte (ver clave_reporte)
+        generar: Función sin argumentos que devuelve los bytes del PDF
+
+    Returns:
+        Bytes del PDF
+    """
+    with _LOCK_PDF:
+        if clave in _CACHE_PDF:
+            _CACHE_PDF.move_to_end(clave)
+            return _CACHE_PDF[clave]
+
+    contenido = generar()
+
+    with _LOCK_PDF:
+        _CACHE_PDF[clave] = contenido
+        while len(_CACHE_PDF) > MAXIMO_PDF_CACHE:
+            _CACHE_PDF.popitem(last=False)
+    return contenido
+
+
+@lru_cache(maxsize=1)
+def estilos_despidos() -> dict:
+    """Estilos de párrafo y de tabla del PDF de despidos (uno por proceso)"""
+    styles = getSampleStyleSheet()
+
+    tabla_base = [
+        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ]
+
+    return {
+        'titulo': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=16,
+            textColor=colors.HexColor('#2E86AB'),
+            spaceAfter=30,
+            alignment=TA_CENTER
+        ),
+        'expediente': ParagraphStyle(
+            'Expediente',
+            parent=styles['Normal'],
+            fontSize=11,
+            textColor=colors.HexColor('#666666'),
+            spaceAfter=10,
+            alignment=TA_CENTER
+        ),
+        'seccion': styles['Heading2'],
+        'nota': ParagraphStyle(
+            'Note',
+            parent=styles['Normal'],
+            fontSize=8,
+            textColor=colors.grey,
+            alignment=TA_CENTER
+        ),
+        'tabla_trabajador': TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#E8F5E8')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ]),
+        'tabla_conceptos': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ] + tabla_base),
+        'tabla_total': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#F18F01')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.whitesmoke),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ]),
+        'tabla_actualizacion': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#28a745')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ] + tabla_base),
+    }
+
+
+def generar_pdf_despidos(datos_calculo: dict, datos_actualizacion: dict) -> bytes:
+    """
+    Genera el PDF de la liquidación por despido
+
+    Args:
+        datos_calculo: Conceptos de la liquidación (incluye expediente y carátula)
+        datos_actualizacion: Montos actualizados por RIPTE y Tasa Activa
+
+    Returns:
+        Bytes del PDF
+    """
+    estilos = estilos_despidos()
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=2*cm, leftMargin=2*cm,
+                            topMargin=2*cm, bottomMargin=2*cm)
+
+    # Total - usar total_final si existe, sino usar total
+    textos = renderizar('despidos_pdf', {
+        **datos_calculo,
+        'total_final': datos_calculo.get('total_final', datos_calculo['total']),
+        'ripte': datos_actualizacion['ripte'],
+        'tasa': datos_actualizacion['tasa'],
+    })
+
+    elements = [Paragraph("LIQUIDACIÓN DE INDEMNIZACIÓN POR DESPIDO", estilos['titulo'])]
+
+    # Expediente y carátula si están disponibles
+    for linea in textos['expediente']:
+        elements.append(Paragraph(linea, estilos['expediente']))
+
+    elements.append(Spacer(1, 0.5*cm))
+
+    # Datos del trabajador
+    t1 = Table(textos['trabajador'], colWidths=[6*cm, 8*cm])
+    t1.setStyle(estilos['tabla_trabajador'])
+    elements.append(t1)
+    elements.append(Spacer(1, 0.7*cm))
+
+    # Conceptos
+    elements.append(Paragraph("DETALLE DE CONCEPTOS", estilos['seccion']))
+    elements.append(Spacer(1, 0.3*cm))
+
+    t2 = Table(textos['conceptos'], colWidths=[10*cm, 4*cm])
+    t2.setStyle(estilos['tabla_conceptos'])
+    elements.append(t2)
+    elements.append(Spacer(1, 0.5*cm))
+
+    t3 = Table(textos['total'], colWidths=[10*cm, 4*cm])
+    t3.setStyle(estilos['tabla_total'])
+    elements.append(t3)
+    elements.append(Spacer(1, 0.7*cm))
+
+    # Actualizaciones
+    elements.append(Paragraph("ACTUALIZACIONES", estilos['seccion']))
+    elements.append(Spacer(1, 0.3*cm))
+
+    t4 = Table(textos['actualizacion'], colWidths=[10*cm, 4*cm])
+    t4.setStyle(estilos['tabla_actualizacion'])
+    elements.append(t4)
+    elements.append(Spacer(1, 0.5*cm))
+
+    elements.append(Paragraph("Nota: Los resultados indicados son aproximados.", estilos['nota']))
+
+    doc.build(elements)
+    return buffer.getvalue()
+
+
+def pdf_despidos(datos_calculo: dict, datos_actualizacion: dict) -> bytes:
+    """PDF de despidos, generado una sola vez por combinación de datos, expediente y carátula"""
+    clave = clave_reporte('despidos', datos_calculo, datos_actualizacion)
+    return pdf_cacheado(clave, lambda: generar_pdf_despidos(datos_calculo, datos_actualizacion))
+
+
+@lru_cache(maxsize=1)
+def estilos_informe() -> dict:
+    """Estilos del informe judicial (PDF de la calculadora LRT), uno por proceso"""
+    styles = getSampleStyleSheet()
+    azul = colors.HexColor('#2E86AB')
+
+    return {
+        'encabezado': ParagraphStyle(
+            'InformeEncabezado', parent=styles['Heading1'], fontSize=18,
+            textColor=azul, alignment=TA_CENTER, spaceAfter=4
+        ),
+        'subencabezado': ParagraphStyle(
+            'InformeSubencabezado', parent=styles['Normal'], fontSize=12,
+            textColor=colors.HexColor('#666666'), alignment=TA_CENTER, spaceAfter=12
+        ),
+        'caratula': ParagraphStyle('InformeCaratula', parent=styles['Normal'], fontSize=10, leading=14),
+        'titulo': ParagraphStyle(
+            'InformeTitulo', parent=styles['Heading1'], fontSize=15,
+            textColor=azul, alignment=TA_CENTER, spaceBefore=12, spaceAfter=6
+        ),
+        'seccion': ParagraphStyle(
+            'InformeSeccion', parent=styles['Heading3'], fontSize=12,
+            textColor=azul, spaceBefore=14, spaceAfter=6
+        ),
+        'linea': ParagraphStyle('InformeLinea', parent=styles['Normal'], fontSize=10, leading=15),
+        'total': ParagraphStyle('InformeTotal', parent=styles['Normal'], fontSize=12, leading=18, spaceBefore=6),
+        'nota': ParagraphStyle(
+            'InformeNota', parent=styles['Normal'], fontSize=10, alignment=TA_CENTER, spaceBefore=12
+        ),
+        'pie': ParagraphStyle(
+            'InformePie', parent=styles['Italic'], fontSize=8,
+            textColor=colors.HexColor('#666666'), alignment=TA_CENTER
+        ),
+        'tabla_caratula': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f8f9fa')),
+            ('LINEBEFORE', (0, 0), (0, -1), 3, azul),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('TOPPADDING', (0, 0), (-1, -1), 4),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+        ]),
+        'tabla': [
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#dddddd')),
+        ],
+        'tabla_encabezado': [
+            ('BACKGROUND', (0, 0), (-1, 0), azul),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ],
+        'fondo_destacado': colors.HexColor('#E8F5E8'),
+        'recuadro': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#e7f3ff')),
+            ('BOX', (0, 0), (-1, -1), 0.8, colors.HexColor('#b3d9ff')),
+            ('LEFTPADDING', (0, 0), (-1, -1), 10),
+            ('TOPPADDING', (0, 0), (-1, -1), 2),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+        ]),
+    }
+
+
+def _tabla_informe(seccion: dict, estilos: dict) -> Table:
+    """Tabla concepto / importe de una sección, con filas destacadas en negrita"""
+    filas = [list(f) for f in seccion['tabla']]
+    desplazamiento = 0
+    if seccion.get('encabezados'):
+        filas.insert(0, list(seccion['encabezados']))
+        desplazamiento = 1
+
+    comandos = list(estilos['tabla'])
+    if desplazamiento:
+        comandos += estilos['tabla_encabezado']
+    for i in seccion.get('destacadas', []):
+        fila = i + desplazamiento
+        comandos += [
+            ('BACKGROUND', (0, fila), (-1, fila), estilos['fondo_destacado']),
+            ('FONTNAME', (0, fila), (-1, fila), 'Helvetica-Bold'),
+        ]
+
+    tabla = Table(filas, colWidths=[11*cm, 6*cm])
+    tabla.setStyle(TableStyle(comandos))
+    return tabla
+
+
+def _linea_informe(linea) -> str:
+    """Marcado de una línea de recuadro: texto, o par etiqueta / valor con la etiqueta en negrita"""
+    if isinstance(linea, str):
+        return escape(linea)
+    etiqueta, valor = linea
+    return f"<b>{escape(etiqueta)}</b> {escape(str(valor))}"
+
+
+def generar_pdf_informe(informe: dict) -> bytes:
+    """
+    Genera un informe judicial en PDF a partir de su contenido ya formateado
+
+    Args:
+        informe: Dict con 'encabezado' (lista de textos), 'caratula' (pares
+            etiqueta / valor), 'titulo', 'secciones' y 'pie'. Cada sección tiene
+            'titulo' y una 'tabla' (filas concepto / importe, con 'encabezados'
+            y 'destacadas' opcionales) o 'lineas' en un recuadro con un 'total'
+            opcional; 'nota' agrega un párrafo centrado al final. Cada línea es
+            un texto o un par [etiqueta, valor] y la etiqueta va en negrita.
+            Los textos son planos: el marcado lo aplica el generador.
+
+    Returns:
+        Bytes del PDF
+    """
+    estilos = estilos_informe()
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=2*cm, leftMargin=2*cm,
+                            topMargin=2*cm, bottomMargin=2*cm,
+                            title=informe.get('titulo', ''))
+
+    encabezado = informe.get('encabezado', [])
+    elements = []
+    if encabezado:
+        elements.append(Paragraph(escape(encabezado[0]), estilos['encabezado']))
+        for texto in encabezado[1:]:
+            elements.append(Paragraph(escape(texto), estilos['subencabezado']))
+
+    if informe.get('caratula'):
+        filas = [[Paragraph(f"<b>{escape(etiqueta)}:</b>", estilos['caratula']),
+                  Paragraph(escape(str(valor)), estilos['caratula'])]
+                 for etiqueta, valor in informe['caratula']]
+        caratula = Table(filas, colWidths=[4*cm, 13*cm])
+        caratula.setStyle(estilos['tabla_caratula'])
+        elements.append(caratula)
+
+    if informe.get('titulo'):
+        elements.append(Paragraph(escape(informe['titulo']), estilos['titulo']))
+
+    for seccion in informe.get('secciones', []):
+        bloque = [Paragraph(escape(seccion['titulo']), estilos['seccion'])]
+        if 'tabla' in seccion:
+            bloque.append(_tabla_informe(seccion, estilos))
+        if 'lineas' in seccion:
+            filas = [[Paragraph(_linea_informe(linea), estilos['linea'])] for linea in seccion['lineas']]
+            if seccion.get('total'):
+                filas.append([Paragraph(f"<b>{escape(seccion['total'])}</b>", estilos['total'])])
+            recuadro = Table(filas, colWidths=[17*cm])
+            recuadro.setStyle(estilos['recuadro'])
+            bloque.append(recuadro)
+        if seccion.get('nota'):
+            bloque.append(Paragraph(f"<b>{escape(seccion['nota'])}</b>", estilos['nota']))
+        elements.append(KeepTogether(bloque))
+
+    if informe.get('pie'):
+        elements.append(Spacer(1, 1.2*cm))
+        for texto in informe['pie']:
+            elements.append(Paragraph(escape(texto), estilos['pie']))
+
+    doc.build(elements)
+    return buffer.getvalue()
+
+
+def pdf_informe(informe: dict) -> bytes:
+    """Informe en PDF, generado una sola vez por contenido"""
+    return pdf_cacheado(clave_reporte('informe', informe), lambda: generar_pdf_informe(informe))
+
+
+# ============================================
+# GENERACIÓN MASIVA
+# ============================================
+
+# Con menos documentos no compensa iniciar procesos
+MINIMO_DOCUMENTOS_PARALELO = 20
+
+# Documentos enviados a cada proceso por tanda
+DOCUMENTOS_POR_TANDA = 8
+
+# Tandas encargadas a la vez por proceso (limita los PDF que esperan en memoria)
+TANDAS_EN_CURSO_POR_PROCESO = 2
+
+GENERADORES_PDF = {
+    'despidos': generar_pdf_despidos,
+    'informe': generar_pdf_informe,
+}
+
+
+def _generar_documento(tarea) -> bytes:
+    """Genera un PDF en un proceso del pool (tarea = (tipo, argumentos))"""
+    tipo, argumentos = tarea
+    return GENERADORES_PDF[tipo](*argumentos)
+
+
+def _generar_tanda(tareas: list) -> list:
+    """Genera una tanda de PDF en un proceso del pool"""
+    return [_generar_documento(tarea) for tarea in tareas]
+
+
+def _generar_en_orden(pool, tareas: list, tandas_en_curso: int):
+    """
+    PDF de las tareas en orden, encargando al pool solo unas tandas a la vez
+
+    A diferencia de pool.map, que envía todas las tareas de entrada, cada
+    tanda nueva se encarga recién cuando se entrega la más antigua.
+    """
+    en_curso = deque()
+    for inicio in range(0, len(tareas), DOCUMENTOS_POR_TANDA):
+        en_curso.append(pool.submit(_generar_tanda, tareas[inicio:inicio + DOCUMENTOS_POR_TANDA]))
+        if len(en_curso) >= tandas_en_curso:
+            yield from en_curso.popleft().result()
+    while en_curso:
+        yield from en_curso.popleft().result()
+
+
+def documentos_lote_despidos(resultado) -> list:
+    """
+    Documentos de un lote liquidado con liquidar_lote, uno por fila válida
+
+    Args:
+        resultado: DataFrame devuelto por liquidar_lote
+
+    Returns:
+        Lista de (nombre de archivo, 'despidos', (datos_calculo, datos_actualizacion))
+    """
+    documentos = []
+    for fila, caso in enumerate(resultado.to_dict('records'), start=1):
+        if caso['observaciones']:
+            continue
+        datos_calculo = {
+            'fecha_ingreso': caso['ingreso'],
+            'fecha_despido': caso['despido'],
+            'años': int(caso['años']),
+            'salario': float(caso['salario']),
+            'preaviso': caso['preaviso'],
+            **{concepto: float(caso[concepto]) for concepto in (
+                'antiguedad_245', 'sustitutiva_preaviso', 'sac_preaviso', 'dias_trabajados',
+                'integracion_mes', 'sac_integracion', 'sac_proporcional', 'vacaciones',
+                'sac_vacaciones', 'total'
+            )},
+        }
+        datos_actualizacion = {'ripte': float(caso['actualizado_ripte']), 'tasa': float(caso['actualizado_tasa'])}
+        nombre = f"liquidacion_despido_{fila:04d}_{caso['despido'].replace('/', '')}.pdf"
+        documentos.append((nombre, 'despidos', (datos_calculo, datos_actualizacion)))
+    return documentos
+
+
+def generar_zip_pdfs(documentos: list, destino, procesos: int = None, al_avanzar=None) -> int:
+    """
+    Genera un PDF por documento y los escribe en un ZIP a medida que terminan
+
+    reportlab usa la CPU y dentro de Streamlit queda limitado a un hilo, por
+    lo que los lotes grandes se reparten entre procesos (uno por núcleo). Cada
+    proceso tiene a lo sumo TANDAS_EN_CURSO_POR_PROCESO tandas encargadas y
+    los PDF se escriben en el ZIP en orden apenas llegan: en memoria quedan
+    solo los de las tandas en curso, no los de todo el lote.
+
+    Args:
+        documentos: Lista de (nombre de archivo, tipo, argumentos), con tipo
+            en GENERADORES_PDF ('despidos' o 'informe')
+        destino: Ruta o archivo binario donde se escribe el ZIP
+        procesos: Cantidad de procesos (por defecto, uno por núcleo)
+        al_avanzar: Función opcional (generados, total) llamada tras cada PDF
+
+    Returns:
+        Cantidad de PDF generados
+    """
+    tareas = [(tipo, argumentos) for _, tipo, argumentos in documentos]
+    procesos = procesos or os.cpu_count() or 1
+    total = len(tareas)
+
+    with zipfile.ZipFile(destino, 'w', compression=zipfile.ZIP_DEFLATED) as archivo_zip:
+        def escribir(pdfs):
+            for i, ((nombre, _, _), contenido) in enumerate(zip(documentos, pdfs), start=1):
+                archivo_zip.writestr(nombre, contenido)
+                if al_avanzar:
+                    al_avanzar(i, total)
+
+        if procesos == 1 or total < MINIMO_DOCUMENTOS_PARALELO:
+            escribir(map(_generar_documento, tareas))
+        else:
+            procesos = min(procesos, total)
+            # 'spawn' evita copiar con fork los hilos del servidor de Streamlit
+            with ProcessPoolExecutor(max_workers=procesos, mp_context=get_context('spawn')) as pool:
+                escribir(_generar_en_orden(pool, tareas, procesos * TANDAS_EN_CURSO_POR_PROCESO))
+    return total
+
+
+def zip_documentos(documentos: list) -> bytes:
+    """
+    ZIP de un lote para st.download_button (ver generar_zip_pdfs)
+
+    El ZIP se arma en un archivo temporal, pero Streamlit guarda en memoria
+    el contenido completo de cada descarga: el ZIP comprimido se lee entero
+    una vez al final. Lo que se evita es acumular además todos los PDF.
+    """
+    with tempfile.TemporaryFile() as archivo:
+        generar_zip_pdfs(documentos, archivo)
+        archivo.seek(0)
+        return archivo.read()